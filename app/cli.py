@@ -0,0 +1,224 @@
+import os
+import sys
+import json
+import argparse
+
+# Subcommands import the app modules they need inside their handler, so
+# `barrel list` on a warm catalog stays well under 100 ms (see
+# benchmarks/cli_startup.py). Never import tkinter, termuxgui, PIL or
+# requests at module level here.
+
+XDG_DATA_HOME = os.getenv('XDG_DATA_HOME', os.path.join(os.path.expanduser('~'), '.local', 'share'))
+APPS_DIR = os.path.join(XDG_DATA_HOME, 'applications', 'shortcuts')
+TEMPLATES_DIR = os.path.join(XDG_DATA_HOME, 'shortcut_launcher', 'templates')
+NO_TEMPLATE = "(fără template)"
+
+
+class CliError(Exception):
+    """Reported as 'barrel: <message>' with exit status 1."""
+
+
+def _emit(args, data, lines):
+    """Print data as JSON with --json, else the human readable lines."""
+    if args.json:
+        # One write: json.dump would issue a write per token
+        sys.stdout.write(json.dumps(data, indent=2, ensure_ascii=False) + '\n')
+    else:
+        for line in lines:
+            print(line)
+
+
+def _find_shortcut(name):
+    """Catalog entry matching a file name, a file name without .desktop, or a Name=."""
+    from app import shortcuts
+    entries = shortcuts.load_catalog(APPS_DIR)
+    for match in (lambda e: e['file'] == name,
+                  lambda e: e['file'] == f"{name}.desktop",
+                  lambda e: e['name'] == name):
+        found = [e for e in entries if match(e)]
+        if len(found) == 1:
+            return found[0]
+        if found:
+            raise CliError(f"{name!r} matches several shortcuts: {', '.join(e['file'] for e in found)}")
+    raise CliError(f"no shortcut named {name!r}")
+
+
+def cmd_list(args):
+    from app import shortcuts
+    entries = [{k: e[k] for k in ('file', 'name', 'template', 'exec', 'icon', 'path')}
+               for e in shortcuts.load_catalog(APPS_DIR)]
+    width = max((len(e['file']) for e in entries), default=0)
+    _emit(args, entries, [f"{e['file']:<{width}}  {e['name']}" + (f"  [{e['template']}]" if e['template'] else '')
+                          for e in entries])
+    return 0
+
+
+def cmd_run(args):
+    entry = _find_shortcut(args.name)
+    if args.detach:
+        # A `barrel run` in its own session launches it exactly like the
+        # attached form (queue limits, CPU set, history, timings,
+        # post-run actions) and outlives this process.
+        import subprocess
+        if getattr(sys, 'frozen', False):
+            command = [sys.executable, 'run', entry['file']]
+        else:
+            command = [sys.executable, '-m', 'app.cli', 'run', entry['file']]
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.getenv('PYTHONPATH')])))
+        process = subprocess.Popen(command, env=env, start_new_session=True,
+                                   stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        _emit(args, {'file': entry['file'], 'pid': process.pid}, [f"Started {entry['name']} (pid {process.pid})"])
+        return 0
+
+    import time
+    import contextlib
+    from app import shortcuts, launchqueue, supervisor, timings
+    # With --json only the result goes to stdout: the game and the launch messages get stderr
+    output = contextlib.redirect_stdout(sys.stderr) if args.json else contextlib.nullcontext()
+    try:
+        with output:
+            launch = shortcuts.launch_desktop_file(entry['path'], timings.LaunchTimer(entry['file']),
+                                                   stdout=sys.stderr if args.json else None)
+    except launchqueue.LaunchRejected as e:
+        raise CliError(str(e))
+    if launch is None:
+        raise CliError(f"cannot launch {entry['file']}")
+    if not args.json:
+        print(f"Started {entry['name']} (pid {launch.pid}), waiting for it to exit...", flush=True)
+    sup = supervisor.get_supervisor()
+    try:
+        launch.process.wait()
+    except KeyboardInterrupt:
+        sup.stop(entry['file'])
+        launch.process.wait()
+    # The waiter thread still runs post-run actions and records the history
+    while sup.is_running(entry['file']):
+        time.sleep(0.05)
+    _emit(args, {'file': entry['file'], 'pid': launch.pid, 'returncode': launch.returncode,
+                 'duration': round(launch.duration, 3)},
+          [f"{entry['name']} exited with status {launch.returncode} after {launch.duration:.1f} s"])
+    return 0 if launch.returncode == 0 else 1
+
+
+def cmd_create(args):
+    from app import shortcuts, peicon
+    path = os.path.abspath(args.path)
+    if not os.path.exists(path):
+        raise CliError(f"{path} does not exist")
+    if args.template and not os.path.isfile(os.path.join(TEMPLATES_DIR, args.template)):
+        raise CliError(f"no template named {args.template!r}")
+    messages = []
+
+    def warn(title, message):
+        raise CliError(message)
+
+    shortcuts.create_shortcut_common(
+        preselected_path=path,
+        ask_string_cb=lambda title, prompt, initial=None: args.name,
+        ask_file_cb=lambda *a, **kw: None,
+        show_warning_cb=warn,
+        show_info_cb=lambda title, message: messages.append(message),
+        get_templates_cb=lambda: sorted(os.listdir(TEMPLATES_DIR)) if os.path.isdir(TEMPLATES_DIR) else [],
+        select_template_cb=lambda options: args.template or NO_TEMPLATE,
+        extract_exe_icon_cb=lambda exe, out: peicon.extract_icon(exe, out, 48),
+        refresh_shortcuts_cb=lambda: None,
+        TEMPLATES_DIR=TEMPLATES_DIR,
+        HOME=os.path.expanduser('~'),
+    )
+    desktop = os.path.join(APPS_DIR, f"{args.name}.desktop")
+    _emit(args, {'file': f"{args.name}.desktop", 'path': desktop, 'template': args.template}, messages)
+    return 0
+
+
+def cmd_delete(args):
+    from app import shortcuts
+    entry = _find_shortcut(args.name)
+    shortcuts.delete_shortcut(entry['file'])
+    _emit(args, {'file': entry['file'], 'deleted': True}, [f"Deleted {entry['file']}"])
+    return 0
+
+
+def cmd_prefixes(args):
+    from app import config
+    prefixes = config.load_prefixes()
+    if args.add or args.remove:
+        if args.add:
+            path = os.path.abspath(os.path.expanduser(args.add))
+            if path not in prefixes:
+                prefixes.append(path)
+        if args.remove:
+            prefixes = [p for p in prefixes if p != args.remove
+                        and p != os.path.abspath(os.path.expanduser(args.remove))]
+        config.save_prefixes(prefixes)
+    data = [{'path': prefix, 'exists': os.path.isdir(prefix)} for prefix in prefixes]
+    if args.status:
+        from app import wineserver
+        servers = wineserver.scan()[0]
+        for item in data:
+            item['wineserver'] = servers.get(wineserver.normalize_prefix(item['path']))
+    _emit(args, data, [p['path'] + ('' if p['exists'] else '  (missing)')
+                       + (f"  (wineserver {p['wineserver']})" if p.get('wineserver') else '')
+                       for p in data])
+    return 0
+
+
+def cmd_templates(args):
+    from app import wineserver
+    names = sorted(os.listdir(TEMPLATES_DIR)) if os.path.isdir(TEMPLATES_DIR) else []
+    data = [{'name': n, 'path': os.path.join(TEMPLATES_DIR, n),
+             'prefix': wineserver.template_prefix(os.path.join(TEMPLATES_DIR, n))} for n in names]
+    _emit(args, data, [t['name'] + (f"  ({t['prefix']})" if t['prefix'] else '') for t in data])
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="barrel", description="Manage and launch Barrel shortcuts.")
+    parser.add_argument('--json', action='store_true', help="machine-readable output")
+    # --json is accepted after the subcommand too; SUPPRESS keeps the value set before it
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--json', action='store_true', default=argparse.SUPPRESS, help="machine-readable output")
+    sub = parser.add_subparsers(dest='command', metavar='COMMAND')
+    sub.required = True
+
+    p = sub.add_parser('list', parents=[common], help="list shortcuts")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser('run', parents=[common], help="launch a shortcut and wait for it to exit")
+    p.add_argument('name', help="file name, file name without .desktop, or Name=")
+    p.add_argument('--detach', action='store_true',
+                   help="return at once; a background `barrel run` launches and waits for it")
+    p.set_defaults(func=cmd_run)
+
+    p = sub.add_parser('create', parents=[common], help="create a shortcut")
+    p.add_argument('name', help="shortcut name (no spaces)")
+    p.add_argument('path', help="program or script to launch")
+    p.add_argument('--template', help="launch template to run it with")
+    p.set_defaults(func=cmd_create)
+
+    p = sub.add_parser('delete', parents=[common], help="delete a shortcut, its icon and shader cache")
+    p.add_argument('name')
+    p.set_defaults(func=cmd_delete)
+
+    p = sub.add_parser('prefixes', parents=[common], help="list (or add/remove) Wine prefixes")
+    p.add_argument('--add', metavar='PATH')
+    p.add_argument('--remove', metavar='PATH')
+    p.add_argument('--status', action='store_true', help="show running wineservers")
+    p.set_defaults(func=cmd_prefixes)
+
+    p = sub.add_parser('templates', parents=[common], help="list launch templates")
+    p.set_defaults(func=cmd_templates)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (CliError, OSError) as e:
+        print(f"barrel: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
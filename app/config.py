@@ -8,6 +8,35 @@ CONFIG_DIR = XDG_CONFIG_HOME / 'shortcut_launcher'
 CONFIG_DIR.mkdir(parents=True, exist_ok=True)
 
 PREFIXES_FILE = CONFIG_DIR / 'wine_prefixes.json'
+SETTINGS_FILE = CONFIG_DIR / 'settings.json'
+
+# Defaults for keys missing from SETTINGS_FILE
+DEFAULT_SETTINGS = {
+    # Byte budget of the icon thumbnail cache (CACHE_DIR/icons)
+    'icon_cache_bytes': 8 * 1024 * 1024,
+    # wineserver binary used to prewarm and stop prefixes
+    'wineserver': 'wineserver',
+    # Seconds a wineserver may sit without Wine processes before `wineserver -k` (0 = never)
+    'wineserver_idle_timeout': 300,
+    # Number of most launched prefixes prewarmed on startup (0 = none)
+    'wineserver_prewarm': 1,
+    # Terminal for Terminal=true shortcuts without a template: 'none', 'auto' or a
+    # command such as 'xterm -e' that stays in the foreground until the program exits
+    'terminal': 'none',
+    # Wine/Box64 launches allowed to run at once (0 = no limit); scripts and
+    # tools do not count. Per process: the GUI and `barrel run` do not share it
+    'max_concurrent_sessions': 1,
+    # Allow only one launch per WINEPREFIX at a time
+    'prefix_exclusive': True,
+    # What happens to a launch over the limits: 'wait' in the queue or 'reject'
+    'launch_queue_policy': 'wait',
+    # Byte budget of the per-shortcut shader caches (CACHE_DIR/shaders, 0 = no limit)
+    'shader_cache_bytes': 2 * 1024 * 1024 * 1024,
+    # Seconds between resource samples of running launches (0 = off)
+    'sampler_interval': 2.0,
+    # Samples kept per launch (ring buffer)
+    'sampler_samples': 600,
+}
 
 # Repository URLs
 TEMPLATE_REPO = "https://github.com/moio9/barrel"
@@ -22,3 +51,34 @@ def load_prefixes():
 def save_prefixes(prefixes):
     with open(PREFIXES_FILE, "w") as f:
         json.dump(prefixes, f, indent=4)
+
+def xdg_user_dir(name):
+    """Path of an XDG user directory ('DESKTOP', 'DOCUMENTS', ...) or None.
+
+    Reads user-dirs.dirs directly, like xdg-user-dir does, without
+    starting a process.
+    """
+    home = str(Path.home())
+    try:
+        with open(XDG_CONFIG_HOME / 'user-dirs.dirs', encoding='utf-8') as f:
+            for line in f:
+                key, sep, value = line.strip().partition('=')
+                if sep and key == f'XDG_{name}_DIR':
+                    value = value.strip().strip('"').replace('$HOME', home)
+                    return value if value.startswith('/') else None
+    except OSError:
+        pass
+    return None
+
+def load_settings():
+    settings = dict(DEFAULT_SETTINGS)
+    try:
+        with open(SETTINGS_FILE, "r") as f:
+            settings.update(json.load(f))
+    except (OSError, ValueError):
+        pass
+    return settings
+
+def save_settings(settings):
+    with open(SETTINGS_FILE, "w") as f:
+        json.dump(settings, f, indent=4)
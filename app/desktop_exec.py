@@ -0,0 +1,203 @@
+import os
+import sys
+import shutil
+
+from app import config
+from app import shortcuts
+from app import shadercache
+
+# Terminal emulators tried for Terminal=true, with the flags that start a
+# command and keep the terminal in the foreground until it exits, so the
+# supervisor tracks the program and not a client that hands it to a server
+TERMINALS = [
+    ('xterm', ['-e']),
+    ('konsole', ['--nofork', '-e']),
+    ('xfce4-terminal', ['--disable-server', '-x']),
+    ('gnome-terminal', ['--wait', '--']),
+]
+
+# Deprecated field codes, removed from the command line
+DEPRECATED_CODES = 'dDnNvm'
+
+
+class ExecError(ValueError):
+    pass
+
+
+def unescape_string(value):
+    """Undo the string-type escapes of the Desktop Entry spec (\\s \\n \\t \\r \\\\)."""
+    out = []
+    i = 0
+    while i < len(value):
+        c = value[i]
+        if c == '\\' and i + 1 < len(value):
+            nxt = value[i + 1]
+            out.append({'s': ' ', 'n': '\n', 't': '\t', 'r': '\r', '\\': '\\'}.get(nxt, '\\' + nxt))
+            i += 2
+        else:
+            out.append(c)
+            i += 1
+    return ''.join(out)
+
+
+def split_exec(value):
+    """Split an (unescaped) Exec value into arguments.
+
+    Arguments may be double quoted, with \\", \\`, \\$ and \\\\ escaped
+    inside. Single quotes are not part of the spec but are accepted as
+    literal quoting, since shortcuts written by create_shortcut_common use
+    them for `sh -c '...'`. Each argument is returned with a flag telling
+    whether it was quoted, because field codes only expand unquoted.
+    """
+    args = []
+    current = None
+    quoted = False
+    i = 0
+    n = len(value)
+    while i < n:
+        c = value[i]
+        if c in ' \t\n':
+            if current is not None:
+                args.append((current, quoted))
+                current, quoted = None, False
+            i += 1
+        elif c == '"':
+            current = current or ''
+            quoted = True
+            i += 1
+            while True:
+                if i >= n:
+                    raise ExecError("unterminated double quote")
+                c = value[i]
+                if c == '"':
+                    i += 1
+                    break
+                if c == '\\' and i + 1 < n and value[i + 1] in '"`$\\':
+                    current += value[i + 1]
+                    i += 2
+                else:
+                    current += c
+                    i += 1
+        elif c == "'":
+            end = value.find("'", i + 1)
+            if end < 0:
+                raise ExecError("unterminated single quote")
+            current = (current or '') + value[i + 1:end]
+            quoted = True
+            i = end + 1
+        else:
+            current = (current or '') + c
+            i += 1
+    if current is not None:
+        args.append((current, quoted))
+    return args
+
+
+def expand_field_codes(args, entry, desktop_path, files=()):
+    """Replace %f %F %u %U %i %c %k %% in unquoted arguments."""
+    argv = []
+    for arg, quoted in args:
+        if quoted or '%' not in arg:
+            argv.append(arg)
+            continue
+        if arg in ('%F', '%U'):
+            argv.extend(files)
+            continue
+        if arg in ('%f', '%u'):
+            argv.extend(files[:1])
+            continue
+        if arg == '%i':
+            if entry.icon:
+                argv.extend(['--icon', entry.icon])
+            continue
+        out = []
+        i = 0
+        while i < len(arg):
+            c = arg[i]
+            if c == '%' and i + 1 < len(arg):
+                code = arg[i + 1]
+                if code == '%':
+                    out.append('%')
+                elif code == 'c':
+                    out.append(entry.name or '')
+                elif code == 'k':
+                    out.append(desktop_path)
+                elif code in 'fu':
+                    out.append(files[0] if files else '')
+                elif code not in DEPRECATED_CODES + 'FUi':
+                    raise ExecError(f"unknown field code %{code}")
+                i += 2
+            else:
+                out.append(c)
+                i += 1
+        if out:
+            argv.append(''.join(out))
+    return argv
+
+
+def find_terminal():
+    """argv prefix of the terminal emulator for Terminal=true, or None.
+
+    The 'terminal' setting can name a command ('xterm -e'), 'none' (the
+    default) to never wrap, or 'auto' to try TERMINALS when a display is
+    available. A named command must not return before the program exits.
+    """
+    choice = config.load_settings().get('terminal', 'none')
+    if choice == 'none':
+        return None
+    if choice and choice != 'auto':
+        return choice.split()
+    if not (os.getenv('DISPLAY') or os.getenv('WAYLAND_DISPLAY')):
+        return None
+    for name, flag in TERMINALS:
+        path = shutil.which(name)
+        if path:
+            return [path] + flag
+    return None
+
+
+def entry_command(desktop_path, files=()):
+    """(argv, cwd, terminal) for a .desktop file, per the Desktop Entry spec."""
+    entry = shortcuts.read_desktop_entry(desktop_path, ('Name', 'Exec', 'Icon', 'Path', 'Terminal'))
+    if not entry.exec:
+        raise ExecError(f"{desktop_path} has no Exec= key")
+    argv = expand_field_codes(split_exec(unescape_string(entry.exec)), entry, str(desktop_path), list(files))
+    if not argv:
+        raise ExecError(f"{desktop_path} has an empty Exec= key")
+    cwd = entry.workdir if entry.workdir and os.path.isdir(entry.workdir) else None
+    return argv, cwd, bool(entry.terminal)
+
+
+def wrap_terminal(argv, terminal):
+    """argv run inside the configured terminal emulator when terminal is set."""
+    if not terminal:
+        return argv
+    prefix = find_terminal()
+    return prefix + argv if prefix else argv
+
+
+def main(argv=None):
+    """python -m app.desktop_exec FILE.desktop [FILE...]: exec the entry in place."""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("usage: python -m app.desktop_exec FILE.desktop [FILE...]", file=sys.stderr)
+        return 2
+    try:
+        command, cwd, terminal = entry_command(argv[0], argv[1:])
+    except (OSError, ExecError) as e:
+        print(f"Cannot launch {argv[0]}: {e}", file=sys.stderr)
+        return 1
+    command = wrap_terminal(command, terminal)
+    # No eviction thread: it would not survive the exec
+    env = shadercache.prepare(os.path.basename(argv[0]), evict_others=False)
+    if cwd:
+        os.chdir(cwd)
+    try:
+        os.execvpe(command[0], command, env)
+    except OSError as e:
+        print(f"Cannot launch {argv[0]}: {e}", file=sys.stderr)
+        return 127
+
+
+if __name__ == '__main__':
+    sys.exit(main())
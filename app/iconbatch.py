@@ -0,0 +1,150 @@
+import os
+import sys
+import hashlib
+import argparse
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from app import shortcuts
+from app import icons
+from app import peicon
+
+ICONS_DIR = shortcuts.XDG_DATA_HOME / 'icons' / 'hicolor' / '48x48' / 'apps'
+PLACEHOLDER_ICON = "application-x-executable"
+
+
+def _extract(exe_path, output_path, size):
+    # Runs in a worker process
+    return peicon.extract_icon(exe_path, output_path, size)
+
+
+def shortcut_jobs(apps_dir=None, force=False):
+    """Jobs {exe, output, desktop} for .exe shortcuts whose Icon= is missing.
+
+    The output is named after the .desktop file, which is the icon
+    delete_shortcut removes (create_shortcut_common names it after the
+    .exe instead). With force=True every .exe shortcut is re-extracted.
+    """
+    jobs = []
+    for entry in shortcuts.load_catalog(apps_dir):
+        target = shortcuts.shortcut_target(entry['exec'])
+        if not target or not target.lower().endswith('.exe') or not os.path.isfile(target):
+            continue
+        icon = entry['icon']
+        if not force and icon and icon != PLACEHOLDER_ICON and icons.resolve_icon(icon):
+            continue
+        jobs.append({
+            'exe': target,
+            'output': str(ICONS_DIR / f"{Path(entry['file']).stem}.png"),
+            'desktop': [entry['path']],
+        })
+    return jobs
+
+
+def folder_jobs(folder, apps_dir=None):
+    """Jobs for every .exe below folder.
+
+    Executables that a shortcut points at get that shortcut's icon name and
+    their Icon= line is rewritten; the others get <stem>-<hash>.png.
+    """
+    by_target = {}
+    for entry in shortcuts.load_catalog(apps_dir):
+        target = shortcuts.shortcut_target(entry['exec'])
+        if target:
+            by_target.setdefault(os.path.realpath(target), []).append(entry)
+
+    jobs = []
+    for dirpath, _, filenames in os.walk(folder):
+        for fname in filenames:
+            if not fname.lower().endswith('.exe'):
+                continue
+            exe = os.path.join(dirpath, fname)
+            entries = by_target.get(os.path.realpath(exe), [])
+            if entries:
+                name = Path(entries[0]['file']).stem
+            else:
+                name = f"{Path(fname).stem}-{hashlib.sha1(exe.encode()).hexdigest()[:8]}"
+            jobs.append({
+                'exe': exe,
+                'output': str(ICONS_DIR / f"{name}.png"),
+                'desktop': [e['path'] for e in entries],
+            })
+    return jobs
+
+
+def _executor(workers):
+    # Never fork: the GUIs call this with their event and watcher threads running
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    try:
+        return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+    except (NotImplementedError, ImportError, OSError, ValueError):
+        # No working sem_open (e.g. Termux): threads still keep the UI responsive
+        return ThreadPoolExecutor(max_workers=workers)
+
+
+def run_batch(jobs, progress_cb=None, workers=None, size=48):
+    """Extract icons for jobs on a pool sized to the core count.
+
+    progress_cb(done, total, exe) is called from the calling thread after
+    each job. Once all jobs finished, the Icon= line of every affected
+    .desktop file is rewritten in a single pass. Returns (ok, failed) lists
+    of executables.
+    """
+    ICONS_DIR.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    ok, failed = [], []
+    updates = {}
+    if not jobs:
+        return ok, failed
+
+    with _executor(min(workers, len(jobs))) as pool:
+        futures = {pool.submit(_extract, job['exe'], job['output'], size): job for job in jobs}
+        for done, future in enumerate(as_completed(futures), 1):
+            job = futures[future]
+            try:
+                extracted = future.result()
+            except Exception as e:
+                print(f"Error extracting icon from {job['exe']}: {e}")
+                extracted = False
+            if extracted:
+                ok.append(job['exe'])
+                for desktop in job['desktop']:
+                    updates[desktop] = job['output']
+            else:
+                failed.append(job['exe'])
+            if progress_cb:
+                progress_cb(done, len(jobs), job['exe'])
+
+    for desktop, icon_path in updates.items():
+        try:
+            shortcuts.set_desktop_keys(desktop, {'Icon': icon_path})
+        except OSError as e:
+            print(f"Could not update {desktop}: {e}")
+    return ok, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m app.iconbatch",
+        description="Extract icons for .exe shortcuts whose icon is missing, or for a folder of games.")
+    parser.add_argument('--folder', help="extract icons for every .exe below this folder")
+    parser.add_argument('--force', action='store_true', help="re-extract icons that already exist")
+    parser.add_argument('--workers', type=int, help="worker processes (default: number of cores)")
+    args = parser.parse_args(argv)
+
+    jobs = folder_jobs(args.folder) if args.folder else shortcut_jobs(force=args.force)
+    if not jobs:
+        print("Nothing to do.")
+        return 0
+
+    def progress(done, total, exe):
+        print(f"[{done}/{total}] {exe}")
+
+    ok, failed = run_batch(jobs, progress, args.workers)
+    print(f"Extracted {len(ok)} icon(s), {len(failed)} failed.")
+    return 1 if failed and not ok else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,282 @@
+import os
+import re
+import json
+import time
+import hashlib
+from pathlib import Path
+
+from app import config
+
+XDG_CACHE_HOME = Path(os.getenv('XDG_CACHE_HOME', Path.home() / '.cache'))
+CACHE_DIR = XDG_CACHE_HOME / 'shortcut_launcher'
+ICONS_CACHE_DIR = CACHE_DIR / 'icons'
+
+ICON_INDEX_FILE = CACHE_DIR / 'icon_index.json'
+
+# Preferred formats first; Tk and Pillow cannot draw svg
+ICON_EXTS = {'.png': 0, '.xpm': 1, '.svg': 2, '.ico': 3}
+# Size we look for in <theme>/<N>x<N>/... directories
+PREFERRED_SIZE = 48
+
+# path -> ((inode, mtime, size), sha1) so unchanged sources are hashed once
+_digests = {}
+_index = None
+# Bytes in ICONS_CACHE_DIR as of the last evict() plus thumbnails rendered
+# since, and the budget read once from settings; None until first needed
+_cache_bytes = None
+_cache_budget = None
+
+
+def _source_digest(path):
+    st = os.stat(path)
+    key = (st.st_ino, st.st_mtime_ns, st.st_size)
+    cached = _digests.get(path)
+    if cached and cached[0] == key:
+        return cached[1]
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b''):
+            h.update(chunk)
+    digest = h.hexdigest()
+    _digests[path] = (key, digest)
+    return digest
+
+
+def _render(src, dst, size):
+    """Scale src to fit size x size and save it as PNG. Needs Pillow."""
+    try:
+        from PIL import Image
+    except ImportError:
+        return False
+    tmp = f"{dst}.{os.getpid()}.tmp"
+    try:
+        with Image.open(src) as img:
+            img = img.convert('RGBA')
+            img.thumbnail((size, size))
+            img.save(tmp, 'PNG')
+        os.replace(tmp, dst)
+        return True
+    except Exception as e:
+        print(f"Could not scale icon {src}: {e}")
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return False
+
+
+def thumbnail(src, size=32):
+    """Return the path of a cached size x size PNG of src, or None.
+
+    Thumbnails are stored as CACHE_DIR/icons/<sha1 of source>-<size>.png,
+    so renamed or duplicated icons share one entry. Hits refresh the file
+    mtime, which evict() uses as the LRU clock. Returns None when src is
+    missing or Pillow is not installed; callers then load src directly.
+    """
+    if not src:
+        return None
+    try:
+        digest = _source_digest(src)
+    except OSError:
+        return None
+    dst = ICONS_CACHE_DIR / f"{digest}-{size}.png"
+    try:
+        os.utime(dst)
+        return str(dst)
+    except OSError:
+        pass
+
+    ICONS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    if not _render(src, dst, size):
+        return None
+    _account(dst)
+    return str(dst)
+
+
+def _account(path):
+    """Add a new thumbnail to the running total; scan and evict only when over budget.
+
+    Eviction goes down to 3/4 of the budget, so a full cache is not
+    rescanned on every following render.
+    """
+    global _cache_bytes, _cache_budget
+    if _cache_budget is None:
+        _cache_budget = config.load_settings()['icon_cache_bytes']
+    if _cache_bytes is not None:
+        try:
+            _cache_bytes += os.path.getsize(path)
+        except OSError:
+            pass
+        if _cache_bytes <= _cache_budget:
+            return
+    evict(_cache_budget * 3 // 4 if _cache_bytes is not None else _cache_budget)
+
+
+def evict(budget=None):
+    """Delete least recently used thumbnails until the cache fits budget bytes."""
+    global _cache_bytes
+    if budget is None:
+        budget = config.load_settings()['icon_cache_bytes']
+    files = []
+    total = 0
+    try:
+        with os.scandir(ICONS_CACHE_DIR) as it:
+            for de in it:
+                if not de.name.endswith('.png'):
+                    continue
+                try:
+                    st = de.stat()
+                except OSError:
+                    continue
+                files.append((st.st_mtime_ns, st.st_size, de.path))
+                total += st.st_size
+    except OSError:
+        return
+    files.sort()
+    for _, size, path in files:
+        if total <= budget:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+    _cache_bytes = total
+
+
+def icon_search_roots():
+    """Directories searched for Icon= names, highest priority first."""
+    data_home = Path(os.getenv('XDG_DATA_HOME', Path.home() / '.local' / 'share'))
+    data_dirs = [Path(d) for d in os.getenv('XDG_DATA_DIRS', '/usr/local/share:/usr/share').split(':') if d]
+    if os.getenv('PREFIX'):
+        data_dirs.append(Path(os.getenv('PREFIX')) / 'share')
+
+    roots = [data_home / 'icons', Path.home() / '.icons']
+    roots += [d / 'icons' for d in data_dirs]
+    roots += [data_home / 'pixmaps'] + [d / 'pixmaps' for d in data_dirs]
+    roots.append(Path('/usr/share/pixmaps'))
+    seen = []
+    for r in map(str, roots):
+        if r not in seen:
+            seen.append(r)
+    return seen
+
+
+def _dir_size(rel_dir):
+    """Icon size implied by a theme subdirectory such as hicolor/48x48/apps."""
+    m = re.search(r'(?:^|/)(\d+)x\d+(?:@\d+)?(?:/|$)', rel_dir)
+    if m:
+        return int(m.group(1))
+    if 'scalable' in rel_dir:
+        return PREFERRED_SIZE
+    return None
+
+
+class IconIndex:
+    """Map of icon name -> best file over the XDG icon dirs, ~/.icons and pixmaps.
+
+    The mtime of every scanned directory is recorded; is_stale() compares
+    them so the index is only rebuilt when an icon dir actually changed.
+    """
+
+    def __init__(self, roots=None):
+        self.roots = list(roots or icon_search_roots())
+        self.icons = {}
+        self.dirs = {}
+        self.checked = 0.0
+
+    def build(self):
+        best = {}
+        self.dirs = {}
+        for rank, root in enumerate(self.roots):
+            if not os.path.isdir(root):
+                self.dirs[root] = None
+                continue
+            for dirpath, dirnames, filenames in os.walk(root):
+                try:
+                    self.dirs[dirpath] = os.stat(dirpath).st_mtime_ns
+                except OSError:
+                    continue
+                size = _dir_size(os.path.relpath(dirpath, root))
+                distance = abs(size - PREFERRED_SIZE) if size else PREFERRED_SIZE
+                for fname in filenames:
+                    stem, ext = os.path.splitext(fname)
+                    ext_rank = ICON_EXTS.get(ext.lower())
+                    if ext_rank is None:
+                        continue
+                    score = (rank, ext_rank, distance)
+                    if stem not in best or score < best[stem][0]:
+                        best[stem] = (score, os.path.join(dirpath, fname))
+        self.icons = {name: path for name, (_, path) in best.items()}
+        self.checked = time.monotonic()
+        return self
+
+    def is_stale(self):
+        for path, mtime in self.dirs.items():
+            try:
+                current = os.stat(path).st_mtime_ns
+            except OSError:
+                current = None
+            if current != mtime:
+                return True
+        return False
+
+    def lookup(self, name):
+        if name in self.icons:
+            return self.icons[name]
+        stem, ext = os.path.splitext(name)
+        if ext.lower() in ICON_EXTS:
+            return self.icons.get(stem)
+        return None
+
+    def save(self):
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = ICON_INDEX_FILE.with_suffix('.tmp')
+            with open(tmp, 'w') as f:
+                json.dump({'roots': self.roots, 'dirs': self.dirs, 'icons': self.icons}, f)
+            os.replace(tmp, ICON_INDEX_FILE)
+        except OSError as e:
+            print(f"Could not save icon index: {e}")
+
+    @classmethod
+    def load(cls):
+        index = cls()
+        try:
+            with open(ICON_INDEX_FILE) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('roots') != index.roots:
+            return None
+        index.dirs = data.get('dirs', {})
+        index.icons = data.get('icons', {})
+        return index
+
+
+def get_icon_index(max_age=2.0):
+    """The shared IconIndex, revalidated at most every max_age seconds."""
+    global _index
+    if _index is None:
+        _index = IconIndex.load()
+        if _index is not None and _index.is_stale():
+            _index = None
+        if _index is None:
+            _index = IconIndex().build()
+            _index.save()
+        _index.checked = time.monotonic()
+    elif time.monotonic() - _index.checked > max_age:
+        if _index.is_stale():
+            _index = IconIndex().build()
+            _index.save()
+        _index.checked = time.monotonic()
+    return _index
+
+
+def resolve_icon(name):
+    """Path of the file for an Icon= value (absolute path or theme name), or None."""
+    if not name:
+        return None
+    if os.path.isabs(name):
+        return name if os.path.exists(name) else None
+    return get_icon_index().lookup(name)
@@ -0,0 +1,367 @@
+import os
+import re
+import json
+import shutil
+import threading
+from pathlib import Path
+
+XDG_CACHE_HOME = Path(os.getenv('XDG_CACHE_HOME', Path.home() / '.cache'))
+CACHE_DIR = XDG_CACHE_HOME / 'shortcut_launcher'
+PLANS_FILE = CACHE_DIR / 'launch_plans.json'
+PLANS_VERSION = 2
+
+# Exec= forms written by create_shortcut_common
+TEMPLATE_EXEC = re.compile(r'bash\s+"([^"]+)"\s+"([^"]+)"\s*$')
+SCRIPT_EXEC = re.compile(r"sh\s+-c\s+'([^;']+);[^']*'\s*$")
+# cd line written by both template dialogs (and, escaped, by main.sh)
+CD_DIRNAME = re.compile(r'cd\s+"\$\(dirname\s+\\?"\$1\\?"\)"\s*$')
+EXPORT = re.compile(r'export\s+([A-Za-z_][A-Za-z0-9_]*)=(.*)$')
+NAME_CHARS = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+# Characters that need a real shell when unquoted
+SHELL_SYNTAX = set(';|&<>()`{}*?[')
+# Commands whose first word means the line is not a plain runner invocation
+SHELL_KEYWORDS = {
+    'if', 'then', 'else', 'elif', 'fi', 'for', 'while', 'until', 'do', 'done',
+    'case', 'esac', 'wait', 'set', 'trap', '.', 'source', 'eval', 'read',
+    'shift', 'unset', 'alias', 'function', 'return', 'exit',
+}
+ASSIGNMENT = re.compile(r'[A-Za-z_][A-Za-z0-9_]*=')
+
+_lock = threading.Lock()
+_plans = None
+
+
+class Unsupported(Exception):
+    """The file uses shell syntax the plan compiler does not model."""
+
+
+def _parse_var(text, i, quoted):
+    """Parse $NAME, ${NAME}, ${NAME:-default}, $1 or "$@" at text[i] == '$'."""
+    if text.startswith('$(', i):
+        raise Unsupported("command substitution")
+    if text.startswith('$@', i) and quoted:
+        return ['args', None, None, quoted], i + 2
+    if text.startswith(('$@', '$*'), i):
+        raise Unsupported(text[i:i + 2])
+    if i + 1 < len(text) and text[i + 1].isdigit():
+        return ['arg', int(text[i + 1]), None, quoted], i + 2
+    if text.startswith('${', i):
+        end = text.find('}', i)
+        if end < 0:
+            raise Unsupported("unterminated ${")
+        body = text[i + 2:end]
+        name, sep, default = body.partition(':-')
+        if not NAME_CHARS.fullmatch(name) or (not sep and body != name) or '$' in default:
+            raise Unsupported(f"parameter expansion ${{{body}}}")
+        return ['var', name, default if sep else None, quoted], end + 1
+    m = NAME_CHARS.match(text, i + 1)
+    if not m:
+        return ['lit', '$'], i + 1
+    return ['var', m.group(0), None, quoted], m.end()
+
+
+def parse_words(line):
+    """Split one simple command into words of segments.
+
+    Segments are ['lit', text], ['var', name, default, quoted],
+    ['arg', n, None, quoted] and ['args', None, None, True] ("$@"). Raises Unsupported for anything that needs a
+    real shell: command substitution, pipes, redirections, globs, lists.
+    """
+    words = []
+    word = None
+    i = 0
+    n = len(line)
+
+    def add(segment):
+        nonlocal word
+        if word is None:
+            word = []
+        if segment[0] == 'lit' and word and word[-1][0] == 'lit':
+            word[-1][1] += segment[1]
+        else:
+            word.append(segment)
+
+    while i < n:
+        c = line[i]
+        if c in ' \t':
+            if word is not None:
+                words.append(word)
+                word = None
+            i += 1
+        elif c == '#' and word is None:
+            break
+        elif c == "'":
+            end = line.find("'", i + 1)
+            if end < 0:
+                raise Unsupported("unterminated quote")
+            add(['lit', line[i + 1:end]])
+            i = end + 1
+        elif c == '"':
+            add(['lit', ''])
+            i += 1
+            while True:
+                if i >= n:
+                    raise Unsupported("unterminated quote")
+                c = line[i]
+                if c == '"':
+                    i += 1
+                    break
+                if c == '`':
+                    raise Unsupported("command substitution")
+                if c == '\\' and i + 1 < n and line[i + 1] in '$`"\\':
+                    add(['lit', line[i + 1]])
+                    i += 2
+                elif c == '$':
+                    segment, i = _parse_var(line, i, True)
+                    add(segment)
+                else:
+                    add(['lit', c])
+                    i += 1
+        elif c == '\\':
+            if i + 1 >= n:
+                raise Unsupported("line continuation")
+            add(['lit', line[i + 1]])
+            i += 2
+        elif c == '$':
+            segment, i = _parse_var(line, i, False)
+            add(segment)
+        elif c in SHELL_SYNTAX:
+            raise Unsupported(f"shell syntax {c!r}")
+        elif c == '~' and word is None:
+            m = re.match(r'~(?=/|$|\s)', line[i:])
+            if not m:
+                raise Unsupported("~user")
+            add(['var', 'HOME', None, True])
+            i += 1
+        else:
+            add(['lit', c])
+            i += 1
+    if word is not None:
+        words.append(word)
+    return words
+
+
+def expand_word(word, env, args, split=True):
+    """Fields of one parsed word; unquoted expansions are split on whitespace."""
+    fields = ['']
+    quoted = False
+    for segment in word:
+        if segment[0] == 'lit':
+            fields[-1] += segment[1]
+            quoted = True
+            continue
+        kind, ref, default, seg_quoted = segment
+        if kind == 'args':
+            # "$@": one field per argument
+            for k, arg in enumerate(args):
+                if k:
+                    fields.append('')
+                fields[-1] += arg
+            quoted = quoted or bool(args)
+            continue
+        if kind == 'arg':
+            value = args[ref - 1] if 0 < ref <= len(args) else ''
+        else:
+            value = env.get(ref, '')
+            if not value and default is not None:
+                value = default
+        if seg_quoted or not split:
+            fields[-1] += value
+            quoted = True
+        else:
+            parts = value.split()
+            if value[:1].isspace() and fields[-1]:
+                fields.append('')
+            for k, part in enumerate(parts):
+                if k:
+                    fields.append('')
+                fields[-1] += part
+            if value[-1:].isspace() and parts:
+                fields.append('')
+    if not quoted:
+        fields = [f for f in fields if f]
+    return fields
+
+
+class LaunchPlan:
+    """argv/env/cwd of a shortcut, compiled from its .desktop file and template.
+
+    Words are kept parsed but unexpanded so resolve() can expand $VAR,
+    ${VAR:-default}, ~ and "$1" against the environment of each launch.
+    """
+
+    __slots__ = ('args', 'exports', 'cwd', 'runner', 'background', 'post_actions')
+
+    def __init__(self, args=(), exports=(), cwd=None, runner=(), background=False, post_actions=()):
+        self.args = list(args)
+        self.exports = [list(e) for e in exports]
+        self.cwd = cwd
+        self.runner = list(runner)
+        self.background = background
+        self.post_actions = list(post_actions)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def resolve(self, environ=None):
+        """(argv, env, cwd) ready for exec in the given (default: current) environment."""
+        env = dict(os.environ if environ is None else environ)
+        for name, word in self.exports:
+            env[name] = ''.join(expand_word(word, env, self.args, split=False))
+        cwd = None
+        if self.cwd == 'dirname_arg':
+            cwd = os.path.dirname(self.args[0]) or None
+        elif self.cwd is not None:
+            cwd = ''.join(expand_word(self.cwd, env, self.args, split=False))
+        if cwd and not os.path.isdir(cwd):
+            # sh would print an error and carry on in the current directory
+            cwd = None
+        argv = []
+        for word in self.runner:
+            argv.extend(expand_word(word, env, self.args))
+        if argv and os.sep not in argv[0]:
+            argv[0] = shutil.which(argv[0], path=env.get('PATH')) or argv[0]
+        return argv, env, cwd
+
+
+def _uses_args(words):
+    return any(segment[0] in ('arg', 'args') for word in words for segment in word)
+
+
+def compile_template(text, args):
+    """Compile the lines of a generated template into a LaunchPlan.
+
+    The runner is the first command after the exports and cd; it must
+    take the target as "$1" or "$@". Any other command before it needs
+    a real shell.
+    """
+    plan = LaunchPlan(args=args)
+    lines = iter(text.splitlines())
+    for raw in lines:
+        line = raw.strip()
+        if not line or line.startswith('#'):
+            continue
+        m = EXPORT.match(line)
+        if m:
+            words = parse_words(m.group(2))
+            if len(words) > 1:
+                raise Unsupported("export of several words")
+            plan.exports.append([m.group(1), words[0] if words else []])
+            continue
+        if CD_DIRNAME.match(line):
+            plan.cwd = 'dirname_arg'
+            continue
+        if line.startswith('cd ') or line == 'cd':
+            words = parse_words(line[2:])
+            if len(words) != 1:
+                raise Unsupported("cd")
+            plan.cwd = words[0]
+            continue
+        if line.endswith('&') and not line.endswith('&&'):
+            plan.background = True
+            line = line[:-1].rstrip()
+        words = parse_words(line)
+        if words and words[0] == [['lit', 'exec']]:
+            words = words[1:]
+        if not words:
+            raise Unsupported(line)
+        first = words[0][0]
+        if first[0] == 'lit' and (first[1] in SHELL_KEYWORDS and len(words[0]) == 1
+                                  or ASSIGNMENT.match(first[1])):
+            raise Unsupported(line)
+        if not _uses_args(words):
+            raise Unsupported(f"command before the runner: {line}")
+        plan.runner = words
+        break
+    else:
+        raise Unsupported("no runner line")
+    # Whatever follows the runner is run by the supervisor through sh, with the same "$1"
+    plan.post_actions = [l.strip() for l in lines if l.strip() and not l.strip().startswith('#')]
+    return plan
+
+
+def _stat_key(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_ino, st.st_mtime_ns, st.st_size]
+
+
+def compile_desktop(desktop_path):
+    """LaunchPlan for a .desktop file, plus the template path it depends on.
+
+    Returns (None, template) when the shortcut needs a real shell.
+    """
+    from app import shortcuts
+    exec_val = shortcuts.read_desktop_entry(desktop_path, ('Exec',)).exec or ''
+    m = TEMPLATE_EXEC.match(exec_val)
+    if m:
+        template, target = m.groups()
+        try:
+            with open(template, 'r', encoding='utf-8') as f:
+                return compile_template(f.read(), [target]), template
+        except (OSError, Unsupported):
+            return None, template
+    m = SCRIPT_EXEC.match(exec_val)
+    if m:
+        return LaunchPlan(runner=[[['lit', m.group(1).strip()]]]), None
+    return None, None
+
+
+def _load():
+    global _plans
+    if _plans is None:
+        try:
+            with open(PLANS_FILE) as f:
+                data = json.load(f)
+            _plans = data['plans'] if data.get('version') == PLANS_VERSION else {}
+        except (OSError, ValueError, KeyError):
+            _plans = {}
+    return _plans
+
+
+def _save():
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = PLANS_FILE.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump({'version': PLANS_VERSION, 'plans': _plans}, f)
+        os.replace(tmp, PLANS_FILE)
+    except OSError as e:
+        print(f"Could not save launch plans: {e}")
+
+
+def get_plan(desktop_path):
+    """Cached LaunchPlan of a .desktop file, or None if it must run through bash.
+
+    The cache is keyed by the stat of the .desktop file and of its template,
+    so editing either one recompiles the plan.
+    """
+    desktop_path = os.path.realpath(desktop_path)
+    desktop_key = _stat_key(desktop_path)
+    if desktop_key is None:
+        return None
+    with _lock:
+        plans = _load()
+        cached = plans.get(desktop_path)
+        if (cached and cached['desktop'] == desktop_key
+                and (cached['template'] is None or _stat_key(cached['template']) == cached['template_key'])):
+            return LaunchPlan.from_dict(cached['plan']) if cached['plan'] else None
+
+        try:
+            plan, template = compile_desktop(desktop_path)
+        except OSError:
+            return None
+        plans[desktop_path] = {
+            'desktop': desktop_key,
+            'template': template,
+            'template_key': _stat_key(template) if template else None,
+            'plan': plan.to_dict() if plan else None,
+        }
+        _save()
+        return plan
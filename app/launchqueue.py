@@ -0,0 +1,205 @@
+import time
+import threading
+
+from app import config
+from app import supervisor
+
+# Values of the launch_queue_policy setting
+WAIT = 'wait'
+REJECT = 'reject'
+
+# Programs whose launches count as Wine/Box64 sessions
+RUNNERS = ('wine', 'box64', 'box86', 'hangover')
+
+_queue = None
+
+
+class LaunchRejected(Exception):
+    """A launch was refused; str() is the message to show."""
+
+
+def is_wine_command(argv):
+    """True if a command line runs Wine or Box64, or a Windows program."""
+    for arg in argv:
+        name = arg.strip('\'"').replace('\\', '/').rsplit('/', 1)[-1].lower()
+        if name.startswith(RUNNERS) or name.endswith('.exe'):
+            return True
+    return False
+
+
+class QueuedLaunch:
+    __slots__ = ('key', 'name', 'prefix', 'wine', 'start', 'queued_at')
+
+    def __init__(self, key, name, prefix, start, wine=True):
+        self.key = key
+        self.name = name
+        self.prefix = prefix
+        self.wine = wine
+        self.start = start
+        self.queued_at = time.time()
+
+
+class LaunchQueue:
+    """Gate in front of Supervisor.launch.
+
+    Limits come from the settings: at most max_concurrent_sessions
+    Wine/Box64 sessions at a time (0 = no limit) and, with
+    prefix_exclusive, one launch per WINEPREFIX. Launches with neither a
+    WINEPREFIX nor a Wine/Box64 command (scripts, tools) are not counted.
+    A launch over a limit is queued and started once a running one exits,
+    or refused with launch_queue_policy = 'reject'. A shortcut that is
+    already running or queued is always refused. Listeners are called
+    with no arguments whenever the queue changes.
+
+    The queue only sees the launches of its own process: a GUI frontend
+    and `barrel run` in another process do not limit each other.
+    """
+
+    def __init__(self, sup=None):
+        self.supervisor = sup or supervisor.get_supervisor()
+        self.pending = []
+        self.prefixes = {}      # running key -> prefix
+        self.wine = set()       # running keys that count as Wine/Box64 sessions
+        self.starting = {}      # key -> QueuedLaunch between reservation and spawn
+        self.listeners = []
+        self._lock = threading.RLock()
+        self.supervisor.add_listener(self._on_launch)
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def _notify(self):
+        for callback in list(self.listeners):
+            try:
+                callback()
+            except Exception as e:
+                print(f"Launch queue listener error: {e}")
+
+    def _sessions(self):
+        """Running launches plus launches being started right now: [(key, name)]."""
+        sessions = [(l.key, l.name) for l in self.supervisor.running()]
+        running = {key for key, _ in sessions}
+        sessions += [(k, q.name) for k, q in self.starting.items() if k not in running]
+        return sessions
+
+    def _blocker(self, prefix, wine, settings):
+        """Why a launch in prefix cannot start now, or None."""
+        sessions = self._sessions()
+        limit = settings['max_concurrent_sessions']
+        if wine and limit:
+            counted = [name for key, name in sessions if key in self.wine]
+            if len(counted) >= limit:
+                return f"{len(counted)} of {limit} Wine session(s) running ({', '.join(counted)})"
+        if prefix and settings['prefix_exclusive']:
+            for key, name in sessions:
+                if self.prefixes.get(key) == prefix:
+                    return f"{name} is running in {prefix}"
+        return None
+
+    def submit(self, key, name, prefix, start, wine=True):
+        """Start a launch now or queue it.
+
+        start(waited) performs the launch and returns the Launch; waited is
+        True when the launch was queued first. wine tells whether it counts
+        against max_concurrent_sessions (it always does with a prefix).
+        Returns the Launch, or None if it was queued. Raises LaunchRejected.
+        """
+        settings = config.load_settings()
+        item = QueuedLaunch(key, name, prefix, start, wine or prefix is not None)
+        with self._lock:
+            if self.supervisor.is_running(key) or key in self.starting:
+                raise LaunchRejected(f"{name} is already running.")
+            if self.position(key) is not None:
+                raise LaunchRejected(f"{name} is already waiting to start.")
+            reason = self._blocker(prefix, item.wine, settings)
+            if reason is not None and settings['launch_queue_policy'] == REJECT:
+                raise LaunchRejected(f"Not starting {name}: {reason}.")
+            if reason is None:
+                self._reserve(item)
+            else:
+                self.pending.append(item)
+        if reason is not None:
+            self._notify()
+            return None
+        return self._start(item, waited=False)
+
+    def _reserve(self, item):
+        self.prefixes[item.key] = item.prefix
+        if item.wine:
+            self.wine.add(item.key)
+        self.starting[item.key] = item
+
+    def _start(self, item, waited):
+        # Called without the queue lock: start() reaches the supervisor,
+        # whose listeners take the frontends' locks.
+        launch = None
+        try:
+            launch = item.start(waited)
+            return launch
+        finally:
+            with self._lock:
+                if launch is None:
+                    self.prefixes.pop(item.key, None)
+                    self.wine.discard(item.key)
+                self.starting.pop(item.key, None)
+
+    def cancel(self, key):
+        with self._lock:
+            before = len(self.pending)
+            self.pending = [q for q in self.pending if q.key != key]
+            changed = len(self.pending) != before
+        if changed:
+            self._notify()
+        return changed
+
+    def position(self, key):
+        """1-based place of key in the queue, or None."""
+        for i, item in enumerate(self.pending):
+            if item.key == key:
+                return i + 1
+        return None
+
+    def _on_launch(self, launch):
+        if launch.running:
+            return
+        settings = config.load_settings()
+        ready = []
+        with self._lock:
+            if not self.supervisor.is_running(launch.key):
+                self.prefixes.pop(launch.key, None)
+                self.wine.discard(launch.key)
+            # In queue order; a launch waiting for a busy prefix does not
+            # hold back launches in other prefixes.
+            for item in list(self.pending):
+                if self._blocker(item.prefix, item.wine, settings) is None:
+                    self.pending.remove(item)
+                    self._reserve(item)
+                    ready.append(item)
+        for item in ready:
+            try:
+                self._start(item, waited=True)
+            except Exception as e:
+                print(f"Queued launch of {item.name} failed: {e}")
+        if ready:
+            self._notify()
+
+    def state(self):
+        """{'running': [Launch], 'queued': [QueuedLaunch]} for display."""
+        with self._lock:
+            return {'running': self.supervisor.running(), 'queued': list(self.pending)}
+
+
+def get_queue():
+    """The LaunchQueue shared by shortcuts.launch_desktop_file and the frontends."""
+    global _queue
+    if _queue is None:
+        _queue = LaunchQueue()
+    return _queue
+
+
+def status_text(key):
+    """supervisor.status_text, with 'queued #n' for waiting launches."""
+    pos = get_queue().position(key)
+    if pos is not None:
+        return f'queued #{pos}'
+    return supervisor.status_text(key)
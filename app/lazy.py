@@ -0,0 +1,44 @@
+import sys
+import importlib.util
+
+
+class MissingModule:
+    """Stands in for a module that is not installed; using it raises ImportError."""
+
+    def __init__(self, name):
+        self.__name__ = name
+
+    def __getattr__(self, attr):
+        raise ImportError(f"{self.__name__} is not installed (needed for this action)")
+
+    def __bool__(self):
+        return False
+
+
+def lazy_import(name):
+    """Like importlib.import_module, but the module only runs when an attribute is first used.
+
+    Parent packages of a dotted name are imported normally and the module
+    is bound under its parent. Modules that are already imported are
+    returned as they are, and a module that is not installed gives a
+    MissingModule, so the caller fails on use instead of at startup.
+
+    PyInstaller cannot see these imports: list them in hiddenimports.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    try:
+        spec = importlib.util.find_spec(name)
+    except ImportError:
+        spec = None
+    if spec is None:
+        return MissingModule(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    parent, _, child = name.rpartition('.')
+    if parent:
+        setattr(sys.modules[parent], child, module)
+    return module
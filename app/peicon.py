@@ -0,0 +1,258 @@
+import io
+import os
+import mmap
+import struct
+import zlib
+
+# Resource types
+RT_ICON = 3
+RT_GROUP_ICON = 14
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+class PEIconError(Exception):
+    pass
+
+
+class PEResources:
+    """Read-only view of the resource tree of a PE (.exe/.dll) image."""
+
+    def __init__(self, data):
+        self.data = data
+        if data[:2] != b'MZ':
+            raise PEIconError("not an MZ executable")
+        pe = struct.unpack_from('<I', data, 0x3C)[0]
+        if data[pe:pe + 4] != b'PE\0\0':
+            raise PEIconError("missing PE signature")
+        nsections, opt_size = struct.unpack_from('<2xH12xH', data, pe + 4)
+        opt = pe + 24
+        magic = struct.unpack_from('<H', data, opt)[0]
+        if magic == 0x10b:      # PE32
+            dirs_at = opt + 92
+        elif magic == 0x20b:    # PE32+
+            dirs_at = opt + 108
+        else:
+            raise PEIconError(f"unknown optional header magic {magic:#x}")
+        ndirs = struct.unpack_from('<I', data, dirs_at)[0]
+        if ndirs <= 2:
+            raise PEIconError("no resource directory")
+        res_rva, res_size = struct.unpack_from('<II', data, dirs_at + 4 + 2 * 8)
+        if not res_rva or not res_size:
+            raise PEIconError("no resources")
+
+        self.sections = []
+        sec = opt + opt_size
+        for i in range(nsections):
+            vsize, va, raw_size, raw_ptr = struct.unpack_from('<IIII', data, sec + i * 40 + 8)
+            self.sections.append((va, max(vsize, raw_size), raw_ptr))
+        self.root = self.offset(res_rva)
+
+    def offset(self, rva):
+        """File offset of a relative virtual address."""
+        for va, size, raw_ptr in self.sections:
+            if va <= rva < va + size:
+                return raw_ptr + rva - va
+        raise PEIconError(f"RVA {rva:#x} outside of all sections")
+
+    def entries(self, table):
+        """[(id, is_dir, offset)] of one IMAGE_RESOURCE_DIRECTORY. Named entries get id=None."""
+        named, ids = struct.unpack_from('<HH', self.data, table + 12)
+        result = []
+        for i in range(named + ids):
+            name, target = struct.unpack_from('<II', self.data, table + 16 + i * 8)
+            rid = None if name & 0x80000000 else name
+            result.append((rid, bool(target & 0x80000000), self.root + (target & 0x7fffffff)))
+        return result
+
+    def read(self, table):
+        """Data of the first language below a name/id directory."""
+        while True:
+            entries = self.entries(table)
+            if not entries:
+                raise PEIconError("empty resource directory")
+            _, is_dir, target = entries[0]
+            if not is_dir:
+                rva, size = struct.unpack_from('<II', self.data, target)
+                start = self.offset(rva)
+                return self.data[start:start + size]
+            table = target
+
+    def resources(self, rtype):
+        """{id: directory offset} of every resource of one type; pass the offset to read()."""
+        for rid, is_dir, target in self.entries(self.root):
+            if rid == rtype and is_dir:
+                return {name: sub for name, sub_is_dir, sub in self.entries(target) if sub_is_dir}
+        return {}
+
+
+def _rank_entries(group, size):
+    """RT_ICON ids of an icon group, closest to size first (prefer scaling down)."""
+    _, rtype, count = struct.unpack_from('<HHH', group, 0)
+    if rtype != 1 or not count:
+        raise PEIconError("invalid icon group")
+    entries = []
+    for i in range(count):
+        w, h, _, _, _, bpp, _, rid = struct.unpack_from('<BBBBHHIH', group, 6 + i * 14)
+        entries.append((w or 256, bpp, rid))
+
+    def score(entry):
+        w, bpp, _ = entry
+        return (w < size, abs(w - size), -bpp)
+    return [rid for _, _, rid in sorted(entries, key=score)]
+
+
+def _decode_dib(dib):
+    """Decode a BITMAPINFOHEADER icon image to (width, height, RGBA bytes)."""
+    hdr, width, height, _, bpp, compression = struct.unpack_from('<IiiHHI', dib, 0)
+    height //= 2    # XOR bitmap + AND mask
+    if compression != 0 or bpp not in (1, 4, 8, 24, 32) or width <= 0 or height <= 0:
+        raise PEIconError(f"unsupported icon bitmap ({bpp} bpp, compression {compression})")
+    colors_used = struct.unpack_from('<I', dib, 32)[0]
+    palette = []
+    pos = hdr
+    if bpp <= 8:
+        for i in range(colors_used or (1 << bpp)):
+            b, g, r = dib[pos + i * 4:pos + i * 4 + 3]
+            palette.append((r, g, b))
+        pos += len(palette) * 4
+
+    stride = ((width * bpp + 31) // 32) * 4
+    mask_at = pos + stride * height
+    mask_stride = ((width + 31) // 32) * 4
+    has_mask = len(dib) >= mask_at + mask_stride * height
+
+    rgba = bytearray(width * height * 4)
+    any_alpha = False
+    for y in range(height):
+        row = pos + (height - 1 - y) * stride
+        out = y * width * 4
+        for x in range(width):
+            if bpp == 32:
+                b, g, r, a = dib[row + x * 4:row + x * 4 + 4]
+                any_alpha = any_alpha or a != 0
+            elif bpp == 24:
+                b, g, r = dib[row + x * 3:row + x * 3 + 3]
+                a = 255
+            else:
+                bit = x * bpp
+                byte = dib[row + bit // 8]
+                idx = (byte >> (8 - bpp - bit % 8)) & ((1 << bpp) - 1)
+                r, g, b = palette[idx] if idx < len(palette) else (0, 0, 0)
+                a = 255
+            rgba[out + x * 4:out + x * 4 + 4] = bytes((r, g, b, a))
+
+    # Icons without an alpha channel use the 1 bpp AND mask for transparency
+    if not any_alpha and has_mask:
+        for y in range(height):
+            row = mask_at + (height - 1 - y) * mask_stride
+            for x in range(width):
+                if dib[row + x // 8] & (0x80 >> (x % 8)):
+                    rgba[(y * width + x) * 4 + 3] = 0
+    return width, height, bytes(rgba)
+
+
+def _scale(width, height, rgba, size):
+    """Box-filter (down) or nearest-neighbour (up) scale to size x size."""
+    if (width, height) == (size, size):
+        return rgba
+    out = bytearray(size * size * 4)
+    for oy in range(size):
+        y0 = oy * height // size
+        y1 = max(y0 + 1, (oy + 1) * height // size)
+        for ox in range(size):
+            x0 = ox * width // size
+            x1 = max(x0 + 1, (ox + 1) * width // size)
+            r = g = b = a = 0
+            for y in range(y0, y1):
+                for x in range(x0, x1):
+                    i = (y * width + x) * 4
+                    pa = rgba[i + 3]
+                    r += rgba[i] * pa
+                    g += rgba[i + 1] * pa
+                    b += rgba[i + 2] * pa
+                    a += pa
+            n = (y1 - y0) * (x1 - x0)
+            o = (oy * size + ox) * 4
+            if a:
+                out[o:o + 4] = bytes((r // a, g // a, b // a, a // n))
+    return bytes(out)
+
+
+def _encode_png(width, height, rgba):
+    stride = width * 4
+    raw = b''.join(b'\0' + rgba[y * stride:(y + 1) * stride] for y in range(height))
+
+    def chunk(tag, body):
+        return struct.pack('>I', len(body)) + tag + body + struct.pack('>I', zlib.crc32(tag + body) & 0xffffffff)
+
+    return (PNG_SIGNATURE
+            + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(raw, 9))
+            + chunk(b'IEND', b''))
+
+
+def _write_png(image, output_path, size):
+    """Write one RT_ICON image (PNG or DIB) as a size x size PNG."""
+    try:
+        from PIL import Image
+    except ImportError:
+        Image = None
+
+    if image[:8] == PNG_SIGNATURE:
+        if Image is None:
+            png = image
+        else:
+            with Image.open(io.BytesIO(image)) as img:
+                img = img.convert('RGBA').resize((size, size))
+                buf = io.BytesIO()
+                img.save(buf, 'PNG')
+                png = buf.getvalue()
+    else:
+        width, height, rgba = _decode_dib(image)
+        if Image is not None:
+            img = Image.frombytes('RGBA', (width, height), rgba).resize((size, size))
+            width, height, rgba = size, size, img.tobytes()
+        else:
+            rgba = _scale(width, height, rgba, size)
+            width = height = size
+        png = _encode_png(width, height, rgba)
+
+    tmp = f"{output_path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(png)
+    os.replace(tmp, output_path)
+
+
+def extract_icon(exe_path, output_path, size=48):
+    """Write the icon of a Windows executable to output_path as a PNG.
+
+    The first RT_GROUP_ICON is read straight from the mmapped file and the
+    entry closest to `size` is decoded. Returns False if the file has no
+    usable icon, so callers can fall back to wrestool.
+    """
+    try:
+        from PIL import Image  # noqa: F401
+        can_decode_png = True
+    except ImportError:
+        can_decode_png = False
+
+    try:
+        with open(exe_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            res = PEResources(data)
+            groups = res.resources(RT_GROUP_ICON)
+            if not groups:
+                return False
+            icons = res.resources(RT_ICON)
+            group = res.read(groups[min(groups, key=lambda k: (k is None, k or 0))])
+            images = [res.read(icons[rid]) for rid in _rank_entries(group, size) if rid in icons]
+            if not can_decode_png:
+                # Without Pillow a PNG entry cannot be rescaled; prefer a DIB
+                images = [img for img in images if img[:8] != PNG_SIGNATURE] or images
+            if not images:
+                return False
+            _write_png(images[0], output_path, size)
+            return True
+    except (OSError, ValueError, IndexError, struct.error, PEIconError) as e:
+        print(f"Could not read icon from {exe_path}: {e}")
+        return False
@@ -0,0 +1,273 @@
+import os
+import time
+import threading
+from collections import deque
+
+from app import config
+from app import supervisor
+from app import shadercache
+
+CLK_TCK = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+# Finished sessions kept for the usage dialogs
+FINISHED_SESSIONS = 20
+
+_sampler = None
+
+
+class Sample:
+    """Totals over the processes of one session at one point in time."""
+
+    __slots__ = ('time', 'cpu', 'rss', 'swap', 'threads', 'procs')
+
+    def __init__(self, time, cpu, rss, swap, threads, procs):
+        self.time = time
+        self.cpu = cpu          # percent of one core, may exceed 100
+        self.rss = rss          # bytes
+        self.swap = swap        # bytes
+        self.threads = threads
+        self.procs = procs
+
+
+class Session:
+    """Samples of one launch, whose processes all share its session id."""
+
+    def __init__(self, launch, size):
+        self.key = launch.key
+        self.name = launch.name
+        self.sid = launch.pgid
+        self.started = launch.started
+        self.ended = None
+        self.samples = deque(maxlen=size)
+        # pid -> [comm, starttime, first cpu ticks, first seen, last cpu ticks, last seen, peak rss]
+        self.procs = {}
+        self.peak_rss = 0
+        self.peak_swap = 0
+        self.peak_threads = 0
+        self._last_ticks = None
+
+    def latest(self):
+        return self.samples[-1] if self.samples else None
+
+    def summary(self):
+        """{name, duration, samples, peak_rss, peak_swap, peak_threads, avg_cpu, processes}.
+
+        avg_cpu is the mean of the session total; processes lists
+        {pid, comm, avg_cpu, peak_rss} per process seen, busiest first.
+        """
+        cpus = [s.cpu for s in self.samples if s.cpu is not None]
+        processes = []
+        for pid, (comm, _, first, seen, last, last_seen, peak) in self.procs.items():
+            span = last_seen - seen
+            avg = (last - first) / CLK_TCK / span * 100 if span > 0 else 0.0
+            processes.append({'pid': pid, 'comm': comm, 'avg_cpu': round(avg, 1), 'peak_rss': peak})
+        processes.sort(key=lambda p: p['avg_cpu'], reverse=True)
+        return {
+            'name': self.name,
+            'duration': round((self.ended or time.time()) - self.started, 1),
+            'samples': len(self.samples),
+            'peak_rss': self.peak_rss,
+            'peak_swap': self.peak_swap,
+            'peak_threads': self.peak_threads,
+            'avg_cpu': round(sum(cpus) / len(cpus), 1) if cpus else 0.0,
+            'processes': processes,
+        }
+
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read().decode('utf-8', 'replace')
+
+
+def _stat_fields(pid):
+    """(comm, fields after comm) of /proc/<pid>/stat, or None."""
+    try:
+        stat = _read(f'/proc/{pid}/stat')
+    except OSError:
+        return None
+    # comm is in parentheses and may contain spaces
+    end = stat.rfind(')')
+    return stat[stat.find('(') + 1:end], stat[end + 2:].split()
+
+
+def _memory(pid):
+    """(rss bytes from statm, swap bytes from status) of one process."""
+    try:
+        rss = int(_read(f'/proc/{pid}/statm').split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+    swap = 0
+    try:
+        for line in _read(f'/proc/{pid}/status').splitlines():
+            if line.startswith('VmSwap:'):
+                swap = int(line.split()[1]) * 1024
+                break
+    except (OSError, IndexError, ValueError):
+        pass
+    return rss, swap
+
+
+class Sampler:
+    """Samples the process trees of running launches from /proc.
+
+    One thread serves every launch and sleeps while nothing runs. Each
+    tick reads /proc/*/stat once to find the members of the tracked
+    sessions (every launch has its own session, see Supervisor), and
+    statm and status only for those members. Samples go to a ring buffer
+    of sampler_samples entries per session, every sampler_interval
+    seconds. Listeners are called with no arguments after each tick,
+    from the sampler thread.
+    """
+
+    def __init__(self, sup=None):
+        self.supervisor = sup or supervisor.get_supervisor()
+        self.sessions = {}          # key -> live Session
+        self.finished = deque(maxlen=FINISHED_SESSIONS)
+        self.listeners = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self.supervisor.add_listener(self._on_launch)
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def _notify(self):
+        for callback in list(self.listeners):
+            try:
+                callback()
+            except Exception as e:
+                print(f"Sampler listener error: {e}")
+
+    def _on_launch(self, launch):
+        settings = config.load_settings()
+        if not settings['sampler_interval']:
+            return
+        with self._lock:
+            if launch.running:
+                self.sessions[launch.key] = Session(launch, settings['sampler_samples'])
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name='sampler', daemon=True)
+                    self._thread.start()
+            else:
+                session = self.sessions.get(launch.key)
+                if session is not None and session.sid == launch.pgid:
+                    del self.sessions[launch.key]
+                    session.ended = launch.ended
+                    self.finished.append(session)
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self.sessions:
+                    self._thread = None
+                    return
+            self.sample()
+            self._notify()
+            self._wake.clear()
+            self._wake.wait(max(0.2, float(config.load_settings()['sampler_interval'] or 1)))
+
+    def sample(self):
+        """Take one sample of every tracked session."""
+        with self._lock:
+            by_sid = {s.sid: s for s in self.sessions.values()}
+        if not by_sid:
+            return
+        now = time.monotonic()
+        members = {sid: [] for sid in by_sid}
+        try:
+            pids = [int(p) for p in os.listdir('/proc') if p.isdigit()]
+        except OSError:
+            return
+        for pid in pids:
+            info = _stat_fields(pid)
+            if info is None:
+                continue
+            comm, fields = info
+            try:
+                sid = int(fields[3])
+                if sid in members:
+                    # utime + stime, threads, starttime
+                    members[sid].append((pid, comm, int(fields[11]) + int(fields[12]),
+                                         int(fields[17]), fields[19]))
+            except (IndexError, ValueError):
+                continue
+        for sid, procs in members.items():
+            self._add_sample(by_sid[sid], procs, now)
+
+    @staticmethod
+    def _add_sample(session, procs, now):
+        ticks = rss = swap = threads = 0
+        for pid, comm, cpu, nthreads, start in procs:
+            mem = _memory(pid)
+            if mem is None:
+                continue
+            known = session.procs.get(pid)
+            if known is None or known[1] != start:
+                known = session.procs[pid] = [comm, start, cpu, now, cpu, now, 0]
+            # comm changes when the process execs (sh -> wine)
+            known[0], known[4], known[5] = comm, cpu, now
+            known[6] = max(known[6], mem[0])
+            ticks += cpu
+            rss += mem[0]
+            swap += mem[1]
+            threads += nthreads
+        cpu_pct = None
+        if session._last_ticks is not None:
+            last_ticks, last_time = session._last_ticks
+            if now > last_time:
+                # Exited processes take their ticks with them; never go negative
+                cpu_pct = max(0.0, (ticks - last_ticks) / CLK_TCK / (now - last_time) * 100)
+        session._last_ticks = (ticks, now)
+        session.samples.append(Sample(time.time(), cpu_pct, rss, swap, threads, len(procs)))
+        session.peak_rss = max(session.peak_rss, rss)
+        session.peak_swap = max(session.peak_swap, swap)
+        session.peak_threads = max(session.peak_threads, threads)
+
+    def latest(self, key):
+        session = self.sessions.get(key)
+        return session.latest() if session else None
+
+    def summaries(self):
+        """Summaries of the running sessions, then the finished ones, newest first."""
+        with self._lock:
+            sessions = list(self.sessions.values()) + list(reversed(self.finished))
+        return [s.summary() for s in sessions]
+
+
+def get_sampler():
+    """The Sampler shared by the frontends; it follows the shared Supervisor."""
+    global _sampler
+    if _sampler is None:
+        _sampler = Sampler()
+    return _sampler
+
+
+def live_text(key):
+    """'35% CPU, 1.2 GiB' for a running launch with samples, else ''."""
+    if _sampler is None:
+        return ''
+    sample = _sampler.latest(key)
+    if sample is None:
+        return ''
+    text = shadercache.format_size(sample.rss)
+    if sample.swap:
+        text += f" (+{shadercache.format_size(sample.swap)} swap)"
+    if sample.cpu is not None:
+        text = f"{sample.cpu:.0f}% CPU, {text}"
+    return text
+
+
+def summary_lines(summary, top=3):
+    """Text lines describing one session summary, for the usage dialogs."""
+    lines = [
+        f"{summary['name']}: {summary['duration']:.0f} s, {summary['samples']} samples",
+        f"  peak RSS {shadercache.format_size(summary['peak_rss'])}, swap {shadercache.format_size(summary['peak_swap'])}, "
+        f"{summary['peak_threads']} threads, avg CPU {summary['avg_cpu']:.0f}%",
+    ]
+    for proc in summary['processes'][:top]:
+        lines.append(f"  {proc['comm']} [{proc['pid']}]: {proc['avg_cpu']:.0f}% CPU, "
+                     f"peak {shadercache.format_size(proc['peak_rss'])}")
+    return lines
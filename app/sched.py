@@ -0,0 +1,189 @@
+import os
+
+# .desktop keys holding the per-shortcut settings
+CPUS_KEY = 'X-Barrel-CPUs'
+NICE_KEY = 'X-Barrel-Nice'
+IOPRIO_KEY = 'X-Barrel-IOPrio'
+KEYS = (CPUS_KEY, NICE_KEY, IOPRIO_KEY)
+
+CPU_SYSFS = '/sys/devices/system/cpu'
+
+# <linux/ioprio.h>
+IOPRIO_CLASSES = {'rt': 1, 'be': 2, 'idle': 3}
+IOPRIO_WHO_PROCESS = 1
+IOPRIO_CLASS_SHIFT = 13
+SYS_IOPRIO_SET = {'x86_64': 251, 'i386': 289, 'i686': 289, 'aarch64': 30, 'armv7l': 314, 'armv8l': 314}
+
+
+def parse_cpus(text):
+    """CPU list such as '4-7' or '0,2,4-5' -> set of ints; 'auto' -> fastest_cluster()."""
+    text = (text or '').strip()
+    if not text:
+        return None
+    if text == 'auto':
+        return fastest_cluster()
+    cpus = set()
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        first, sep, last = part.partition('-')
+        if sep:
+            cpus.update(range(int(first), int(last) + 1))
+        else:
+            cpus.add(int(first))
+    return cpus or None
+
+
+def format_cpus(cpus):
+    """Inverse of parse_cpus: {0, 4, 5, 6, 7} -> '0,4-7'."""
+    ranges = []
+    for cpu in sorted(cpus):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ','.join(str(a) if a == b else f'{a}-{b}' for a, b in ranges)
+
+
+def parse_ioprio(text):
+    """'be/4', 'rt/0', 'idle' -> (class, level), or None."""
+    text = (text or '').strip().lower()
+    if not text:
+        return None
+    name, _, level = text.partition('/')
+    if name not in IOPRIO_CLASSES:
+        raise ValueError(f"unknown I/O priority class {name!r} (use rt, be or idle)")
+    level = int(level) if level else 4
+    if not 0 <= level <= 7:
+        raise ValueError("I/O priority level must be 0-7")
+    return IOPRIO_CLASSES[name], level
+
+
+def _read_int(path):
+    try:
+        with open(path) as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def cpu_capacities():
+    """{cpu: capacity} of the CPUs we may run on.
+
+    Uses cpu_capacity (arm64 big.LITTLE), else cpuinfo_max_freq.
+    """
+    try:
+        allowed = os.sched_getaffinity(0)
+    except (AttributeError, OSError):
+        allowed = set(range(os.cpu_count() or 1))
+    caps = {}
+    for cpu in sorted(allowed):
+        base = os.path.join(CPU_SYSFS, f'cpu{cpu}')
+        value = _read_int(os.path.join(base, 'cpu_capacity'))
+        if value is None:
+            value = _read_int(os.path.join(base, 'cpufreq', 'cpuinfo_max_freq'))
+        if value is not None:
+            caps[cpu] = value
+    return caps
+
+
+def fastest_cluster():
+    """CPUs with the highest capacity, or None when they are all alike (or unknown)."""
+    caps = cpu_capacities()
+    if not caps:
+        return None
+    best = max(caps.values())
+    fastest = {cpu for cpu, value in caps.items() if value == best}
+    return fastest if len(fastest) < len(caps) else None
+
+
+def _ioprio_setter():
+    # Imported on first use; they are slow to import and rarely needed
+    import ctypes
+    import platform
+    nr = SYS_IOPRIO_SET.get(platform.machine())
+    if nr is None:
+        return None
+    try:
+        syscall = ctypes.CDLL(None, use_errno=True).syscall
+    except (OSError, AttributeError):
+        return None
+
+    def ioprio_set(pid, ioclass, level):
+        return syscall(nr, IOPRIO_WHO_PROCESS, pid, (ioclass << IOPRIO_CLASS_SHIFT) | level) == 0
+    return ioprio_set
+
+
+class SchedSettings:
+    """CPU set, nice value and I/O priority of one shortcut."""
+
+    __slots__ = ('cpus', 'nice', 'ioprio')
+
+    def __init__(self, cpus=None, nice=None, ioprio=None):
+        self.cpus = cpus
+        self.nice = nice
+        self.ioprio = ioprio
+
+    @classmethod
+    def from_values(cls, values):
+        """From the X-Barrel-* keys of a desktop entry; bad values are ignored."""
+        settings = cls()
+        try:
+            settings.cpus = parse_cpus(values.get(CPUS_KEY))
+        except ValueError:
+            print(f"Ignoring invalid {CPUS_KEY}={values.get(CPUS_KEY)}")
+        nice = (values.get(NICE_KEY) or '').strip()
+        if nice:
+            try:
+                settings.nice = max(-20, min(19, int(nice)))
+            except ValueError:
+                print(f"Ignoring invalid {NICE_KEY}={nice}")
+        try:
+            settings.ioprio = parse_ioprio(values.get(IOPRIO_KEY))
+        except ValueError as e:
+            print(f"Ignoring {IOPRIO_KEY}: {e}")
+        return settings
+
+    def __bool__(self):
+        return self.cpus is not None or self.nice is not None or self.ioprio is not None
+
+    def apply(self, pid):
+        """Apply the settings to the running process pid; failures are ignored.
+
+        Called right after Popen rather than between fork and exec, which
+        is unsafe in a threaded program. CPU set, nice and I/O priority are
+        per thread on Linux, so every thread the process has by now is set;
+        later threads and children inherit from them.
+        """
+        if not self:
+            return
+        ioprio_set = _ioprio_setter() if self.ioprio else None
+        try:
+            tids = [int(tid) for tid in os.listdir(f'/proc/{pid}/task')]
+        except (OSError, ValueError):
+            tids = [pid]
+        for tid in tids:
+            if self.cpus:
+                try:
+                    os.sched_setaffinity(tid, self.cpus)
+                except OSError:
+                    pass
+            if self.nice is not None:
+                try:
+                    os.setpriority(os.PRIO_PROCESS, tid, self.nice)
+                except OSError:
+                    pass
+            if ioprio_set is not None:
+                ioprio_set(tid, *self.ioprio)
+
+
+def validate(cpus, nice, ioprio):
+    """Check edit-dialog input; returns the {key: value} to store, raises ValueError."""
+    cpus, nice, ioprio = cpus.strip(), nice.strip(), ioprio.strip()
+    if cpus and cpus != 'auto':
+        parse_cpus(cpus)
+    if nice and not -20 <= int(nice) <= 19:
+        raise ValueError("nice must be between -20 and 19")
+    parse_ioprio(ioprio)
+    return {CPUS_KEY: cpus, NICE_KEY: nice, IOPRIO_KEY: ioprio}
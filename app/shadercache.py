@@ -0,0 +1,167 @@
+import os
+import time
+import shutil
+import threading
+from pathlib import Path
+
+from app import config
+from app import supervisor
+
+XDG_CACHE_HOME = Path(os.getenv('XDG_CACHE_HOME', Path.home() / '.cache'))
+CACHE_DIR = XDG_CACHE_HOME / 'shortcut_launcher'
+SHADERS_DIR = CACHE_DIR / 'shaders'
+
+# Set by the launcher to the cache directory of the shortcut being started
+CACHE_ENV = 'BARREL_SHADER_CACHE'
+# Cache locations of DXVK, VKD3D-Proton, the NVIDIA GL driver and Mesa
+CACHE_VARS = (
+    'DXVK_STATE_CACHE_PATH',
+    'VKD3D_SHADER_CACHE_PATH',
+    '__GL_SHADER_DISK_CACHE_PATH',
+    'MESA_SHADER_CACHE_DIR',
+)
+# Touched on every launch; its mtime is the LRU clock of evict()
+STAMP = '.last_launch'
+
+# Held by the background eviction of prepare(), so launches in a row start one
+_evicting = threading.Lock()
+
+
+def cache_name(key):
+    """Directory name of a shortcut's cache: the .desktop file name without suffix."""
+    return Path(key).stem or key
+
+
+def cache_dir(key):
+    return SHADERS_DIR / cache_name(key)
+
+
+def template_exports():
+    """Export lines for generated templates.
+
+    They point DXVK and VKD3D at the directory the launcher passes in
+    CACHE_ENV, and keep the old behaviour (the game's directory, where the
+    template cd's to) when the template is run by hand.
+    """
+    return [f'export {var}="${{{CACHE_ENV}:-.}}"' for var in CACHE_VARS[:2]]
+
+
+def prepare(key, env=None, evict_others=True):
+    """Create the cache of shortcut `key`, mark it as launched and return env with the cache variables.
+
+    With evict_others, caches of other shortcuts are evicted in the
+    background if the total is over budget, unless an eviction started by
+    an earlier launch is still running.
+    """
+    env = dict(os.environ if env is None else env)
+    path = cache_dir(key)
+    try:
+        path.mkdir(parents=True, exist_ok=True)
+        (path / STAMP).touch()
+    except OSError as e:
+        print(f"Shader cache unavailable for {key}: {e}")
+        return env
+    env[CACHE_ENV] = str(path)
+    for var in CACHE_VARS:
+        env[var] = str(path)
+    if evict_others and _evicting.acquire(blocking=False):
+        threading.Thread(target=_evict_in_background, args=(cache_name(key),), daemon=True).start()
+    return env
+
+
+def _evict_in_background(name):
+    try:
+        evict(keep=(name,))
+    finally:
+        _evicting.release()
+
+
+def _tree_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def _last_launch(path):
+    for candidate in (path / STAMP, path):
+        try:
+            return candidate.stat().st_mtime
+        except OSError:
+            pass
+    return 0.0
+
+
+def caches():
+    """[(name, path, bytes, last launch time)] of every cache, most recent first."""
+    result = []
+    try:
+        with os.scandir(SHADERS_DIR) as it:
+            for de in it:
+                if de.is_dir(follow_symlinks=False):
+                    path = Path(de.path)
+                    result.append((de.name, path, _tree_size(path), _last_launch(path)))
+    except OSError:
+        return []
+    result.sort(key=lambda c: c[3], reverse=True)
+    return result
+
+
+def total_size():
+    return sum(c[2] for c in caches())
+
+
+def clear(key):
+    """Delete the cache of one shortcut (when it is deleted, or on request)."""
+    shutil.rmtree(cache_dir(key), ignore_errors=True)
+
+
+def evict(budget=None, keep=()):
+    """Delete least recently launched caches until the total fits budget bytes.
+
+    Caches named in keep and those of running shortcuts are never deleted.
+    Returns the names of the deleted caches.
+    """
+    if budget is None:
+        budget = config.load_settings()['shader_cache_bytes']
+    if not budget:
+        return []
+    entries = caches()
+    total = sum(c[2] for c in entries)
+    running = {cache_name(l.key) for l in supervisor.get_supervisor().running()}
+    evicted = []
+    for name, path, size, _ in reversed(entries):
+        if total <= budget:
+            break
+        if name in keep or name in running:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+        evicted.append(name)
+    if evicted:
+        print(f"Evicted shader caches: {', '.join(evicted)}")
+    return evicted
+
+
+def format_size(size):
+    for unit in ('B', 'KiB', 'MiB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def describe(last):
+    """Relative time of a last launch for display."""
+    if not last:
+        return 'never'
+    age = time.time() - last
+    if age < 3600:
+        return f"{int(age // 60)} min ago"
+    if age < 86400:
+        return f"{int(age // 3600)} h ago"
+    return f"{int(age // 86400)} d ago"
@@ -1,9 +1,17 @@
 import os
-import subprocess
+import json
 import shutil
 from pathlib import Path
 import re
 
+from app import supervisor
+from app import timings
+from app import launchplan
+from app import desktop_exec
+from app import launchqueue
+from app import sched
+from app import shadercache
+
 # === XDG Base Directory Spec ===
 XDG_CONFIG_HOME = Path(os.getenv('XDG_CONFIG_HOME', Path.home() / '.config'))
 CONFIG_DIR = XDG_CONFIG_HOME / 'shortcut_launcher'
@@ -16,15 +24,364 @@ CACHE_DIR = XDG_CACHE_HOME / 'shortcut_launcher'
 
 HOME = os.path.expanduser("~")
 SHORTCUTS_DIR = str(DATA_DIR / 'shortcuts')
+APPS_DIR = XDG_DATA_HOME / 'applications' / 'shortcuts'
+
+def shortcut_target(exec_val):
+    """Best guess at the file an Exec= value launches, or None."""
+    tpl, target = parse_exec_template(exec_val)
+    if tpl:
+        return target
+    if not exec_val:
+        return None
+    # base_exec of create_shortcut_common: sh -c '<path>; read -p ...'
+    m = re.match(r"sh\s+-c\s+'([^;']+);", exec_val)
+    if m:
+        return m.group(1).strip()
+    quoted = re.findall(r'"([^"]+)"', exec_val)
+    if quoted:
+        return quoted[-1]
+    return exec_val.split()[-1]
+
+def set_desktop_keys(path, values):
+    """Set keys of the [Desktop Entry] group in one read/write pass.
+
+    Existing lines are replaced in place, missing keys are appended to the
+    group, everything else is kept. The file is replaced atomically and
+    keeps its mode.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    pending = dict(values)
+    out = []
+    in_group = False
+    group_end = None
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith('['):
+            if in_group and group_end is None:
+                group_end = len(out)
+            in_group = stripped == '[Desktop Entry]'
+        elif in_group:
+            key = stripped.partition('=')[0].rstrip()
+            if key in pending:
+                line = f"{key}={pending.pop(key)}"
+        out.append(line)
+    if group_end is None:
+        group_end = len(out)
+    out[group_end:group_end] = [f"{k}={v}" for k, v in pending.items()]
+
+    mode = os.stat(path).st_mode & 0o7777
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("\n".join(out) + "\n")
+    os.chmod(tmp, mode)
+    os.replace(tmp, path)
+
+class DesktopEntry:
+    """Values read from the [Desktop Entry] group of a .desktop file."""
+    __slots__ = ('name', 'exec', 'icon', 'terminal', 'workdir', 'type', 'comment', 'extra')
+
+    FIELDS = {
+        'Name': 'name',
+        'Exec': 'exec',
+        'Icon': 'icon',
+        'Terminal': 'terminal',
+        'Path': 'workdir',
+        'Type': 'type',
+        'Comment': 'comment',
+    }
+
+    def __init__(self):
+        self.name = None
+        self.exec = None
+        self.icon = None
+        self.terminal = None
+        self.workdir = None
+        self.type = None
+        self.comment = None
+        self.extra = {}
+
+    def __repr__(self):
+        return f"DesktopEntry(name={self.name!r}, exec={self.exec!r}, icon={self.icon!r})"
+
+def read_desktop_entry(path, keys=None):
+    """Parse the [Desktop Entry] group of a .desktop file.
+
+    The file is read line by line and reading stops at the next group, or
+    as soon as every key in `keys` has been seen. With keys=None the whole
+    group is parsed. Keys without a DesktopEntry field (X-*, etc.) are
+    kept in entry.extra when keys is None or lists them. Localized keys
+    such as Name[ro] are skipped. Terminal is returned as a bool, or None
+    if it is not set.
+    """
+    entry = DesktopEntry()
+    wanted = set(keys) if keys is not None else None
+    in_group = False
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line[0] == '#':
+                continue
+            if line[0] == '[':
+                if in_group:
+                    break
+                in_group = line == '[Desktop Entry]'
+                continue
+            if not in_group:
+                continue
+            key, sep, value = line.partition('=')
+            if not sep:
+                continue
+            key = key.rstrip()
+            if wanted is not None and key not in wanted:
+                continue
+            value = value.lstrip()
+            field = DesktopEntry.FIELDS.get(key)
+            if field is None:
+                if '[' in key or key in entry.extra:
+                    continue
+                entry.extra[key] = value
+            else:
+                if getattr(entry, field) is not None:
+                    continue
+                if field == 'terminal':
+                    value = value.lower() == 'true'
+                setattr(entry, field, value)
+            if wanted is not None:
+                wanted.discard(key)
+                if not wanted:
+                    break
+    return entry
+
+# Background icon extraction for new shortcuts
+_icon_worker = None
+
+# Catalog of parsed .desktop files, keyed by (inode, mtime, size)
+CATALOG_FILE = CACHE_DIR / 'shortcuts_index.json'
+CATALOG_VERSION = 1
+_catalog = None
+
+def parse_exec_template(exec_val):
+    """Split an Exec= value into (template name, target path).
+
+    Only the `bash "<template>" "<target>"` form written by
+    create_shortcut_common carries a template; anything else is returned
+    as (None, exec_val).
+    """
+    m = re.match(r'bash\s+"([^"]+)"\s+"([^"]+)"', exec_val or '')
+    if m:
+        return os.path.basename(m.group(1)), m.group(2)
+    return None, exec_val
+
+def _read_catalog_file(apps_dir):
+    try:
+        with open(CATALOG_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get('version') != CATALOG_VERSION or data.get('dir') != str(apps_dir):
+        return {}
+    return data.get('entries', {})
+
+def _write_catalog_file(apps_dir, entries):
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = CATALOG_FILE.with_suffix('.tmp')
+        # One write: json.dump would issue a write per token
+        data = json.dumps({'version': CATALOG_VERSION, 'dir': str(apps_dir), 'entries': entries})
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, CATALOG_FILE)
+    except OSError as e:
+        print(f"Could not save shortcut catalog: {e}")
+
+def cached_catalog(apps_dir=None):
+    """The entries of the last load_catalog() straight from CATALOG_FILE.
+
+    The .desktop files are not looked at, so this is only good for a first
+    paint; call load_catalog() afterwards to pick up changes. Returns None
+    when there is no catalog for apps_dir yet.
+    """
+    global _catalog
+    apps_dir = Path(apps_dir or APPS_DIR)
+    entries = _read_catalog_file(apps_dir)
+    if not entries:
+        return None
+    _catalog = (str(apps_dir), entries)
+    return [
+        dict(entries[fname], file=fname, path=str(apps_dir / fname))
+        for fname in sorted(entries)
+    ]
+
+def _catalog_entry(path, key):
+    """Catalog entry of one .desktop file, or None if it cannot be read."""
+    try:
+        de_entry = read_desktop_entry(path, ('Name', 'Exec', 'Icon'))
+    except (OSError, UnicodeDecodeError):
+        return None
+    exec_val = de_entry.exec or ''
+    return {
+        'key': key,
+        'name': de_entry.name or os.path.splitext(os.path.basename(path))[0],
+        'exec': exec_val,
+        'icon': de_entry.icon or '',
+        'template': parse_exec_template(exec_val)[0],
+    }
 
-def run_shortcut(filename):
+def load_catalog(apps_dir=None):
+    """Return the shortcuts in apps_dir as a list of dicts sorted by filename.
+
+    Each entry has file, path, name, exec, icon and template. Parsed
+    entries are kept in CACHE_DIR and only files whose (inode, mtime,
+    size) changed since the last call are read again.
+    """
+    global _catalog
+    apps_dir = Path(apps_dir or APPS_DIR)
+    apps_dir.mkdir(parents=True, exist_ok=True)
+    if _catalog is None or _catalog[0] != str(apps_dir):
+        _catalog = (str(apps_dir), _read_catalog_file(apps_dir))
+    cached = _catalog[1]
+
+    entries = {}
+    changed = False
+    with os.scandir(apps_dir) as it:
+        for de in it:
+            if not de.name.endswith('.desktop'):
+                continue
+            try:
+                st = de.stat()
+            except OSError:
+                continue
+            key = [st.st_ino, st.st_mtime_ns, st.st_size]
+            entry = cached.get(de.name)
+            if entry is None or entry['key'] != key:
+                entry = _catalog_entry(de.path, key)
+                if entry is None:
+                    continue
+                changed = True
+            entries[de.name] = entry
+    if changed or len(entries) != len(cached):
+        _catalog = (str(apps_dir), entries)
+        _write_catalog_file(apps_dir, entries)
+
+    return [
+        dict(entries[fname], file=fname, path=str(apps_dir / fname))
+        for fname in sorted(entries)
+    ]
+
+def update_catalog(names, apps_dir=None):
+    """Bring the catalog up to date for some files only, e.g. from watcher events.
+
+    Returns {file name: entry as in load_catalog(), or None when the file
+    is gone}. Like load_catalog(), files whose (inode, mtime, size) did
+    not change are not read again.
+    """
+    apps_dir = Path(apps_dir or APPS_DIR)
+    if _catalog is None or _catalog[0] != str(apps_dir):
+        # Nothing loaded yet to update
+        entries = {e['file']: e for e in load_catalog(apps_dir)}
+        return {name: entries.get(name) for name in names}
+    cached = _catalog[1]
+
+    result = {}
+    changed = False
+    for name in names:
+        path = apps_dir / name
+        try:
+            st = os.stat(path)
+            key = [st.st_ino, st.st_mtime_ns, st.st_size]
+        except OSError:
+            key = None
+        entry = cached.get(name)
+        if key is not None and (entry is None or entry['key'] != key):
+            entry = _catalog_entry(str(path), key)
+            changed = True
+        if key is None or entry is None:
+            changed |= cached.pop(name, None) is not None
+            result[name] = None
+            continue
+        cached[name] = entry
+        result[name] = dict(entry, file=name, path=str(path))
+    if changed:
+        _write_catalog_file(apps_dir, cached)
+    return result
+
+def launch_desktop_file(path, timer=None, stdout=None):
+    """Launch a shortcut's .desktop file through the launch queue.
+
+    The launch is keyed by the file name. Shortcuts whose template
+    compiles to a launchplan.LaunchPlan are exec'd directly; anything else
+    runs its Exec= line as parsed by desktop_exec. Returns the Launch, or
+    None if the launch was queued or cannot be run; raises
+    launchqueue.LaunchRejected when the queue refuses it. With a
+    timings.LaunchTimer the template lookup and spawn are marked and the
+    first wine process is watched for (not for launches that had to wait).
+    stdout is passed to Popen for the game and its post-run actions; by
+    default they write to ours.
+    """
+    key = os.path.basename(path)
+    try:
+        entry = read_desktop_entry(path, ('Name', 'Exec', 'Terminal') + sched.KEYS)
+    except OSError as e:
+        print(f"Cannot launch {key}: {e}")
+        return None
+    plan = launchplan.get_plan(path)
+    if timer is not None:
+        timer.template, _ = parse_exec_template(entry.exec or '')
+        timer.mark('template_resolved')
+    # Prefix and runner for the queue; resolved again with the shader cache in start()
+    resolved = plan.resolve() if plan is not None else None
+    prefix = resolved[1].get('WINEPREFIX') if resolved else None
+
+    policy = sched.SchedSettings.from_values(entry.extra)
+
+    def start(waited):
+        # Per-shortcut DXVK/VKD3D/GL shader cache directory, only for launches that run
+        env = shadercache.prepare(key)
+        resolved = plan.resolve(env) if plan is not None else None
+        return _spawn_entry(key, path, entry, plan, resolved, env, policy, None if waited else timer, stdout)
+
+    argv = resolved[0] if resolved else (entry.exec or '').split()
+    return launchqueue.get_queue().submit(key, entry.name or key,
+                                          os.path.realpath(prefix) if prefix else None, start,
+                                          wine=launchqueue.is_wine_command(argv))
+
+def _spawn_entry(key, path, entry, plan, resolved, env, policy, timer, stdout=None):
+    sup = supervisor.get_supervisor()
+    launch = None
+    if plan is not None:
+        argv, plan_env, cwd = resolved
+        try:
+            # Never wrapped in a terminal: the supervisor tracks the game itself
+            launch = sup.launch(key, argv,
+                                name=entry.name or key, env=plan_env, cwd=cwd, stdout=stdout,
+                                post_actions=plan.post_actions, post_on_start=plan.background,
+                                post_args=plan.args)
+        except OSError as e:
+            print(f"Direct launch of {key} failed ({e}), running Exec=")
+    if launch is None:
+        try:
+            argv, cwd, terminal = desktop_exec.entry_command(path)
+            launch = sup.launch(key, desktop_exec.wrap_terminal(argv, terminal),
+                                name=entry.name or key, env=env, cwd=cwd, stdout=stdout)
+        except (OSError, desktop_exec.ExecError) as e:
+            print(f"Cannot launch {key}: {e}")
+            return None
+    # CPU set / nice / I/O priority of the shortcut
+    policy.apply(launch.process.pid)
+    if timer is not None:
+        timer.mark('spawned')
+        timer.watch(launch)
+    return launch
+
+def run_shortcut(filename, timer=None):
     desktop_dir = (
         os.path.join(HOME, "Desktop")
         if os.path.exists(os.path.join(HOME, "Desktop"))
         else HOME
     )
     path = os.path.join(desktop_dir, filename)
-    subprocess.Popen(["bash", path])
+    return launch_desktop_file(path, timer or timings.LaunchTimer(filename))
 
 def delete_shortcut(filename):
     # — 1) .desktop from Applications —
@@ -48,6 +405,33 @@ def delete_shortcut(filename):
         if ico.exists():
             ico.unlink()
 
+    # — 4) shader caches —
+    shadercache.clear(filename)
+
+def _extract_icon_async(exe_path, icon_file, desktop_file, extract_exe_icon_cb, icon_ready_cb):
+    """Extract the icon on a worker thread, then patch Icon= and notify.
+
+    icon_ready_cb(desktop_file, icon_path) is called from the worker
+    thread; icon_path is None when no icon could be extracted.
+    """
+    global _icon_worker
+    if _icon_worker is None:
+        # Imported here: concurrent.futures pulls in logging, which the CLI never needs
+        from concurrent.futures import ThreadPoolExecutor
+        _icon_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix='icon')
+
+    def job():
+        icon_path = None
+        try:
+            if extract_exe_icon_cb(exe_path, str(icon_file)):
+                set_desktop_keys(desktop_file, {'Icon': str(icon_file)})
+                icon_path = str(icon_file)
+        except Exception as e:
+            print(f"Error extracting icon: {e}")
+        icon_ready_cb(str(desktop_file), icon_path)
+
+    return _icon_worker.submit(job)
+
 def create_shortcut_common(
     preselected_path,
     ask_string_cb,
@@ -59,8 +443,16 @@ def create_shortcut_common(
     extract_exe_icon_cb,
     refresh_shortcuts_cb,
     TEMPLATES_DIR,
-    HOME
+    HOME,
+    icon_ready_cb=None
 ):
+    """Ask for the shortcut details through the callbacks and write it.
+
+    With icon_ready_cb, the .desktop file is written right away with a
+    placeholder icon and the .exe icon is extracted in the background (see
+    _extract_icon_async). Without it, extraction runs inline and the user
+    is asked for an icon if it fails.
+    """
     # 1. Ask for name and path
     if preselected_path:
         default_name = Path(preselected_path).stem
@@ -81,6 +473,7 @@ def create_shortcut_common(
     templates = ["(fără template)"] + get_templates_cb()
     tpl = select_template_cb(templates)
 
+    tpl_path = None
     if tpl and tpl != "(fără template)":
         tpl_path = Path(TEMPLATES_DIR) / tpl
         exec_cmd = f'bash "{tpl_path}" "{path}"'
@@ -95,8 +488,9 @@ def create_shortcut_common(
 
     # 5. Extract icon from EXE or prompt for one
     icon_path = "application-x-executable"
-    if path.lower().endswith('.exe'):
-        tmpico = icons_data / f"{Path(path).stem}.png"
+    tmpico = icons_data / f"{Path(path).stem}.png"
+    extract_later = path.lower().endswith('.exe') and icon_ready_cb is not None
+    if path.lower().endswith('.exe') and not extract_later:
         if extract_exe_icon_cb(path, str(tmpico)):
             icon_path = str(tmpico)
         else:
@@ -117,7 +511,7 @@ Type=Application
 Name={name}
 Exec={exec_cmd}
 Icon={used_icon}
-Terminal=true
+Terminal={'false' if tpl_path else 'true'}
 Comment=Created with Shortcut Launcher
 X-Shortcut-Manager=Shortcut Launcher
 """
@@ -139,5 +533,9 @@ X-Shortcut-Manager=Shortcut Launcher
     except Exception:
         shutil.copy2(desktop_file, desktop_link)
 
+    # 8. Fill in the real icon once it is extracted
+    if extract_later:
+        _extract_icon_async(path, tmpico, desktop_file, extract_exe_icon_cb, icon_ready_cb)
+
     show_info_cb("Success", f"Shortcut created and on Desktop:\n{desktop_link}")
     refresh_shortcuts_cb()
\ No newline at end of file
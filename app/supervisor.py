@@ -0,0 +1,233 @@
+import os
+import json
+import time
+import fcntl
+import signal
+import threading
+import subprocess
+from pathlib import Path
+
+XDG_DATA_HOME = Path(os.getenv('XDG_DATA_HOME', Path.home() / '.local' / 'share'))
+DATA_DIR = XDG_DATA_HOME / 'shortcut_launcher'
+HISTORY_FILE = DATA_DIR / 'launch_history.json'
+
+# Runs kept per shortcut in HISTORY_FILE
+HISTORY_RUNS = 20
+
+_supervisor = None
+
+
+class Launch:
+    """One launched shortcut. The process group id equals pid (own session)."""
+
+    __slots__ = ('key', 'name', 'pid', 'pgid', 'started', 'ended', 'returncode', 'process')
+
+    def __init__(self, key, name, process):
+        self.key = key
+        self.name = name
+        self.process = process
+        self.pid = process.pid
+        self.pgid = process.pid
+        self.started = time.time()
+        self.ended = None
+        self.returncode = None
+
+    @property
+    def running(self):
+        return self.ended is None
+
+    @property
+    def duration(self):
+        return (self.ended or time.time()) - self.started
+
+
+class Supervisor:
+    """Registry of launched shortcuts.
+
+    Every launch gets its own session, so stop() can signal the whole
+    process tree (wineserver, the game, helper scripts). A waiter thread
+    per launch reaps the child as soon as it exits and records the exit
+    code and run time in HISTORY_FILE. Listeners are called with the
+    Launch on start and on exit, from the launching or the waiter thread.
+
+    The GUIs and `barrel run` each have their own Supervisor: every
+    record re-reads HISTORY_FILE under a lock file and merges into it,
+    so none of them overwrites the runs of another.
+    """
+
+    def __init__(self, history_file=HISTORY_FILE):
+        self.history_file = Path(history_file)
+        self.launches = {}
+        self.listeners = []
+        self._lock = threading.Lock()
+        self._history = None
+        self._history_stat = None
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def _notify(self, launch):
+        for callback in list(self.listeners):
+            try:
+                callback(launch)
+            except Exception as e:
+                print(f"Launch listener error: {e}")
+
+    def launch(self, key, argv, name=None, post_actions=(), post_on_start=False, post_args=(),
+               **popen_kwargs):
+        """Start argv for shortcut `key` and return its Launch.
+
+        post_actions are shell lines run through sh, with the launch's env
+        and cwd and post_args as "$1"..., once the process exited (or right
+        after the start with post_on_start, like a template whose runner
+        ends in &). They write to the same stdout as the process.
+        """
+        popen_kwargs.setdefault('start_new_session', True)
+        process = subprocess.Popen(argv, **popen_kwargs)
+        launch = Launch(key, name or key, process)
+        with self._lock:
+            self.launches.setdefault(key, []).append(launch)
+        post = (list(post_actions), list(post_args), popen_kwargs.get('env'), popen_kwargs.get('cwd'),
+                post_on_start, popen_kwargs.get('stdout'))
+        threading.Thread(target=self._wait, args=(launch, post), daemon=True).start()
+        self._notify(launch)
+        return launch
+
+    @staticmethod
+    def _run_post_actions(actions, args, env, cwd, stdout=None):
+        for action in actions:
+            try:
+                subprocess.run(['sh', '-c', action, 'sh', *args], env=env, cwd=cwd, stdout=stdout)
+            except OSError as e:
+                print(f"Post-run action failed: {action}: {e}")
+
+    def _wait(self, launch, post=((), (), None, None, False, None)):
+        actions, args, env, cwd, on_start, stdout = post
+        if actions and on_start:
+            self._run_post_actions(actions, args, env, cwd, stdout)
+        returncode = launch.process.wait()
+        launch.returncode = returncode
+        launch.ended = time.time()
+        if actions and not on_start:
+            self._run_post_actions(actions, args, env, cwd, stdout)
+        with self._lock:
+            live = self.launches.get(launch.key, [])
+            if launch in live:
+                live.remove(launch)
+            if not live:
+                self.launches.pop(launch.key, None)
+            self._record(launch)
+        self._notify(launch)
+
+    def running(self, key=None):
+        """Live launches, of one shortcut or of all of them."""
+        with self._lock:
+            if key is not None:
+                return list(self.launches.get(key, []))
+            return [l for live in self.launches.values() for l in live]
+
+    def is_running(self, key):
+        with self._lock:
+            return bool(self.launches.get(key))
+
+    def stop(self, key, sig=signal.SIGTERM):
+        """Signal the process groups of every live launch of key."""
+        stopped = 0
+        for launch in self.running(key):
+            try:
+                os.killpg(launch.pgid, sig)
+                stopped += 1
+            except ProcessLookupError:
+                pass
+            except PermissionError as e:
+                print(f"Could not stop {launch.name}: {e}")
+        return stopped
+
+    # === history ===
+
+    def _history_file_stat(self):
+        try:
+            st = os.stat(self.history_file)
+        except OSError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _load_history(self):
+        """HISTORY_FILE, re-read whenever another process has replaced it."""
+        stat = self._history_file_stat()
+        if self._history is None or stat != self._history_stat:
+            try:
+                with open(self.history_file) as f:
+                    self._history = json.load(f)
+            except (OSError, ValueError):
+                self._history = {}
+            self._history_stat = stat
+        return self._history
+
+    def _record(self, launch):
+        try:
+            self.history_file.parent.mkdir(parents=True, exist_ok=True)
+            lock = open(self.history_file.with_suffix('.lock'), 'w')
+        except OSError as e:
+            print(f"Could not save launch history: {e}")
+            return
+        with lock:
+            # Held until the new file is in place: other processes merge after us
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self._merge_run(self._load_history(), launch)
+
+    def _merge_run(self, history, launch):
+        entry = history.setdefault(launch.key, {'name': launch.name, 'launches': 0, 'total_seconds': 0.0, 'runs': []})
+        entry['name'] = launch.name
+        entry['launches'] += 1
+        entry['total_seconds'] = round(entry['total_seconds'] + launch.duration, 3)
+        entry['runs'].append({
+            'start': round(launch.started, 3),
+            'duration': round(launch.duration, 3),
+            'exit': launch.returncode,
+        })
+        del entry['runs'][:-HISTORY_RUNS]
+        try:
+            tmp = self.history_file.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp, 'w') as f:
+                json.dump(history, f, indent=4)
+            os.replace(tmp, self.history_file)
+            self._history_stat = self._history_file_stat()
+        except OSError as e:
+            print(f"Could not save launch history: {e}")
+
+    def history(self, key=None):
+        """Persisted stats: {name, launches, total_seconds, runs[{start, duration, exit}]}."""
+        with self._lock:
+            history = self._load_history()
+            if key is not None:
+                return history.get(key)
+            return dict(history)
+
+    def last_run(self, key):
+        entry = self.history(key)
+        return entry['runs'][-1] if entry and entry['runs'] else None
+
+
+def get_supervisor():
+    """The process-wide Supervisor shared by shortcuts.run_shortcut and the frontends."""
+    global _supervisor
+    if _supervisor is None:
+        _supervisor = Supervisor()
+    return _supervisor
+
+
+def status_text(key):
+    """Short state for list labels: 'running', 'exit 1', or '' when never run / clean exit."""
+    sup = get_supervisor()
+    live = sup.running(key)
+    if live:
+        return 'running' if len(live) == 1 else f'running ×{len(live)}'
+    last = sup.last_run(key)
+    if last and last['exit'] not in (0, None):
+        return f"exit {last['exit']}"
+    return ''
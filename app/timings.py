@@ -0,0 +1,230 @@
+import os
+import csv
+import json
+import time
+import threading
+from pathlib import Path
+
+XDG_CACHE_HOME = Path(os.getenv('XDG_CACHE_HOME', Path.home() / '.cache'))
+CACHE_DIR = XDG_CACHE_HOME / 'shortcut_launcher'
+TIMINGS_FILE = CACHE_DIR / 'launch_timings.json'
+
+# Milestones after the click, in launch order
+STAGES = ('template_resolved', 'spawned', 'wine_seen')
+# Samples kept per shortcut and stage
+SAMPLES = 50
+# How long to look for the first wine process of a launch
+WINE_TIMEOUT = 60.0
+
+_lock = threading.Lock()
+_samples = None
+
+
+def _load():
+    global _samples
+    if _samples is None:
+        try:
+            with open(TIMINGS_FILE) as f:
+                _samples = json.load(f)
+        except (OSError, ValueError):
+            _samples = {}
+    return _samples
+
+
+def _save():
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = TIMINGS_FILE.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(_samples, f)
+        os.replace(tmp, TIMINGS_FILE)
+    except OSError as e:
+        print(f"Could not save launch timings: {e}")
+
+
+def record(key, marks, template=None):
+    """Add one launch {stage: ms after click} to the rolling samples of key."""
+    with _lock:
+        entry = _load().setdefault(key, {'template': None, 'stages': {}})
+        entry['template'] = template
+        per_stage = entry['stages']
+        for stage, ms in marks.items():
+            values = per_stage.setdefault(stage, [])
+            values.append(round(ms, 1))
+            del values[:-SAMPLES]
+        _save()
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def summary(key=None):
+    """{shortcut: {'template', 'stages': {stage: {'n', 'p50', 'p95'}}}} over the stored samples."""
+    with _lock:
+        data = _load()
+        keys = [key] if key is not None else sorted(data)
+        result = {}
+        for k in keys:
+            entry = data.get(k, {'template': None, 'stages': {}})
+            result[k] = {
+                'template': entry['template'],
+                'stages': {
+                    stage: {'n': len(values), 'p50': percentile(values, 50), 'p95': percentile(values, 95)}
+                    for stage, values in entry['stages'].items() if values
+                },
+            }
+        return result
+
+
+def export(path):
+    """Write the summary to path, as JSON for *.json and CSV otherwise."""
+    stats = summary()
+    if str(path).endswith('.json'):
+        with open(path, 'w') as f:
+            json.dump(stats, f, indent=4)
+        return
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['shortcut', 'template', 'stage', 'samples', 'p50_ms', 'p95_ms'])
+        for key, entry in stats.items():
+            for stage in STAGES:
+                if stage in entry['stages']:
+                    s = entry['stages'][stage]
+                    writer.writerow([key, entry['template'] or '', stage, s['n'], s['p50'], s['p95']])
+
+
+def _session_processes(sid):
+    """comm names of the processes in session sid."""
+    names = []
+    try:
+        pids = [p for p in os.listdir('/proc') if p.isdigit()]
+    except OSError:
+        return names
+    for pid in pids:
+        try:
+            with open(f'/proc/{pid}/stat', 'rb') as f:
+                stat = f.read().decode('utf-8', 'replace')
+        except OSError:
+            continue
+        # comm is in parentheses and may contain spaces
+        comm = stat[stat.find('(') + 1:stat.rfind(')')]
+        fields = stat[stat.rfind(')') + 2:].split()
+        if len(fields) > 3 and int(fields[3]) == sid:
+            names.append(comm)
+    return names
+
+
+def _is_wine(comm):
+    comm = comm.lower()
+    return comm.startswith('wine') or comm.endswith('.exe')
+
+
+class LaunchTimer:
+    """Monotonic marks of one launch, starting at the click.
+
+    mark() records a stage; watch() follows the launched session until its
+    first wine* (or *.exe) process shows up in /proc, then stores all marks
+    as milliseconds after the click.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.click = time.monotonic()
+        self.marks = {}
+        self.template = None
+
+    def mark(self, stage):
+        self.marks[stage] = (time.monotonic() - self.click) * 1000
+
+    def watch(self, launch):
+        threading.Thread(target=self._watch, args=(launch,), daemon=True).start()
+
+    def _watch(self, launch):
+        deadline = time.monotonic() + WINE_TIMEOUT
+        delay = 0.02
+        while launch.running and time.monotonic() < deadline:
+            if any(_is_wine(comm) for comm in _session_processes(launch.pgid)):
+                self.mark('wine_seen')
+                break
+            time.sleep(delay)
+            delay = min(delay * 1.5, 0.25)
+        record(self.key, self.marks, self.template)
+
+
+# === frontend startup ===
+
+STARTUP_FILE = CACHE_DIR / 'startup_timings.json'
+# Startup milestones of the native frontend, in order
+STARTUP_STAGES = ('connected', 'ui_built', 'shortcuts_painted', 'interactive', 'all_tabs')
+
+
+def process_age():
+    """Seconds since this process started, from /proc (0.0 if unknown).
+
+    Includes interpreter startup and imports, which a timer started from
+    Python would miss.
+    """
+    try:
+        with open('/proc/self/stat', 'rb') as f:
+            stat = f.read().decode('utf-8', 'replace')
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        start_ticks = int(stat[stat.rfind(')') + 2:].split()[19])
+        return max(0.0, uptime - start_ticks / os.sysconf('SC_CLK_TCK'))
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+class StartupTimer:
+    """Milestones of one frontend start, in ms since the process started.
+
+    finish() prints them and keeps the last SAMPLES starts per frontend in
+    STARTUP_FILE; startup_summary() reports percentiles over those.
+    """
+
+    def __init__(self, frontend):
+        self.frontend = frontend
+        self.start = time.monotonic() - process_age()
+        self.marks = {}
+
+    def mark(self, stage):
+        self.marks[stage] = (time.monotonic() - self.start) * 1000
+
+    def finish(self):
+        print(f"{self.frontend} startup: "
+              + ', '.join(f"{stage} {ms:.0f} ms" for stage, ms in self.marks.items()))
+        with _lock:
+            try:
+                with open(STARTUP_FILE) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            per_stage = data.setdefault(self.frontend, {})
+            for stage, ms in self.marks.items():
+                values = per_stage.setdefault(stage, [])
+                values.append(round(ms, 1))
+                del values[:-SAMPLES]
+            try:
+                CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                tmp = STARTUP_FILE.with_suffix('.tmp')
+                with open(tmp, 'w') as f:
+                    json.dump(data, f)
+                os.replace(tmp, STARTUP_FILE)
+            except OSError as e:
+                print(f"Could not save startup timings: {e}")
+
+
+def startup_summary(frontend):
+    """{stage: {'n', 'p50', 'p95'}} over the stored starts of a frontend."""
+    with _lock:
+        try:
+            with open(STARTUP_FILE) as f:
+                per_stage = json.load(f).get(frontend, {})
+        except (OSError, ValueError):
+            return {}
+    return {stage: {'n': len(v), 'p50': percentile(v, 50), 'p95': percentile(v, 95)}
+            for stage in STARTUP_STAGES for v in [per_stage.get(stage)] if v}
@@ -0,0 +1,227 @@
+import os
+import select
+import struct
+import threading
+import time
+import ctypes
+from collections import namedtuple
+
+# Event kinds
+ADDED = 'added'
+REMOVED = 'removed'
+MODIFIED = 'modified'
+
+# kind:   ADDED, REMOVED or MODIFIED
+# source: name of the watched source ('shortcuts', 'templates', 'prefixes')
+# name:   file name inside the source, or None if the whole source changed
+ChangeEvent = namedtuple('ChangeEvent', 'kind source name')
+
+# <sys/inotify.h>
+IN_MODIFY      = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM  = 0x00000040
+IN_MOVED_TO    = 0x00000080
+IN_CREATE      = 0x00000100
+IN_DELETE      = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF   = 0x00000800
+IN_Q_OVERFLOW  = 0x00004000
+IN_IGNORED     = 0x00008000
+IN_ISDIR       = 0x40000000
+IN_CLOEXEC     = 0o2000000
+IN_NONBLOCK    = 0o4000
+
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+              IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def default_sources(shortcuts_dir, templates_dir, prefixes_file):
+    """Sources watched by both frontends: (source, directory, name filter)."""
+    prefixes_file = str(prefixes_file)
+    prefixes_name = os.path.basename(prefixes_file)
+    return [
+        ('shortcuts', str(shortcuts_dir), lambda n: n.endswith('.desktop')),
+        ('templates', str(templates_dir), lambda n: not n.startswith('.')),
+        ('prefixes', os.path.dirname(prefixes_file), lambda n: n == prefixes_name),
+    ]
+
+
+def _merge(pending, source, name, kind):
+    """Coalesce events for the same file within one batch."""
+    key = (source, name)
+    old = pending.get(key)
+    if old == ADDED and kind == MODIFIED:
+        return
+    if old == ADDED and kind == REMOVED:
+        del pending[key]
+        return
+    if old == REMOVED and kind == ADDED:
+        kind = MODIFIED
+    pending.pop(key, None)
+    pending[key] = kind
+
+
+def _load_libc():
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+
+class Watcher:
+    """Watch shortcut, template and prefix files and report changes.
+
+    callback(events) is called from the watcher thread with a list of
+    ChangeEvent, coalesced over `debounce` seconds. inotify is used when
+    libc provides it; otherwise the directories are rescanned every
+    `interval` seconds.
+    """
+
+    def __init__(self, callback, sources, interval=2.0, debounce=0.2):
+        self.callback = callback
+        self.sources = sources
+        self.interval = interval
+        self.debounce = debounce
+        self.backend = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._wake_r, self._wake_w = os.pipe()
+
+    def start(self):
+        for _, directory, _ in self.sources:
+            os.makedirs(directory, exist_ok=True)
+        fd = self._inotify_setup()
+        if fd is not None:
+            self.backend = 'inotify'
+            target = lambda: self._run_inotify(fd)
+        else:
+            self.backend = 'poll'
+            target = self._run_poll
+        self._thread = threading.Thread(target=target, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        os.write(self._wake_w, b'x')
+
+    def _emit(self, pending):
+        if not pending:
+            return
+        events = [ChangeEvent(kind, source, name) for (source, name), kind in pending.items()]
+        try:
+            self.callback(events)
+        except Exception as e:
+            print(f"Watcher callback error: {e}")
+
+    # === inotify backend ===
+
+    def _inotify_setup(self):
+        libc = _load_libc()
+        if libc is None:
+            return None
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return None
+        self._wds = {}
+        for source, directory, name_filter in self.sources:
+            wd = libc.inotify_add_watch(fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                os.close(fd)
+                return None
+            self._wds.setdefault(wd, []).append((source, name_filter))
+        return fd
+
+    def _read_inotify(self, fd, pending):
+        try:
+            buf = os.read(fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(buf):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buf, offset)
+            offset += _EVENT_HEADER.size
+            name = buf[offset:offset + length].rstrip(b'\0').decode('utf-8', 'surrogateescape')
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                for source, _, _ in self.sources:
+                    _merge(pending, source, None, MODIFIED)
+                continue
+            if mask & IN_ISDIR:
+                continue
+            for source, name_filter in self._wds.get(wd, ()):
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                    _merge(pending, source, None, MODIFIED)
+                elif name and name_filter(name):
+                    if source == 'prefixes':
+                        kind = MODIFIED
+                    elif mask & (IN_CREATE | IN_MOVED_TO):
+                        kind = ADDED
+                    elif mask & (IN_DELETE | IN_MOVED_FROM):
+                        kind = REMOVED
+                    else:
+                        kind = MODIFIED
+                    _merge(pending, source, name, kind)
+
+    def _run_inotify(self, fd):
+        try:
+            while not self._stop.is_set():
+                # Sleep until something happens, then keep collecting for
+                # `debounce` seconds so one save produces one batch.
+                ready, _, _ = select.select([fd, self._wake_r], [], [])
+                pending = {}
+                deadline = time.monotonic() + self.debounce
+                while fd in ready and not self._stop.is_set():
+                    self._read_inotify(fd, pending)
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    ready, _, _ = select.select([fd, self._wake_r], [], [], timeout)
+                if not self._stop.is_set():
+                    self._emit(pending)
+        finally:
+            os.close(fd)
+
+    # === polling backend ===
+
+    def _snapshot(self):
+        snap = {}
+        for source, directory, name_filter in self.sources:
+            files = {}
+            try:
+                with os.scandir(directory) as it:
+                    for de in it:
+                        if not name_filter(de.name):
+                            continue
+                        try:
+                            st = de.stat()
+                        except OSError:
+                            continue
+                        files[de.name] = (st.st_ino, st.st_mtime_ns, st.st_size)
+            except OSError:
+                pass
+            snap[source] = files
+        return snap
+
+    def _run_poll(self):
+        old = self._snapshot()
+        while not self._stop.wait(self.interval):
+            new = self._snapshot()
+            pending = {}
+            for source, files in new.items():
+                before = old.get(source, {})
+                for name in before.keys() - files.keys():
+                    _merge(pending, source, name, MODIFIED if source == 'prefixes' else REMOVED)
+                for name, key in files.items():
+                    if name not in before:
+                        _merge(pending, source, name, MODIFIED if source == 'prefixes' else ADDED)
+                    elif before[name] != key:
+                        _merge(pending, source, name, MODIFIED)
+            old = new
+            self._emit(pending)
@@ -0,0 +1,244 @@
+import os
+import re
+import time
+import shutil
+import threading
+import subprocess
+
+from app import config
+from app import shortcuts
+from app import supervisor
+
+# Wine's own long-lived helpers; a prefix that only runs these is idle
+SYSTEM_PROCESSES = {
+    'services.exe', 'winedevice.exe', 'plugplay.exe', 'explorer.exe',
+    'rpcss.exe', 'svchost.exe', 'conhost.exe', 'wineboot.exe', 'start.exe',
+}
+DEFAULT_PREFIX = os.path.join(os.path.expanduser('~'), '.wine')
+
+_pool = None
+
+
+def normalize_prefix(prefix):
+    if not prefix:
+        return os.path.realpath(DEFAULT_PREFIX)
+    return os.path.realpath(os.path.expandvars(os.path.expanduser(prefix)))
+
+
+def _proc_info(pid):
+    """(argv, WINEPREFIX or None) of a process, or None if it is gone."""
+    try:
+        with open(f'/proc/{pid}/cmdline', 'rb') as f:
+            argv = [a.decode('utf-8', 'replace') for a in f.read().split(b'\0') if a]
+        with open(f'/proc/{pid}/environ', 'rb') as f:
+            environ = f.read().split(b'\0')
+    except OSError:
+        return None
+    prefix = None
+    for var in environ:
+        if var.startswith(b'WINEPREFIX='):
+            prefix = var[len('WINEPREFIX='):].decode('utf-8', 'replace')
+            break
+    return argv, prefix
+
+
+def scan():
+    """Look through /proc once: ({prefix: wineserver pid}, {prefix: user process count})."""
+    servers, users = _scan()
+    return servers, {prefix: len(pids) for prefix, pids in users.items()}
+
+
+def _scan():
+    """({prefix: wineserver pid}, {prefix: [user process pids]})."""
+    servers = {}
+    users = {}
+    try:
+        pids = [int(p) for p in os.listdir('/proc') if p.isdigit()]
+    except OSError:
+        return servers, users
+    for pid in pids:
+        info = _proc_info(pid)
+        if not info or not info[0]:
+            continue
+        argv, prefix = info
+        names = [os.path.basename(a.replace('\\', '/')).lower() for a in argv[:3]]
+        # argv[0] may be box64/box86 with the real binary after it
+        if any(n.startswith('wineserver') for n in names):
+            servers[normalize_prefix(prefix)] = pid
+        elif not any(n in SYSTEM_PROCESSES for n in names):
+            # Without WINEPREFIX only Wine itself uses a prefix (the default one)
+            if prefix is None and not any(n.startswith('wine') or n.endswith('.exe') for n in names):
+                continue
+            users.setdefault(normalize_prefix(prefix), []).append(pid)
+    return servers, users
+
+
+def _session(pid):
+    try:
+        return os.getsid(pid)
+    except OSError:
+        return None
+
+
+def template_prefix(template_path):
+    """WINEPREFIX exported by a launch template, or None."""
+    try:
+        with open(template_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                m = re.match(r'\s*export\s+WINEPREFIX=(["\']?)(.*?)\1\s*$', line)
+                if m:
+                    return normalize_prefix(m.group(2))
+    except OSError:
+        pass
+    return None
+
+
+def frequent_prefixes(limit, templates_dir=None):
+    """Prefixes ordered by how often their shortcuts were launched, most used first."""
+    templates_dir = templates_dir or str(shortcuts.DATA_DIR / 'templates')
+    history = supervisor.get_supervisor().history()
+    counts = {}
+    for entry in shortcuts.load_catalog():
+        launches = (history.get(entry['file']) or {}).get('launches', 0)
+        if not launches or not entry['template']:
+            continue
+        prefix = template_prefix(os.path.join(templates_dir, entry['template']))
+        if prefix:
+            counts[prefix] = counts.get(prefix, 0) + launches
+    return sorted(counts, key=counts.get, reverse=True)[:limit]
+
+
+class WineserverPool:
+    """Keep wineservers of prefixes warm and shut down the idle ones.
+
+    prewarm() starts a persistent `wineserver -p` so the next launch in
+    that prefix skips server startup. The monitor thread looks through
+    /proc every `interval` seconds and runs `wineserver -k` for servers
+    whose prefix had no Wine process besides Wine's own helpers for
+    `idle_timeout` seconds (0 disables shutdown).
+
+    Only managed prefixes are shut down: the ones this pool prewarmed and
+    the ones shortcuts launched through the supervisor ran Wine in. A
+    wineserver the user started in a terminal is left alone.
+    """
+
+    def __init__(self, wineserver=None, idle_timeout=None, interval=None):
+        settings = config.load_settings()
+        self.wineserver = wineserver or settings['wineserver']
+        self.idle_timeout = settings['wineserver_idle_timeout'] if idle_timeout is None else idle_timeout
+        self.interval = interval or max(5, min(60, self.idle_timeout / 4 or 60))
+        self.idle_since = {}
+        self.managed = set()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def available(self):
+        return shutil.which(self.wineserver) is not None
+
+    def _run(self, prefix, flag):
+        env = dict(os.environ, WINEPREFIX=normalize_prefix(prefix))
+        try:
+            return subprocess.run([self.wineserver, flag], env=env, timeout=30,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                  start_new_session=True).returncode == 0
+        except (OSError, subprocess.TimeoutExpired) as e:
+            print(f"wineserver {flag} failed for {prefix}: {e}")
+            return False
+
+    def servers(self):
+        return scan()[0]
+
+    def is_running(self, prefix):
+        return normalize_prefix(prefix) in self.servers()
+
+    def prewarm(self, prefix):
+        """Start a persistent wineserver for prefix unless one is already up."""
+        if self.is_running(prefix):
+            return True
+        if not self.available():
+            print(f"Cannot prewarm {prefix}: {self.wineserver} not found")
+            return False
+        self.idle_since.pop(normalize_prefix(prefix), None)
+        if not self._run(prefix, '-p'):
+            return False
+        self.managed.add(normalize_prefix(prefix))
+        return True
+
+    def track(self, launch):
+        """Supervisor listener: manage the prefix a launched shortcut runs Wine in."""
+        info = _proc_info(launch.pid) if launch.running else None
+        if info and info[1]:
+            self.managed.add(normalize_prefix(info[1]))
+
+    def stop(self, prefix):
+        """Shut down the wineserver of prefix (and its Wine processes)."""
+        self.idle_since.pop(normalize_prefix(prefix), None)
+        return self._run(prefix, '-k')
+
+    def check_idle(self, now=None):
+        """Stop managed servers idle for longer than idle_timeout. Returns the stopped prefixes."""
+        now = time.monotonic() if now is None else now
+        servers, users = _scan()
+        # Templates run through bash export WINEPREFIX after the launch: look at the sessions too
+        sessions = {launch.pgid for launch in supervisor.get_supervisor().running()}
+        for prefix, pids in users.items():
+            if prefix not in self.managed and any(_session(pid) in sessions for pid in pids):
+                self.managed.add(prefix)
+        stopped = []
+        for prefix in list(self.idle_since):
+            if prefix not in servers:
+                del self.idle_since[prefix]
+        for prefix in list(self.managed):
+            if prefix not in servers and prefix not in users:
+                self.managed.discard(prefix)
+        for prefix in servers:
+            if prefix not in self.managed:
+                continue
+            if users.get(prefix):
+                self.idle_since.pop(prefix, None)
+                continue
+            since = self.idle_since.setdefault(prefix, now)
+            if self.idle_timeout and now - since >= self.idle_timeout:
+                if self.stop(prefix):
+                    stopped.append(prefix)
+        return stopped
+
+    def autoprewarm(self, count=None):
+        """Prewarm the `count` most launched prefixes (setting wineserver_prewarm)."""
+        if count is None:
+            count = config.load_settings()['wineserver_prewarm']
+        if not count or not self.available():
+            return []
+        warmed = [p for p in frequent_prefixes(count) if os.path.isdir(p) and self.prewarm(p)]
+        return warmed
+
+    def start(self, autoprewarm=True):
+        """Prewarm in the background and start the idle monitor."""
+        supervisor.get_supervisor().add_listener(self.track)
+
+        def run():
+            if autoprewarm:
+                try:
+                    self.autoprewarm()
+                except Exception as e:
+                    print(f"Prewarm error: {e}")
+            while not self._stop.wait(self.interval):
+                try:
+                    self.check_idle()
+                except Exception as e:
+                    print(f"Wineserver monitor error: {e}")
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        return self
+
+    def shutdown(self):
+        self._stop.set()
+        supervisor.get_supervisor().remove_listener(self.track)
+
+
+def get_pool():
+    """The WineserverPool shared by the frontends."""
+    global _pool
+    if _pool is None:
+        _pool = WineserverPool()
+    return _pool
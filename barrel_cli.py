@@ -0,0 +1,7 @@
+#!/data/data/com.termux/files/usr/bin/env python3
+import sys
+
+from app import cli
+
+if __name__ == '__main__':
+    sys.exit(cli.main())
@@ -0,0 +1,84 @@
+# -*- mode: python ; coding: utf-8 -*-
+#
+# Fast-start build: `pyinstaller barrel_fast.spec` -> dist/barrel/
+#
+# One onedir folder with barrel-x11, barrel-native and barrel executables
+# sharing a single copy of Python, app/ and the libraries: with noarchive
+# every module is a plain .pyc file in the folder instead of a PYZ inside
+# each executable. Nothing is extracted or decompressed at launch (no
+# onefile, no UPX), bytecode is built with -OO, and stdlib packages and
+# Pillow plugins Barrel never uses are left out. Compare with the onefile
+# builds using benchmarks/cold_start.py.
+
+# Unused by Barrel or by requests/Pillow/ttkthemes
+EXCLUDES = [
+    'unittest', 'doctest', 'pydoc', 'pdb', 'test', 'lib2to3', 'idlelib',
+    'turtle', 'turtledemo', 'distutils', 'setuptools', 'pkg_resources',
+    'pip', 'ensurepip', 'venv', 'xmlrpc', 'sqlite3', 'curses', 'asyncio',
+    'PIL.ImageQt', 'PIL.ImageShow', 'numpy',
+]
+# Pillow image formats Barrel reads: icons and extracted .exe resources
+PIL_KEEP = {'PngImagePlugin', 'IcoImagePlugin', 'BmpImagePlugin', 'XpmImagePlugin',
+            'GifImagePlugin', 'JpegImagePlugin'}
+try:
+    import PIL
+    EXCLUDES += [f'PIL.{name}' for name in PIL._plugins if name not in PIL_KEEP]
+except ImportError:
+    pass
+
+# Imported lazily (app.lazy), invisible to the analysis
+HIDDEN = ['requests', 'tempfile', 'webbrowser', 'app.updater', 'app.installers', 'app.iconbatch']
+
+
+def analysis(script, excludes=()):
+    return Analysis(
+        [script],
+        pathex=[],
+        binaries=[],
+        datas=[],
+        hiddenimports=HIDDEN,
+        hookspath=[],
+        hooksconfig={},
+        runtime_hooks=[],
+        excludes=EXCLUDES + list(excludes),
+        noarchive=True,
+        optimize=2,
+    )
+
+
+def executable(a, name):
+    return EXE(
+        PYZ(a.pure),
+        a.scripts,
+        [],
+        exclude_binaries=True,
+        name=name,
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip=False,
+        upx=False,
+        console=True,
+        disable_windowed_traceback=False,
+        argv_emulation=False,
+        target_arch=None,
+        codesign_identity=None,
+        entitlements_file=None,
+    )
+
+
+a_x11 = analysis('barrel_x11.py', excludes=['termuxgui'])
+a_native = analysis('barrel_native.py', excludes=['tkinter', 'ttkthemes', 'PIL.ImageTk'])
+a_cli = analysis('barrel_cli.py', excludes=['tkinter', 'ttkthemes', 'termuxgui', 'PIL'])
+
+# COLLECT stores modules and libraries the three share only once
+coll = COLLECT(
+    executable(a_x11, 'barrel-x11'),
+    executable(a_native, 'barrel-native'),
+    executable(a_cli, 'barrel'),
+    a_x11.binaries + a_native.binaries + a_cli.binaries,
+    a_x11.zipfiles + a_native.zipfiles + a_cli.zipfiles,
+    a_x11.datas + a_native.datas + a_cli.datas,
+    strip=False,
+    upx=False,
+    name='barrel',
+)
@@ -8,20 +8,30 @@ import termuxgui as tg
 import time
 import threading
 import json
-import re
-import requests
 import glob
-import tempfile
-import tarfile
-import urllib.request
 
 # Local imports
 from app import __version__, __app_name__
 from app import config
 from app import shortcuts
 from app import templates
-from app import updater
-from app import installers
+from app import watcher
+from app import icons
+from app import peicon
+from app import supervisor
+from app import wineserver
+from app import timings
+from app import launchqueue
+from app import sched
+from app import shadercache
+from app import sampler
+from app.lazy import lazy_import
+
+# Only needed for downloads, updates and batch jobs: loaded on first use
+requests = lazy_import('requests')
+updater = lazy_import('app.updater')
+installers = lazy_import('app.installers')
+iconbatch = lazy_import('app.iconbatch')
 
 class FileExplorer:
     def __init__(self, conn, select_file=False, start_dir=None):
@@ -105,12 +115,25 @@ class FileExplorer:
         return None
 
 
+# Tab index -> name used by _refresh_content
+TAB_NAMES = ('shortcuts', 'prefixes', 'templates', 'help')
+# Seconds after the first paint before the other tabs are filled
+IDLE_LOAD_DELAY = 0.5
+# Pager position checks: right after a touch, and at most this far apart when idle
+SCROLL_POLL_MIN = 0.1
+SCROLL_POLL_MAX = 5.0
+
+
 class ShortcutManager:
     def __init__(self):
+        self.startup = timings.StartupTimer('native')
         with tg.Connection() as conn:
             self.conn = conn
+            self.startup.mark('connected')
             self.activity = tg.Activity(conn)
-            self.lock = threading.Lock()
+            # Held while an event (and any dialog it opens) is handled and while
+            # the UI worker updates widgets. Re-entrant: handlers refresh too.
+            self.lock = threading.RLock()
             self.current_tab = 0
             self.selected_index = -1
             self.selected_template = -1
@@ -121,11 +144,16 @@ class ShortcutManager:
             self.template_buttons = []
             self.prefixes = []
             self.prefix_buttons = []
+            self.rendered = {}
+            self.loaded_tabs = set()
+            self.run_label = 'Run'
+            self.icon_batch = None
             # Setup dirs
             self.home = os.getenv('HOME')
             xdg_data = os.getenv('XDG_DATA_HOME', os.path.join(self.home, '.local', 'share'))
             self.applications_dir = os.path.join(xdg_data, 'applications')
-            os.makedirs(self.applications_dir, exist_ok=True)
+            self.shortcuts_dir = os.path.join(self.applications_dir, 'shortcuts')
+            os.makedirs(self.shortcuts_dir, exist_ok=True)
 
             # XDG desktop (fallback ~/Desktop)
             self.desktop_dir = self._get_xdg_user_dir('DESKTOP') or os.path.join(self.home, 'Desktop')
@@ -139,14 +167,39 @@ class ShortcutManager:
                 with open(self.prefixes_file, 'w') as f:
                     json.dump([], f)
             self._setup_ui()
-            self._start_scroll_watcher()
+            self._start_tab_sync()
+            self._start_ui_worker()
+            self._start_change_watcher()
+            supervisor.get_supervisor().add_listener(self._on_launch_change)
+            launchqueue.get_queue().add_listener(self._on_launch_change)
+            sampler.get_sampler().add_listener(self._on_sample)
+            wineserver.get_pool().start()
+            threading.Thread(target=self._finish_startup, daemon=True).start()
+            self.startup.mark('interactive')
             self._event_loop()
 
     def _get_xdg_user_dir(self, dir_type):
-        try:
-            return subprocess.check_output(['xdg-user-dir', dir_type]).strip().decode('utf-8')
-        except (FileNotFoundError, subprocess.CalledProcessError):
-            return None
+        return config.xdg_user_dir(dir_type)
+
+    def _finish_startup(self):
+        """Once the window is up: check the catalog against the files and fill the other tabs."""
+        time.sleep(IDLE_LOAD_DELAY)
+        with self.lock:
+            try:
+                self._refresh_content({'shortcuts'} | self._pending_tabs())
+                self._update_buttons()
+            except Exception as e:
+                print(f"Refresh error: {e}")
+        self.startup.mark('all_tabs')
+        self.startup.finish()
+
+    def _pending_tabs(self):
+        return {'prefixes', 'templates'} - self.loaded_tabs
+
+    def _ensure_loaded(self, tab):
+        """Fill a tab that was not loaded yet (they are filled on first use or on idle)."""
+        if tab in ('prefixes', 'templates') and tab not in self.loaded_tabs:
+            self._refresh_content({tab})
 
     def _update_buttons(self):
         is_sc = (self.current_tab == 0)
@@ -160,39 +213,116 @@ class ShortcutManager:
         self.btn_add.setvisibility(
             tg.View.VISIBLE if (is_pf or is_tm) else tg.View.GONE
         )
-        # “Run” only on Shortcuts when one is selected
+        # “Run” only on Shortcuts when one is selected; “Stop” while it
+        # runs, “Cancel” while it waits in the launch queue
         self.btn_run.setvisibility(
             tg.View.VISIBLE if is_sc and has_sc else tg.View.GONE
         )
+        if is_sc and has_sc:
+            key = os.path.basename(self.shortcuts[self.selected_index][1])
+            if supervisor.get_supervisor().is_running(key):
+                label = 'Stop'
+            elif launchqueue.get_queue().position(key) is not None:
+                label = 'Cancel'
+            else:
+                label = 'Run'
+            if label != self.run_label:
+                self.btn_run.settext(label)
+                self.run_label = label
         # “Edit” & “Delete” when something’s selected in the active tab
         show_ed = (is_sc and has_sc) or (is_pf and has_pf) or (is_tm and has_tm)
         self.btn_edit  .setvisibility(tg.View.VISIBLE if show_ed else tg.View.GONE)
         self.btn_delete.setvisibility(tg.View.VISIBLE if show_ed else tg.View.GONE)
 
 
-    def _get_shortcuts(self):
-        items = []
-        apps_dir = os.path.join(os.getenv('XDG_DATA_HOME', os.path.join(self.home, '.local', 'share')), 'applications', 'shortcuts')
-        os.makedirs(apps_dir, exist_ok=True)
+    def _get_shortcuts(self, cached=False):
+        entries = shortcuts.cached_catalog(self.shortcuts_dir) if cached else None
+        if entries is None:
+            entries = shortcuts.load_catalog(self.shortcuts_dir)
+        return [(e['name'], e['path']) for e in entries]
 
-        for fname in sorted(os.listdir(apps_dir)):
-            if not fname.endswith('.desktop'):
-                continue
-            
-            path = os.path.join(apps_dir, fname)
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    lines = f.read().splitlines()
-            except Exception:
-                continue
+    @staticmethod
+    def _shortcut_label(name, path):
+        key = os.path.basename(path)
+        status = ', '.join(s for s in (launchqueue.status_text(key), sampler.live_text(key)) if s)
+        return f'{name}  ({status})' if status else name
 
-            # extract display name
-            display_name = next((l.lstrip().split("=",1)[1] for l in lines if l.lstrip().startswith("Name=")), None)
-            if not display_name:
-                display_name = os.path.splitext(fname)[0]
+    def _start_ui_worker(self):
+        """Apply refreshes requested from other threads (listeners, watcher).
 
-            items.append((display_name, path))
-        return items
+        Listeners only queue the work and return, so the supervisor, launch
+        queue and sampler threads never wait for the UI; the worker waits
+        for the lock, i.e. until an open dialog is closed.
+        """
+        self.ui_jobs = set()
+        self.ui_events = []
+        self.ui_calls = []
+        self.ui_jobs_lock = threading.Lock()
+        self.ui_wake = threading.Event()
+
+        def work():
+            while True:
+                self.ui_wake.wait()
+                self.ui_wake.clear()
+                with self.ui_jobs_lock:
+                    jobs, self.ui_jobs = self.ui_jobs, set()
+                    events, self.ui_events = self.ui_events, []
+                    calls, self.ui_calls = self.ui_calls, []
+                with self.lock:
+                    try:
+                        tabs = jobs & set(TAB_NAMES)
+                        if tabs:
+                            self._refresh_content(tabs)
+                        changed = self._apply_changes([ev for ev in events if ev.source not in tabs])
+                        if tabs or changed:
+                            self._update_buttons()
+                        elif 'relabel' in jobs:
+                            self._relabel_shortcuts()
+                        for call in calls:
+                            call()
+                    except Exception as e:
+                        print(f"Refresh error: {e}")
+        threading.Thread(target=work, daemon=True).start()
+
+    def _post_refresh(self, tabs):
+        """Have the UI worker reload tabs; 'relabel' only updates shortcut status text."""
+        with self.ui_jobs_lock:
+            self.ui_jobs |= set(tabs)
+        self.ui_wake.set()
+
+    def _post_call(self, call):
+        """Have the UI worker run call() with the lock held, after pending refreshes."""
+        with self.ui_jobs_lock:
+            self.ui_calls.append(call)
+        self.ui_wake.set()
+
+    def _on_launch_change(self, launch=None):
+        # Supervisor (start/exit) and launch queue changes, from their threads
+        self._post_refresh({'shortcuts'})
+
+    def _on_sample(self):
+        # Every sampler tick: new CPU/RSS text, the shortcut list is unchanged
+        self._post_refresh({'relabel'})
+
+    def _relabel_shortcuts(self):
+        """Update the status text of running shortcuts without reloading the catalog.
+
+        Only buttons of running launches and those still showing a status
+        are looked at; only those whose text changed are sent.
+        """
+        model = self.rendered.get('shortcuts')
+        if model is None:
+            return
+        running = set(sampler.get_sampler().sessions)
+        for name, path in self.shortcuts:
+            key = (path, 0)
+            old = model['labels'].get(key)
+            if old is None or (old == name and os.path.basename(path) not in running):
+                continue
+            label = self._shortcut_label(name, path)
+            if label != old:
+                model['buttons'][key].settext(label)
+                model['labels'][key] = label
 
     def _get_templates(self):
         items = []
@@ -232,17 +362,18 @@ class ShortcutManager:
         # Horizontal pager
         self.sv = tg.HorizontalScrollView(a, root, fillviewport=True, snapping=True, nobar=True)
 
-        # Compute page width before setwidth()
-        start = time.time()
-        found = False
-        while time.time() - start < 5:
+        # Compute page width before setwidth(); the view has no size until
+        # it is laid out, so poll with a growing sleep instead of spinning
+        self.page_width = 300
+        deadline = time.monotonic() + 5
+        delay = 0.01
+        while time.monotonic() < deadline:
             dims = self.sv.getdimensions()
             if dims and dims[0] > 0:
                 self.page_width = dims[0]
-                found = True
                 break
-        if not found:
-            self.page_width = 300
+            time.sleep(delay)
+            delay = min(delay * 2, 0.2)
 
         # Container for pages
         pages = tg.LinearLayout(a, self.sv, vertical=False)
@@ -262,60 +393,228 @@ class ShortcutManager:
         # 4) Help page (you can fill this with whatever help text you like)
         self.help_container = tg.LinearLayout(a, tg.NestedScrollView(a, pages), vertical=True)
         self.help_container.setwidth(self.page_width, True)
-
-        # Finally, load the initial data into the real tabs
-        self._refresh_content()
+        tg.TextView(a, 'Tools', self.help_container).setmargin(5)
+        self.btn_repair_icons = tg.Button(a, 'Repair missing icons', self.help_container)
+        self.btn_folder_icons = tg.Button(a, 'Extract icons from folder', self.help_container)
+        self.btn_timings = tg.Button(a, 'Launch timings', self.help_container)
+        self.btn_shaders = tg.Button(a, 'Shader caches', self.help_container)
+        self.btn_usage = tg.Button(a, 'Resource usage', self.help_container)
+
+        self.startup.mark('ui_built')
+
+        # Paint the Shortcuts tab from the cached catalog; the files are
+        # checked and the other tabs filled after the event loop started
+        self._refresh_content({'shortcuts'}, cached=True)
         self._update_buttons()
+        self.startup.mark('shortcuts_painted')
 
-    def _refresh_content(self):
-        self.shortcuts = self._get_shortcuts()
-        self.short_buttons = []
-        self.sc_container.clearchildren()
-        for name,_ in self.shortcuts:
-            btn = tg.Button(self.activity,name,self.sc_container)
-            btn.sendclickevent(True)
-            self.short_buttons.append(btn)
-        self.selected_index = -1
-
-        self.templates = self._get_templates()
-        self.template_buttons = []
-        self.tm_container.clearchildren()
-        for name,_ in self.templates:
-            btn = tg.Button(self.activity,name,self.tm_container)
-            btn.sendclickevent(True)
-            self.template_buttons.append(btn)
-        add_tmp = tg.Button(self.activity,'+ Template',self.tm_container)
-        self.template_buttons.append(add_tmp)
-        
-        add_sc = tg.Button(self.activity, '+ Shortcut', self.sc_container)
-        add_sc.sendclickevent(True)
-        self.short_buttons.append(add_sc)
-
-        self.prefixes = self._load_prefixes()
-        self.prefix_buttons = []
-        self.pf_container.clearchildren()
-        for pre in self.prefixes:
-            btn = tg.Button(self.activity,pre,self.pf_container)
+    def _refresh_content(self, tabs=None, cached=False):
+        """Reload the given tabs ('shortcuts', 'prefixes', 'templates'), or all of them.
+
+        Only widgets whose item was added, removed or renamed are touched;
+        every widget change is an IPC round-trip to Termux:GUI. With cached,
+        shortcuts come from the catalog file without reading .desktop files.
+        """
+        self.loaded_tabs |= set(TAB_NAMES[:3]) if tabs is None else set(tabs)
+        if tabs is None or 'shortcuts' in tabs:
+            self._show_shortcuts(self._get_shortcuts(cached))
+
+        if tabs is None or 'templates' in tabs:
+            self._show_templates(self._get_templates())
+
+        if tabs is None or 'prefixes' in tabs:
+            selected = self._selected_key(self.prefixes, self.selected_prefix)
+            self.prefixes = self._load_prefixes()
+            live = wineserver.scan()[0]
+            items = [(pre, f'{pre}  (wineserver)' if wineserver.normalize_prefix(pre) in live else pre)
+                     for pre in self.prefixes]
+            self.prefix_buttons = self._sync_buttons('prefixes', self.pf_container, items, '+ Prefix')
+            self.selected_prefix = self._reselect(self.prefixes, selected)
+
+    def _show_shortcuts(self, items, keep_labels=()):
+        """Show [(name, path)] in the Shortcuts tab, keeping the selection.
+
+        Buttons of the paths in keep_labels keep their current text.
+        """
+        selected = self._selected_key(self.shortcuts, self.selected_index)
+        self.shortcuts = items
+        shown = self.rendered.get('shortcuts', {}).get('labels', {})
+        labels = [(path, shown[path, 0] if path in keep_labels and (path, 0) in shown
+                   else self._shortcut_label(name, path)) for name, path in items]
+        self.short_buttons = self._sync_buttons('shortcuts', self.sc_container, labels, '+ Shortcut')
+        self.selected_index = self._reselect(items, selected)
+
+    def _show_templates(self, items):
+        """Show [(name, path)] in the Templates tab, keeping the selection."""
+        selected = self._selected_key(self.templates, self.selected_template)
+        self.templates = items
+        labels = [(path, name) for name, path in items]
+        self.template_buttons = self._sync_buttons('templates', self.tm_container, labels, '+ Template')
+        self.selected_template = self._reselect(items, selected)
+
+    def _apply_changes(self, events):
+        """Apply watcher events to the loaded tabs; returns True if anything changed.
+
+        Only the files named by the events are looked at: a shortcut is
+        re-read, dropped or added and its one button relabelled, deleted or
+        inserted. An event for a file already shown as it is on disk, such
+        as the echo of this window's own create, edit or delete, changes
+        nothing.
+        """
+        names = {}
+        for ev in events:
+            if ev.source in self.loaded_tabs:
+                names.setdefault(ev.source, set()).add(ev.name)
+        changed = False
+        for source, files in names.items():
+            if None in files:
+                # The whole directory changed (moved, or the event queue overflowed)
+                self._refresh_content({source})
+                changed = True
+            elif source == 'shortcuts':
+                current = {os.path.basename(path): (name, path) for name, path in self.shortcuts}
+                for fname, entry in shortcuts.update_catalog(files, self.shortcuts_dir).items():
+                    if entry is None:
+                        current.pop(fname, None)
+                    else:
+                        current[fname] = (entry['name'], entry['path'])
+                items = [current[fname] for fname in sorted(current)]
+                if items != self.shortcuts:
+                    unchanged = {path for fname, (_, path) in current.items() if fname not in files}
+                    self._show_shortcuts(items, unchanged)
+                    changed = True
+            elif source == 'templates':
+                current = dict(self.templates)
+                for fname in files:
+                    path = os.path.join(self.templates_dir, fname)
+                    if os.path.isfile(path):
+                        current[fname] = path
+                    else:
+                        current.pop(fname, None)
+                items = sorted(current.items())
+                if items != self.templates:
+                    self._show_templates(items)
+                    changed = True
+            elif source == 'prefixes' and self._load_prefixes() != self.prefixes:
+                self._refresh_content({'prefixes'})
+                changed = True
+        return changed
+
+    @staticmethod
+    def _selected_key(items, index):
+        return items[index] if 0 <= index < len(items) else None
+
+    @staticmethod
+    def _reselect(items, key):
+        return items.index(key) if key is not None and key in items else -1
+
+    def _sync_buttons(self, tab, container, items, add_label):
+        """Bring the buttons of one tab in line with items [(key, label)].
+
+        Returns the buttons in item order followed by the "+ ..." button.
+        Termux:GUI can only append children, so buttons are slots: a removed
+        item deletes its own button, the remaining buttons take the items in
+        order (an insertion shifts the labels after it, and only buttons
+        whose text changed are sent) and extra items are appended.
+        """
+        model = self.rendered.setdefault(tab, {'keys': [], 'slots': [], 'buttons': {}, 'labels': {}, 'add': None})
+        # Disambiguate duplicates (e.g. the same prefix listed twice)
+        seen = {}
+        keyed = []
+        for key, label in items:
+            n = seen.get(key, 0)
+            seen[key] = n + 1
+            keyed.append(((key, n), label))
+        new_keys = [k for k, _ in keyed]
+        labels = dict(keyed)
+        old_labels = model['labels']
+
+        # 1) drop the buttons of removed items
+        kept = []
+        for key, btn in zip(model['keys'], model['slots']):
+            if key in labels:
+                kept.append((key, btn))
+            else:
+                btn.delete()
+
+        # 2) reuse the remaining buttons in order, relabelling where the text differs
+        slots = []
+        for (old_key, btn), key in zip(kept, new_keys):
+            if old_labels[old_key] != labels[key]:
+                btn.settext(labels[key])
+            slots.append(btn)
+
+        # 3) append buttons for the rest, moving the "+ ..." button behind them
+        appended = new_keys[len(slots):]
+        if appended and model['add'] is not None:
+            model['add'].delete()
+            model['add'] = None
+        for key in appended:
+            btn = tg.Button(self.activity, labels[key], container)
             btn.sendclickevent(True)
-            self.prefix_buttons.append(btn)
-        add_pf = tg.Button(self.activity,'+ Prefix',self.pf_container)
-        self.prefix_buttons.append(add_pf)
+            slots.append(btn)
+        if model['add'] is None:
+            model['add'] = tg.Button(self.activity, add_label, container)
+            if tab == 'shortcuts':
+                model['add'].sendclickevent(True)
+
+        model['keys'] = new_keys
+        model['slots'] = slots
+        model['buttons'] = dict(zip(new_keys, slots))
+        model['labels'] = labels
+        return slots + [model['add']]
+
+    def _start_change_watcher(self):
+        """Pick up changes made outside this window (other frontend, main.sh)."""
+        sources = watcher.default_sources(self.shortcuts_dir, self.templates_dir, config.PREFIXES_FILE)
+        self.watcher = watcher.Watcher(self._on_external_change, sources).start()
+
+    def _on_external_change(self, events):
+        # From the watcher thread; tabs not filled yet pick the change up when they are
+        with self.ui_jobs_lock:
+            self.ui_events.extend(events)
+        self.ui_wake.set()
+
+    def _start_tab_sync(self):
+        """Keep the selected tab in line with the pager after a swipe.
+
+        Touch events on the pager wake the poller, which then checks the
+        scroll position every SCROLL_POLL_MIN seconds while the pager
+        settles and backs off to SCROLL_POLL_MAX once it stops moving. While
+        the window is in the background it does not poll at all.
+        """
+        self.paused = False
+        self.scroll_wake = threading.Event()
+        self.scroll_polls = 0
+        self.sv.sendtouchevent(True)
 
-    def _start_scroll_watcher(self):
         def watch():
+            delay = SCROLL_POLL_MIN
             while True:
+                woke = self.scroll_wake.wait(None if self.paused else delay)
+                self.scroll_wake.clear()
+                if self.paused:
+                    continue
                 with self.lock:
-                    try:
-                        pos = self.sv.getscrollposition()[0]
-                        tab = round(pos/self.page_width)
-                        if tab!=self.current_tab:
-                            self.current_tab=tab
-                            self.tabs.selecttab(tab)
-                            self._update_buttons()
-                    except:
-                        pass
-                time.sleep(0.1)
-        threading.Thread(target=watch,daemon=True).start()
+                    moved = self._sync_tab_from_scroll()
+                delay = SCROLL_POLL_MIN if woke or moved else min(delay * 2, SCROLL_POLL_MAX)
+        threading.Thread(target=watch, daemon=True).start()
+
+    def _sync_tab_from_scroll(self):
+        """Select the tab the pager shows; True if it changed."""
+        self.scroll_polls += 1
+        try:
+            pos = self.sv.getscrollposition()[0]
+        except Exception:
+            return False
+        tab = round(pos / self.page_width)
+        if tab == self.current_tab:
+            return False
+        self.current_tab = tab
+        self.tabs.selecttab(tab)
+        self._ensure_loaded(TAB_NAMES[tab])
+        self._update_buttons()
+        return True
 
     def _prompt_name(self, text):
         dlg = tg.Activity(self.conn, dialog=True)
@@ -341,6 +640,7 @@ class ShortcutManager:
         root = tg.LinearLayout(dlg)
         tg.TextView(dlg, 'Choose template (or none):', root).setmargin(5)
         spinner = tg.Spinner(dlg, root)
+        self._ensure_loaded('templates')
         choices = ['(no template)'] + [t[0] for t in self.templates]
         spinner.setlist(choices)
         btns = tg.LinearLayout(dlg, root, False)
@@ -387,7 +687,7 @@ class ShortcutManager:
             for chunk in r.iter_content(16*1024):
                 f.write(chunk)
         os.chmod(dst, 0o755)
-        self._refresh_content()
+        self._refresh_content({'templates'})
         
     def show_available_templates(self):
         dlg = tg.Activity(self.conn, dialog=True)
@@ -538,6 +838,7 @@ class ShortcutManager:
                 lines.append(f'export VK_ICD_FILENAMES={selected_vk}')
             if selected_emu != 'none': 
                 lines.append(f'export HODLL={selected_emu}')
+            lines.extend(shadercache.template_exports())
                 
             lines.extend(['', '# === Change to executable directory ==='])
             lines.append('cd "$(dirname "$1")"')
@@ -631,6 +932,7 @@ class ShortcutManager:
             lines.append(f'export VK_ICD_FILENAMES={selected_vk}')
         if selected_emu != 'none': 
             lines.append(f'export HODLL={selected_emu}')
+        lines.extend(shadercache.template_exports())
             
         lines.extend(['', '# Change to executable directory'])
         lines.append('cd "$(dirname "$1")"')
@@ -652,7 +954,7 @@ class ShortcutManager:
             with open(tpl_path, 'w') as f:
                 f.write(content)
             os.chmod(tpl_path, 0o755)
-            self._refresh_content()
+            self._refresh_content({'templates'})
             tg.Toast(self.conn, f"Template created: {tpl_name}").show()
         except Exception as e:
             tg.Toast(self.conn, f"Error creating template: {e}").show()
@@ -668,9 +970,12 @@ class ShortcutManager:
         
     def _extract_exe_icon(self, exe_path, output_path):
         """
-        Use wrestool (and optionally ImageMagick's convert) to pull
-        the first icon resource (type 14) from a Windows .exe into a PNG.
+        Read the first icon group (type 14) of a Windows .exe into a PNG
+        in-process; fall back to wrestool (and optionally ImageMagick's
+        convert) when the PE reader cannot handle the file.
         """
+        if peicon.extract_icon(exe_path, output_path, 48):
+            return True
         try:
             # wrestool -x -t 14 -o <output> <exe>
             subprocess.run(
@@ -759,7 +1064,7 @@ class ShortcutManager:
                     # 5) save it and refresh
                     self.prefixes.append(prefix_path)
                     self._save_prefixes(self.prefixes)
-                    self._refresh_content()
+                    self._refresh_content({'prefixes'})
                     return
 
                 elif vid == btn_cancel:
@@ -776,6 +1081,18 @@ class ShortcutManager:
         scroll = tg.NestedScrollView(dlg, root)
         container = tg.LinearLayout(dlg, scroll, vertical=True)
 
+        # Wineserver state
+        pool = wineserver.get_pool()
+        server_status = tg.TextView(dlg, '', container)
+        server_status.setmargin(5)
+        def show_server_status():
+            running = pool.is_running(prefix_path)
+            server_status.settext(f"Wineserver: {'running' if running else 'stopped'}")
+        show_server_status()
+        server_btns = tg.LinearLayout(dlg, container, vertical=False)
+        btn_prewarm = tg.Button(dlg, "Prewarm", server_btns)
+        btn_stop_server = tg.Button(dlg, "Stop", server_btns)
+
         # Buttons for actions
         btn_winetricks = tg.Button(dlg, "Run Winetricks", container)
         btn_dxvk = tg.Button(dlg, "Install DXVK GPLAsync", container)
@@ -798,7 +1115,13 @@ class ShortcutManager:
         for ev in self.conn.events():
             if ev.type == tg.Event.click:
                 vid = ev.value['id']
-                if vid == btn_winetricks:
+                if vid in (btn_prewarm, btn_stop_server):
+                    ok = pool.prewarm(prefix_path) if vid == btn_prewarm else pool.stop(prefix_path)
+                    if not ok:
+                        tg.Toast(self.conn, "wineserver command failed").show()
+                    show_server_status()
+                    self._refresh_content({'prefixes'})
+                elif vid == btn_winetricks:
                     try:
                         subprocess.run(['winetricks'], env={'WINEPREFIX': prefix_path}, check=True)
                     except Exception as e:
@@ -859,6 +1182,164 @@ class ShortcutManager:
                     dlg.finish()
                     break
                     
+    def _run_icon_batch(self, jobs):
+        """Extract icons for jobs from app.iconbatch on a thread, with a progress dialog.
+
+        Progress and the result reach the dialog through the UI worker, so
+        events are handled while the batch runs; only the latest progress
+        is drawn.
+        """
+        if not jobs:
+            self._show_message("Icons", "No icons to extract.")
+            return
+        if self.icon_batch is not None and self.icon_batch.is_alive():
+            tg.Toast(self.conn, "Icons are already being extracted").show()
+            return
+        dlg = tg.Activity(self.conn, dialog=True)
+        root = tg.LinearLayout(dlg)
+        status = tg.TextView(dlg, f"0 / {len(jobs)}", root)
+        status.setmargin(5)
+        bar = tg.ProgressBar(dlg, root)
+        latest = []
+        latest_lock = threading.Lock()
+
+        def progress(done, total, exe):
+            # Called from the batch thread
+            with latest_lock:
+                post = not latest
+                latest[:] = [(done, total, exe)]
+            if post:
+                self._post_call(show_progress)
+
+        def show_progress():
+            with latest_lock:
+                if not latest:
+                    return
+                (done, total, exe), = latest
+                latest.clear()
+            bar.setprogress(done * 100 // total)
+            status.settext(f"{done} / {total}  {os.path.basename(exe)}")
+
+        def finish(ok, failed):
+            with latest_lock:
+                latest.clear()
+            dlg.finish()
+            tg.Toast(self.conn, f"Extracted {len(ok)} icon(s), {len(failed)} failed.").show()
+
+        def work():
+            ok = failed = ()
+            try:
+                ok, failed = iconbatch.run_batch(jobs, progress)
+            finally:
+                self._post_refresh({'shortcuts'})
+                self._post_call(lambda: finish(ok, failed))
+
+        self.icon_batch = threading.Thread(target=work, daemon=True)
+        self.icon_batch.start()
+
+    def _show_timings(self):
+        """Launch latency percentiles per shortcut, with CSV export."""
+        dlg = tg.Activity(self.conn, dialog=True)
+        root = tg.LinearLayout(dlg)
+        tv = tg.TextView(dlg, "Launch timings (ms after click, p50 / p95)", root)
+        tv.settextsize(18)
+        tv.setmargin(5)
+        container = tg.LinearLayout(dlg, tg.NestedScrollView(dlg, root), vertical=True)
+        startup = timings.startup_summary('native')
+        if startup:
+            lines = ["Startup (ms after process start, p50 / p95)"]
+            lines += [f"  {stage}: {s['p50']:.0f} / {s['p95']:.0f}  (n={s['n']})" for stage, s in startup.items()]
+            tg.TextView(dlg, '\n'.join(lines), container).setmargin(5)
+        stats = timings.summary()
+        if not stats:
+            tg.TextView(dlg, "No launches recorded yet.", container).setmargin(5)
+        for key, entry in stats.items():
+            lines = [key + (f"  [{entry['template']}]" if entry['template'] else '')]
+            for stage in timings.STAGES:
+                s = entry['stages'].get(stage)
+                if s:
+                    lines.append(f"  {stage}: {s['p50']:.0f} / {s['p95']:.0f}  (n={s['n']})")
+            tg.TextView(dlg, '\n'.join(lines), container).setmargin(5)
+        btns = tg.LinearLayout(dlg, root, vertical=False)
+        btn_export = tg.Button(dlg, "Export CSV", btns)
+        btn_close = tg.Button(dlg, "Close", btns)
+        for ev in self.conn.events():
+            if ev.type == tg.Event.click:
+                if ev.value['id'] == btn_export:
+                    out = os.path.join(self.home, 'launch_timings.csv')
+                    try:
+                        timings.export(out)
+                        tg.Toast(self.conn, f"Saved {out}").show()
+                    except OSError as e:
+                        tg.Toast(self.conn, f"Export failed: {e}").show()
+                elif ev.value['id'] == btn_close:
+                    dlg.finish()
+                    break
+
+    def _show_shader_caches(self):
+        """Per-shortcut shader cache sizes; trim to the budget."""
+        dlg = tg.Activity(self.conn, dialog=True)
+        root = tg.LinearLayout(dlg)
+        budget = config.load_settings()['shader_cache_bytes']
+        tv = tg.TextView(dlg, "Shader caches", root)
+        tv.settextsize(18)
+        tv.setmargin(5)
+        summary = tg.TextView(dlg, "", root)
+        summary.setmargin(5)
+        listing = tg.TextView(dlg, "", tg.NestedScrollView(dlg, root))
+        listing.setmargin(5)
+
+        def refresh():
+            entries = shadercache.caches()
+            total = sum(size for _, _, size, _ in entries)
+            limit = shadercache.format_size(budget) if budget else "no limit"
+            summary.settext(f"{shadercache.format_size(total)} used, budget {limit}")
+            listing.settext('\n'.join(
+                f"{name}: {shadercache.format_size(size)}, {shadercache.describe(last)}"
+                for name, _, size, last in entries) or "No shader caches yet.")
+
+        refresh()
+        btns = tg.LinearLayout(dlg, root, vertical=False)
+        btn_trim = tg.Button(dlg, "Trim to budget", btns)
+        btn_close = tg.Button(dlg, "Close", btns)
+        for ev in self.conn.events():
+            if ev.type == tg.Event.click:
+                if ev.value['id'] == btn_trim:
+                    evicted = shadercache.evict(budget)
+                    refresh()
+                    tg.Toast(self.conn, f"Deleted {len(evicted)} cache(s)").show()
+                elif ev.value['id'] == btn_close:
+                    dlg.finish()
+                    break
+
+    def _show_usage(self):
+        """CPU and memory of running and recent launches."""
+        dlg = tg.Activity(self.conn, dialog=True)
+        root = tg.LinearLayout(dlg)
+        tv = tg.TextView(dlg, "Resource usage", root)
+        tv.settextsize(18)
+        tv.setmargin(5)
+        listing = tg.TextView(dlg, "", tg.NestedScrollView(dlg, root))
+        listing.setmargin(5)
+
+        def refresh():
+            lines = []
+            for summary in sampler.get_sampler().summaries():
+                lines.extend(sampler.summary_lines(summary) + [''])
+            listing.settext('\n'.join(lines) or "No launches sampled yet.")
+
+        refresh()
+        btns = tg.LinearLayout(dlg, root, vertical=False)
+        btn_refresh = tg.Button(dlg, "Refresh", btns)
+        btn_close = tg.Button(dlg, "Close", btns)
+        for ev in self.conn.events():
+            if ev.type == tg.Event.click:
+                if ev.value['id'] == btn_refresh:
+                    refresh()
+                elif ev.value['id'] == btn_close:
+                    dlg.finish()
+                    break
+
     def _show_message(self, title, message):
         dlg = tg.Activity(self.conn, dialog=True)
         root = tg.LinearLayout(dlg)
@@ -879,28 +1360,15 @@ class ShortcutManager:
     def _show_edit_shortcut_dialog(self, name, path):
         """Edit an existing .desktop shortcut."""
         #     parse existing .desktop file     
-        with open(path, 'r') as f:
-            content = f.read()
-        # Name
-        m = re.search(r'^Name=(.*)$', content, re.MULTILINE)
-        name_val = m.group(1) if m else name.replace('.desktop', '')
-        # Exec
-        m = re.search(r'^Exec=(.*)$', content, re.MULTILINE)
-        exec_val = m.group(1) if m else ''
-        # Icon
-        m = re.search(r'^Icon=(.*)$', content, re.MULTILINE)
-        icon_val = m.group(1) if m else ''
-        # Terminal
-        m = re.search(r'^Terminal=(.*)$', content, re.MULTILINE)
-        term_val = (m.group(1).lower() == 'true') if m else False
-        
+        entry = shortcuts.read_desktop_entry(path)
+        name_val = entry.name or name.replace('.desktop', '')
+        exec_val = entry.exec or ''
+        icon_val = entry.icon or ''
+        term_val = bool(entry.terminal)
+
         # Template detection and executable extraction
-        tpl_name = '(no template)'
-        executable_path = exec_val
-        m = re.match(r'bash\s+"([^"]+)"\s+"([^"]+)"', exec_val)
-        if m:
-            tpl_name = os.path.basename(m.group(1))
-            executable_path = m.group(2)
+        tpl_name, executable_path = shortcuts.parse_exec_template(exec_val)
+        tpl_name = tpl_name or '(no template)'
 
         #     build dialog UI     
         dlg = tg.Activity(self.conn, dialog=True)
@@ -908,12 +1376,23 @@ class ShortcutManager:
         scroll = tg.NestedScrollView(dlg, root)
         container = tg.LinearLayout(dlg, scroll, vertical=True)
 
+        # Icon preview, from the thumbnail cache
+        icon_src = icons.resolve_icon(icon_val)
+        icon_file = icons.thumbnail(icon_src, 48) or icon_src
+        if icon_file and icon_file.lower().endswith('.png'):
+            try:
+                with open(icon_file, 'rb') as f:
+                    tg.ImageView(dlg, container).setimage(f.read())
+            except OSError:
+                pass
+
         # Name field
         tg.TextView(dlg, "Name:", container).setmargin(5)
         name_edit = tg.EditText(dlg, name_val, container)
 
         # Template spinner
         tg.TextView(dlg, "Template:", container).setmargin(5)
+        self._ensure_loaded('templates')
         templates = ['(no template)'] + [t[0] for t in self.templates]
         if tpl_name in templates and tpl_name != '(no template)':
             templates.remove(tpl_name)
@@ -933,6 +1412,15 @@ class ShortcutManager:
             rb_no.setchecked(True)
         selected_term = term_val
 
+        # Scheduling, applied by the launcher when the shortcut starts
+        tg.TextView(dlg, "CPUs (e.g. 4-7, auto):", container).setmargin(5)
+        cpus_edit = tg.EditText(dlg, entry.extra.get(sched.CPUS_KEY, ''), container)
+        btn_fastest = tg.Button(dlg, "Fastest cores", container)
+        tg.TextView(dlg, "Nice (-20..19):", container).setmargin(5)
+        nice_edit = tg.EditText(dlg, entry.extra.get(sched.NICE_KEY, ''), container)
+        tg.TextView(dlg, "I/O priority (be/4, idle):", container).setmargin(5)
+        ioprio_edit = tg.EditText(dlg, entry.extra.get(sched.IOPRIO_KEY, ''), container)
+
         # Buttons row
         btns = tg.LinearLayout(dlg, container, vertical=False)
         btn_save   = tg.Button(dlg, "Save",   btns)
@@ -948,7 +1436,18 @@ class ShortcutManager:
 
             elif ev.type == tg.Event.click:
                 vid = ev.value['id']
-                if vid == btn_save:
+                if vid == btn_fastest:
+                    fastest = sched.fastest_cluster()
+                    if fastest:
+                        cpus_edit.settext(sched.format_cpus(fastest))
+                    else:
+                        tg.Toast(self.conn, "All cores are alike; no faster cluster found").show()
+                elif vid == btn_save:
+                    try:
+                        sched_values = sched.validate(cpus_edit.gettext(), nice_edit.gettext(), ioprio_edit.gettext())
+                    except ValueError as e:
+                        tg.Toast(self.conn, f"Invalid scheduling settings: {e}").show()
+                        continue
                     new_name = name_edit.gettext().strip() or name_val
                     term_flag = 'true' if selected_term else 'false'
                     
@@ -966,6 +1465,12 @@ class ShortcutManager:
                         f"Terminal={term_flag}",
                         "Type=Application"
                     ]
+                    if entry.comment:
+                        lines.append(f"Comment={entry.comment}")
+                    # Keep X-* and other keys this dialog does not edit
+                    extra = {k: v for k, v in entry.extra.items() if k not in sched.KEYS}
+                    extra.update((k, v) for k, v in sched_values.items() if v)
+                    lines.extend(f"{k}={v}" for k, v in extra.items())
                     
                     content_to_write = "\n".join(lines) + "\n"
 
@@ -992,7 +1497,7 @@ class ShortcutManager:
                             f.write(content_to_write)
 
                     dlg.finish()
-                    self._refresh_content()
+                    self._refresh_content({'shortcuts'})
                     break
 
                 elif vid == btn_cancel:
@@ -1002,151 +1507,213 @@ class ShortcutManager:
 
     def _event_loop(self):
         for ev in self.conn.events():
-            if ev.type == tg.Event.destroy:
-                sys.exit()
-
-            # Tab switch
-            if ev.type == tg.Event.itemselected and ev.value['id'] == self.tabs:
-                self.current_tab = ev.value['selected']
-                self.sv.setscrollposition(self.current_tab * self.page_width, 0, True)
-                self.selected_index    = -1
-                self.selected_prefix   = -1
-                self.selected_template = -1
-                self._update_buttons()
-                continue
+            with self.lock:
+                self._handle_event(ev)
+
+    def _handle_event(self, ev):
+        if ev.type == tg.Event.destroy:
+            sys.exit()
+
+        # Pager sync: stop polling in the background, poll fast after a touch.
+        # Dialogs run their own event loops and may swallow resume, so any
+        # event of the main window also counts as resumed.
+        if isinstance(ev.value, dict) and ev.value.get('aid') == self.activity.aid:
+            if ev.type in (tg.Event.pause, tg.Event.stop):
+                self.paused = True
+                return
+            if self.paused:
+                self.paused = False
+                self.scroll_wake.set()
+        if ev.type == tg.Event.touch:
+            if ev.value['id'] == self.sv:
+                self.scroll_wake.set()
+            return
 
-            if ev.type != tg.Event.click:
-                continue
-            vid = ev.value['id']
-
-            # === Prefixes & Templates: toolbar “Add” ===
-            if vid == self.btn_add:
-                if self.current_tab == 1:
-                    self._show_create_prefix_dialog()
-                elif self.current_tab == 2:
-                    action = self._prompt_add_template_action()
-                    if action == 'Create local template':
-                        self._show_create_template_dialog()
-                    else:
-                        self.show_available_templates()
-                continue
+        # Tab switch
+        if ev.type == tg.Event.itemselected and ev.value['id'] == self.tabs:
+            self.current_tab = ev.value['selected']
+            self.sv.setscrollposition(self.current_tab * self.page_width, 0, True)
+            self._ensure_loaded(TAB_NAMES[self.current_tab])
+            self.selected_index    = -1
+            self.selected_prefix   = -1
+            self.selected_template = -1
+            self._update_buttons()
+            return
 
-            # === Shortcuts Tab ===
-            if self.current_tab == 0:
-                # “+ Shortcut” button is last in short_buttons
-                if vid == self.short_buttons[-1]:
-                    def ask_string_cb(title, prompt, initial_value=None):
-                        return self._prompt_name(prompt)
+        if ev.type != tg.Event.click:
+            return
+        vid = ev.value['id']
 
-                    def ask_file_cb(title, initial_dir=None, initial_file=None, file_types=None):
-                        fe = FileExplorer(self.conn, select_file=True, start_dir=initial_dir)
-                        return fe.run()
+        # === Prefixes & Templates: toolbar “Add” ===
+        if vid == self.btn_add:
+            if self.current_tab == 1:
+                self._show_create_prefix_dialog()
+            elif self.current_tab == 2:
+                action = self._prompt_add_template_action()
+                if action == 'Create local template':
+                    self._show_create_template_dialog()
+                else:
+                    self.show_available_templates()
+            return
 
-                    def show_warning_cb(title, message):
-                        self._show_message(title, message)
+        # === Shortcuts Tab ===
+        if self.current_tab == 0:
+            # “+ Shortcut” button is last in short_buttons
+            if vid == self.short_buttons[-1]:
+                def ask_string_cb(title, prompt, initial_value=None):
+                    return self._prompt_name(prompt)
+
+                def ask_file_cb(title, initial_dir=None, initial_file=None, file_types=None):
+                    fe = FileExplorer(self.conn, select_file=True, start_dir=initial_dir)
+                    return fe.run()
+
+                def show_warning_cb(title, message):
+                    self._show_message(title, message)
+
+                def show_info_cb(title, message):
+                    self._show_message(title, message)
+
+                def get_templates_cb():
+                    self._ensure_loaded('templates')
+                    return [t[0] for t in self.templates]
+
+                def select_template_cb(options):
+                    dlg = tg.Activity(self.conn, dialog=True)
+                    root = tg.LinearLayout(dlg)
+                    tg.TextView(dlg, 'Choose template (or none):', root).setmargin(5)
+                    spinner = tg.Spinner(dlg, root)
+                    spinner.setlist(options)
+                    btns = tg.LinearLayout(dlg, root, False)
+                    ok = tg.Button(dlg, 'OK', btns)
+                    cancel = tg.Button(dlg, 'Cancel', btns)
+                    selected = options[0]
+                    for ev_inner in self.conn.events():
+                        if ev_inner.type == tg.Event.itemselected and ev_inner.value['id'] == spinner:
+                            selected = ev_inner.value['selected']
+                        if ev_inner.type == tg.Event.click and ev_inner.value['id'] in (ok, cancel):
+                            dlg.finish()
+                            break
+                    return selected
 
-                    def show_info_cb(title, message):
-                        self._show_message(title, message)
+                def extract_exe_icon_cb(exe_path, output_path):
+                    return self._extract_exe_icon(exe_path, output_path)
 
-                    def get_templates_cb():
-                        return [t[0] for t in self.templates]
+                def refresh_shortcuts_cb():
+                    self._refresh_content({'shortcuts'})
 
-                    def select_template_cb(options):
-                        dlg = tg.Activity(self.conn, dialog=True)
-                        root = tg.LinearLayout(dlg)
-                        tg.TextView(dlg, 'Choose template (or none):', root).setmargin(5)
-                        spinner = tg.Spinner(dlg, root)
-                        spinner.setlist(options)
-                        btns = tg.LinearLayout(dlg, root, False)
-                        ok = tg.Button(dlg, 'OK', btns)
-                        cancel = tg.Button(dlg, 'Cancel', btns)
-                        selected = options[0]
-                        for ev_inner in self.conn.events():
-                            if ev_inner.type == tg.Event.itemselected and ev_inner.value['id'] == spinner:
-                                selected = ev_inner.value['selected']
-                            if ev_inner.type == tg.Event.click and ev_inner.value['id'] in (ok, cancel):
-                                dlg.finish()
-                                break
-                        return selected
-
-                    def extract_exe_icon_cb(exe_path, output_path):
-                        return self._extract_exe_icon(exe_path, output_path)
-
-                    def refresh_shortcuts_cb():
-                        self._refresh_content()
-
-                    shortcuts.create_shortcut_common(
-                        None, # preselected_path
-                        ask_string_cb,
-                        ask_file_cb,
-                        show_warning_cb,
-                        show_info_cb,
-                        get_templates_cb,
-                        select_template_cb,
-                        extract_exe_icon_cb,
-                        refresh_shortcuts_cb,
-                        self.templates_dir, # TEMPLATES_DIR
-                        self.home # HOME
-                    )
-                    continue
-                # select a shortcut
-                if vid in self.short_buttons:
-                    self.selected_index = self.short_buttons.index(vid)
+                def icon_ready_cb(desktop_file, icon_path):
+                    # Called from the icon worker thread; handled by the UI worker
+                    if icon_path is None:
+                        self._post_call(lambda: tg.Toast(
+                            self.conn, "No icon found in the executable; edit the shortcut to set one").show())
+                    else:
+                        self._post_refresh({'shortcuts'})
+
+                shortcuts.create_shortcut_common(
+                    None, # preselected_path
+                    ask_string_cb,
+                    ask_file_cb,
+                    show_warning_cb,
+                    show_info_cb,
+                    get_templates_cb,
+                    select_template_cb,
+                    extract_exe_icon_cb,
+                    refresh_shortcuts_cb,
+                    self.templates_dir, # TEMPLATES_DIR
+                    self.home, # HOME
+                    icon_ready_cb
+                )
+                return
+            # select a shortcut
+            if vid in self.short_buttons:
+                self.selected_index = self.short_buttons.index(vid)
+                self._update_buttons()
+                return
+            # toolbar actions
+            if self.selected_index >= 0:
+                name, path = self.shortcuts[self.selected_index]
+                if vid == self.btn_run:
+                    key = os.path.basename(path)
+                    sup = supervisor.get_supervisor()
+                    queue = launchqueue.get_queue()
+                    if sup.is_running(key):
+                        sup.stop(key)
+                    elif not queue.cancel(key):
+                        try:
+                            if shortcuts.launch_desktop_file(path, timings.LaunchTimer(key)) is None \
+                                    and queue.position(key) is not None:
+                                tg.Toast(self.conn, f"{name} will start when the running game exits").show()
+                        except launchqueue.LaunchRejected as e:
+                            tg.Toast(self.conn, str(e)).show()
+                elif vid == self.btn_edit:
+                    self._show_edit_shortcut_dialog(name, path)
+                elif vid == self.btn_delete:
+                    # Also drops the Desktop link, icon and shader caches
+                    shortcuts.delete_shortcut(os.path.basename(path))
+                    self._refresh_content({'shortcuts'})
+                return
+
+        # === Prefixes Tab ===
+        if self.current_tab == 1:
+            if vid in self.prefix_buttons:
+                idx = self.prefix_buttons.index(vid)
+                if idx < len(self.prefixes):
+                    self.selected_prefix = idx
                     self._update_buttons()
-                    continue
-                # toolbar actions
-                if self.selected_index >= 0:
-                    name, path = self.shortcuts[self.selected_index]
-                    if vid == self.btn_run:
-                        subprocess.Popen(['bash', path])
-                    elif vid == self.btn_edit:
-                        self._show_edit_shortcut_dialog(name, path)
-                    elif vid == self.btn_delete:
-                        os.remove(path)
-                        self._refresh_content()
-                    continue
-
-            # === Prefixes Tab ===
-            if self.current_tab == 1:
-                if vid in self.prefix_buttons:
-                    idx = self.prefix_buttons.index(vid)
-                    if idx < len(self.prefixes):
-                        self.selected_prefix = idx
-                        self._update_buttons()
-                    continue
-                if self.selected_prefix >= 0:
-                    prefix = self.prefixes[self.selected_prefix]
-                    if vid == self.btn_edit:
-                        self._show_edit_prefix_dialog(prefix)
-                    elif vid == self.btn_delete:
-                        del self.prefixes[self.selected_prefix]
-                        self._save_prefixes(self.prefixes)
-                        self._refresh_content()
-                    continue
-
-            # === Templates Tab ===
-            if self.current_tab == 2:
-                if vid in self.template_buttons[:-1]:
-                    self.selected_template = self.template_buttons.index(vid)
+                return
+            if self.selected_prefix >= 0:
+                prefix = self.prefixes[self.selected_prefix]
+                if vid == self.btn_edit:
+                    self._show_edit_prefix_dialog(prefix)
+                elif vid == self.btn_delete:
+                    del self.prefixes[self.selected_prefix]
+                    self.selected_prefix = -1
+                    self._save_prefixes(self.prefixes)
+                    self._refresh_content({'prefixes'})
                     self._update_buttons()
-                    continue
-                if self.selected_template >= 0:
-                    name, path = self.templates[self.selected_template]
-                    if vid == self.btn_edit:
-                        new = self._prompt_name('New template name:')
-                        if new:
-                            shutil.move(path, os.path.join(self.templates_dir, new))
-                            self._refresh_content()
-                    elif vid == self.btn_delete:
-                        os.remove(path)
-                        self._refresh_content()
-                    continue
+                return
 
-            # === Help Tab ===
-            # no interactive elements here
-            if self.current_tab == 3:
-                continue
+        # === Templates Tab ===
+        if self.current_tab == 2:
+            if vid in self.template_buttons[:-1]:
+                self.selected_template = self.template_buttons.index(vid)
+                self._update_buttons()
+                return
+            if self.selected_template >= 0:
+                name, path = self.templates[self.selected_template]
+                if vid == self.btn_edit:
+                    new = self._prompt_name('New template name:')
+                    if new:
+                        shutil.move(path, os.path.join(self.templates_dir, new))
+                        self._refresh_content({'templates'})
+                elif vid == self.btn_delete:
+                    os.remove(path)
+                    self._refresh_content({'templates'})
+                return
+
+        # === Help Tab: tools ===
+        if self.current_tab == 3:
+            if vid == self.btn_repair_icons:
+                self._run_icon_batch(iconbatch.shortcut_jobs(self.shortcuts_dir))
+            elif vid == self.btn_folder_icons:
+                folder = FileExplorer(self.conn, select_file=True).run()
+                if folder and os.path.isdir(folder):
+                    self._run_icon_batch(iconbatch.folder_jobs(folder, self.shortcuts_dir))
+            elif vid == self.btn_timings:
+                self._show_timings()
+            elif vid == self.btn_shaders:
+                self._show_shader_caches()
+            elif vid == self.btn_usage:
+                self._show_usage()
+            return
 
 
 if __name__ == '__main__':
+    if getattr(sys, 'frozen', False):
+        # PyInstaller builds: lets app.iconbatch start its worker processes
+        import multiprocessing
+        multiprocessing.freeze_support()
+    if os.getenv('BARREL_IMPORT_ONLY'):
+        # benchmarks/cold_start.py: stop once everything is imported
+        sys.exit(0)
     ShortcutManager()
\ No newline at end of file
@@ -6,7 +6,8 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    # Imported lazily (app.lazy), invisible to the analysis
+    hiddenimports=['requests', 'app.updater', 'app.installers', 'app.iconbatch'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -8,15 +8,11 @@ import shutil
 import subprocess
 import json
 import glob
-import requests
-import urllib.request
-import tarfile
-import tempfile
-import zipfile
 import re
 import sys
 import time
-import webbrowser
+import queue
+import threading
 from pathlib import Path
 from shutil import SameFileError
 
@@ -25,8 +21,25 @@ from app import __version__, __app_name__
 from app import config
 from app import shortcuts
 from app import templates
-from app import updater
-from app import installers
+from app import watcher
+from app import icons
+from app import peicon
+from app import supervisor
+from app import wineserver
+from app import timings
+from app import launchqueue
+from app import sched
+from app import shadercache
+from app import sampler
+from app.lazy import lazy_import
+
+# Only needed for downloads, updates and batch jobs: loaded on first use
+requests = lazy_import('requests')
+tempfile = lazy_import('tempfile')
+webbrowser = lazy_import('webbrowser')
+updater = lazy_import('app.updater')
+installers = lazy_import('app.installers')
+iconbatch = lazy_import('app.iconbatch')
 
 
 # === XDG Base Directory Spec ===
@@ -43,6 +56,98 @@ CACHE_DIR = XDG_CACHE_HOME / 'shortcut_launcher'
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 
+class VirtualList(ttk.Frame):
+    """Scrollable list that only creates widgets for the visible rows.
+
+    A pool of rows just large enough to fill the viewport is created with
+    make_row(parent); scrolling rebinds the pool to another slice of the
+    items through render_row(row, item) instead of creating widgets.
+    """
+
+    ROW_HEIGHT = 50
+
+    def __init__(self, parent, make_row, render_row, empty_text="Nothing to show.", row_height=None):
+        super().__init__(parent)
+        self.make_row = make_row
+        self.render_row = render_row
+        self.row_height = row_height or self.ROW_HEIGHT
+        self.items = []
+        self.rows = []
+        self.offset = 0
+        self.page = 1
+
+        self.viewport = ttk.Frame(self)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.viewport.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+        self.empty_label = ttk.Label(self.viewport, text=empty_text)
+
+        self.viewport.bind("<Configure>", self._on_resize)
+        self._bind_wheel(self.viewport)
+
+    def set_items(self, items):
+        """Replace the items, keeping the scroll position where possible"""
+        self.items = list(items)
+        self.offset = self._clamp(self.offset)
+        self._render()
+
+    def yview(self, *args):
+        """Scrollbar protocol: ('moveto', fraction) or ('scroll', n, 'units'|'pages')"""
+        if args[0] == "moveto":
+            offset = round(float(args[1]) * len(self.items))
+        elif args[0] == "scroll":
+            step = int(args[1]) * (self.page if args[2] == "pages" else 1)
+            offset = self.offset + step
+        else:
+            return
+        offset = self._clamp(offset)
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+
+    def _clamp(self, offset):
+        return max(0, min(offset, len(self.items) - self.page))
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", lambda e: self.yview("scroll", -1 if e.delta > 0 else 1, "units"))
+        widget.bind("<Button-4>", lambda e: self.yview("scroll", -1, "units"))
+        widget.bind("<Button-5>", lambda e: self.yview("scroll", 1, "units"))
+        for child in widget.winfo_children():
+            self._bind_wheel(child)
+
+    def _on_resize(self, event):
+        count = max(1, -(-event.height // self.row_height))
+        while len(self.rows) < count:
+            row = self.make_row(self.viewport)
+            self._bind_wheel(row)
+            self.rows.append(row)
+        while len(self.rows) > count:
+            self.rows.pop().destroy()
+        self.page = max(1, event.height // self.row_height)
+        self.offset = self._clamp(self.offset)
+        self._render()
+
+    def _render(self):
+        if self.items:
+            self.empty_label.place_forget()
+        else:
+            self.empty_label.place(relx=0.5, y=10, anchor="n")
+
+        for i, row in enumerate(self.rows):
+            index = self.offset + i
+            if index < len(self.items):
+                self.render_row(row, self.items[index])
+                row.place(x=0, y=i * self.row_height, relwidth=1, height=self.row_height - 4)
+            else:
+                row.place_forget()
+
+        total = len(self.items)
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.page) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
+
 class ShortcutLauncher:
     def __init__(self, root):
         self.root = root
@@ -83,6 +188,11 @@ class ShortcutLauncher:
         self.root.option_add('*Menu.activeForeground', self.accent_color)
         self.create_main_frame()
         self.notify_runners()
+        self.start_change_watcher()
+        supervisor.get_supervisor().add_listener(self._on_launch_change)
+        launchqueue.get_queue().add_listener(self._on_launch_change)
+        sampler.get_sampler().add_listener(self._on_launch_change)
+        wineserver.get_pool().start()
 
     def setup_styles(self):
         """Configure all ttk styles"""
@@ -156,6 +266,15 @@ class ShortcutLauncher:
         menubar.add_command(label="Shortcuts", command=self.list_shortcuts)
         menubar.add_command(label="Templates", command=self.list_templates)
         menubar.add_command(label="Prefixes", command=self.manage_prefixes)
+
+        # Tools menu
+        tools_menu = tk.Menu(menubar, tearoff=0)
+        tools_menu.add_command(label="Repair Missing Icons", command=self.repair_icons)
+        tools_menu.add_command(label="Extract Icons from Folder...", command=self.extract_folder_icons)
+        tools_menu.add_command(label="Launch Timings", command=self.show_timings)
+        tools_menu.add_command(label="Shader Caches", command=self.show_shader_caches)
+        tools_menu.add_command(label="Resource Usage", command=self.show_usage)
+        menubar.add_cascade(label="Tools", menu=tools_menu)
         
         # Help menu
         help_menu = tk.Menu(menubar, tearoff=0)
@@ -169,6 +288,7 @@ class ShortcutLauncher:
         """Create the main application frame"""
         if hasattr(self, 'main_frame'):
             self.main_frame.destroy()
+        self.current_view = None
         
         self.main_frame = ttk.Frame(self.root)
         self.main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -200,6 +320,106 @@ class ShortcutLauncher:
     # ... [restul metodelor rămân la fel ca în codul original]
     # List shortcuts, templates, manage prefixes etc.
 
+    def start_change_watcher(self):
+        """Refresh the visible list when files change outside this window"""
+        apps_dir = Path(os.getenv('XDG_DATA_HOME', Path.home()/'.local'/'share')) / 'applications' / 'shortcuts'
+        sources = watcher.default_sources(apps_dir, self.TEMPLATES_DIR, config.PREFIXES_FILE)
+        self.pending_changes = queue.Queue()
+        self.ui_calls = queue.Queue()
+        self.watcher = watcher.Watcher(self.pending_changes.put, sources).start()
+        self.root.after(500, self._poll_changes)
+
+    def _poll_changes(self):
+        # Callbacks queued by worker threads run here, in the Tk thread
+        while True:
+            try:
+                call = self.ui_calls.get_nowait()
+            except queue.Empty:
+                break
+            call()
+
+        events = []
+        while True:
+            try:
+                events.extend(self.pending_changes.get_nowait())
+            except queue.Empty:
+                break
+        if events:
+            self._apply_changes(events)
+        self.root.after(500, self._poll_changes)
+
+    def _apply_changes(self, events):
+        """Apply watcher events to the open view, one row at a time.
+
+        Only the files named by the events are looked at. An event for a
+        file already shown as it is on disk, such as the echo of this
+        window's own create, edit or delete, changes nothing.
+        """
+        names = {ev.name for ev in events if ev.source == self.current_view}
+        if not names:
+            return
+        if self.current_view == 'shortcuts':
+            if None in names:
+                self.refresh_shortcuts()
+                return
+            apps_dir = Path(os.getenv('XDG_DATA_HOME', Path.home()/'.local'/'share')) / 'applications' / 'shortcuts'
+            current = {e['file']: e for e in self.shortcut_list.items}
+            for fname, entry in shortcuts.update_catalog(names, apps_dir).items():
+                if entry is None:
+                    current.pop(fname, None)
+                else:
+                    current[fname] = entry
+            items = [current[fname] for fname in sorted(current)]
+            if items != self.shortcut_list.items:
+                self.shortcut_list.set_items(items)
+        elif self.current_view == 'templates':
+            if None in names:
+                self.list_templates()
+                return
+            keys = {key for key, _ in self.item_frames}
+            for name in names:
+                if os.path.isfile(os.path.join(self.TEMPLATES_DIR, name)):
+                    keys.add(name)
+                else:
+                    keys.discard(name)
+            if not self._update_items(sorted(keys), self._create_template_item):
+                self.list_templates()
+        elif self.current_view == 'prefixes':
+            if not self._update_items(self.load_prefixes(), self._create_prefix_item):
+                self.manage_prefixes()
+
+    def _update_items(self, keys, create_item):
+        """Bring the rows of the open templates or prefixes list in line with keys.
+
+        Rows of removed keys are destroyed and new rows are packed in their
+        place. Returns False when the list has to be rebuilt instead: it was
+        or becomes empty, has duplicates, or its order changed.
+        """
+        shown = [key for key, _ in self.item_frames]
+        if keys == shown:
+            return True
+        wanted = set(keys)
+        kept = [key for key in shown if key in wanted]
+        if not shown or not keys or len(wanted) != len(keys) or kept != [k for k in keys if k in set(kept)]:
+            return False
+        frames = dict(self.item_frames)
+        for key in shown:
+            if key not in wanted:
+                frames.pop(key).destroy()
+        # New rows are packed last; move each one in front of the row that follows it
+        after = None
+        rows = []
+        for key in reversed(keys):
+            frame = frames.get(key)
+            if frame is None:
+                frame = create_item(self.item_parent, key)
+                if after is not None:
+                    frame.pack_configure(before=after)
+            after = frame
+            rows.append((key, frame))
+        self.item_frames = rows[::-1]
+        return True
+
     def notify_runners(self):
         """Check for available runners and notify if none found"""
         self.runners = []
@@ -230,6 +450,7 @@ class ShortcutLauncher:
         except ImportError:
             return None  # nu avem Pillow, nu încărcăm iconița
 
+        icon_path = icons.thumbnail(icon_path, max(size)) or icon_path
         try:
             img = Image.open(icon_path)
             if getattr(img, 'mode', None) == 'RGBA':
@@ -260,12 +481,9 @@ class ShortcutLauncher:
         # Collect all used icons
         for f in os.listdir(desktop_dir):
             if f.endswith(".desktop"):
-                with open(os.path.join(desktop_dir, f), 'r') as file:
-                    for line in file:
-                        if line.startswith("Icon="):
-                            icon_path = line.split("=", 1)[1].strip()
-                            if os.path.isabs(icon_path):
-                                used_icons.add(icon_path)
+                icon_path = shortcuts.read_desktop_entry(os.path.join(desktop_dir, f), ('Icon',)).icon
+                if icon_path and os.path.isabs(icon_path):
+                    used_icons.add(icon_path)
         
         # Delete unused icons
         for icon_file in os.listdir(icons_dir):
@@ -278,140 +496,103 @@ class ShortcutLauncher:
 
     def list_shortcuts(self):
         self.clear_main_frame()
+        self.current_view = 'shortcuts'
 
         header = ttk.Frame(self.main_frame)
         header.pack(fill=tk.X, pady=5)
         ttk.Label(header, text="Shortcuts", style="Header.TLabel").pack(side=tk.LEFT)
         ttk.Button(header, text="Add", command=self.add_shortcut).pack(side=tk.RIGHT)
 
-        canvas = tk.Canvas(self.main_frame, bg=self.bg_color, highlightthickness=0)
-        scrollbar = ttk.Scrollbar(self.main_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-
+        self.shortcut_icons = {}
+        self.shortcut_list = VirtualList(self.main_frame,
+                                         self._make_shortcut_row,
+                                         self._render_shortcut_row,
+                                         empty_text="No shortcuts available.")
+        self.shortcut_list.pack(fill="both", expand=True)
+        self.refresh_shortcuts()
+
+    def refresh_shortcuts(self):
+        """Reload the catalog into the visible shortcut list"""
+        if self.current_view != 'shortcuts':
+            return
         apps_dir = Path(os.getenv('XDG_DATA_HOME', Path.home()/'.local'/'share')) / 'applications' / 'shortcuts'
-        apps_dir.mkdir(parents=True, exist_ok=True)
-        shortcuts = []  # will contain (display_name, filename)
+        self.shortcut_list.set_items(shortcuts.load_catalog(apps_dir))
 
-        for fname in os.listdir(apps_dir):
-            if not fname.endswith(".desktop"):
-                continue
-            path = os.path.join(apps_dir, fname)
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    lines = f.read().splitlines()
-            except:
-                continue
-
-            # extract display name
-            display = next((l.lstrip().split("=",1)[1] for l in lines if l.lstrip().startswith("Name=")), None)
-            if not display:
-                display = os.path.splitext(fname)[0]
-
-            shortcuts.append((display, fname))
-
-        # display
-        if not shortcuts:
-            ttk.Label(scrollable_frame, text="No shortcuts available.").pack(pady=10)
-        else:
-            for display, fname in shortcuts:
-                # send display and filename
-                self._create_shortcut_item(scrollable_frame, display, fname)
-
-
-    # Definirea corectă:
-    def _create_shortcut_item(self, parent, display_name, filename):
-        frame = ttk.Frame(parent, style="Item.TFrame")
-        frame.pack(fill=tk.X, pady=5, padx=5)
-
-        # Încarcă iconița (aici nu modifici)
-        desktop_dir = (
-            os.path.join(self.HOME, "Desktop")
-            if os.path.exists(os.path.join(self.HOME, "Desktop"))
-            else self.HOME
-        )
-        desktop_file = os.path.join(desktop_dir, filename)
-        icon_path = self._get_icon_from_desktop(desktop_file)
+    def _make_shortcut_row(self, parent):
+        """One recycled row of the shortcut list"""
+        row = ttk.Frame(parent, style="Item.TFrame")
 
         # Frame icon + nume
-        icon_name_frame = ttk.Frame(frame)
+        icon_name_frame = ttk.Frame(row)
         icon_name_frame.pack(side=tk.LEFT, padx=10, fill=tk.X, expand=True)
+        row.icon = ttk.Label(icon_name_frame)
+        row.icon.pack(side=tk.LEFT, padx=(0,5))
+        row.label = ttk.Label(icon_name_frame, font=("Arial", 12))
+        row.label.pack(side=tk.LEFT, anchor="w")
+        row.status = ttk.Label(icon_name_frame, foreground="gray")
+        row.status.pack(side=tk.LEFT, anchor="w", padx=(10, 0))
 
-        # Icon
+        # Buttons
+        actions = ttk.Frame(row)
+        actions.pack(side=tk.RIGHT, padx=10)
+        row.run = ttk.Button(actions, text="Run", width=8)
+        row.run.pack(side=tk.LEFT, padx=2)
+        row.edit = ttk.Button(actions, text="Edit", width=8)
+        row.edit.pack(side=tk.LEFT, padx=2)
+        row.delete = ttk.Button(actions, text="Delete", width=8)
+        row.delete.pack(side=tk.LEFT, padx=2)
+        return row
+
+    def _render_shortcut_row(self, row, entry):
+        filename = entry['file']
+        row.icon.configure(image=self._shortcut_icon(entry['icon']) or '')
+        # Afișăm display_name, nu filename
+        row.label.configure(text=entry['name'])
+        status = [launchqueue.status_text(filename), sampler.live_text(filename)]
+        row.status.configure(text=" · ".join(s for s in status if s))
+        if supervisor.get_supervisor().is_running(filename):
+            row.run.configure(text="Stop", command=lambda f=filename: self.stop_shortcut(f))
+        elif launchqueue.get_queue().position(filename) is not None:
+            row.run.configure(text="Cancel", command=lambda f=filename: launchqueue.get_queue().cancel(f))
+        else:
+            row.run.configure(text="Run", command=lambda f=filename: self.run_shortcut(f))
+        row.edit.configure(command=lambda f=filename: self.edit_shortcut(f))
+        row.delete.configure(command=lambda f=filename: self.delete_shortcut(f))
+
+    def _shortcut_icon(self, icon_name):
+        """PhotoImage for an Icon= value, loaded once per list"""
+        if icon_name in self.shortcut_icons:
+            return self.shortcut_icons[icon_name]
         icon_img = None
-        if icon_path and os.path.exists(icon_path):
+        icon_path = self._resolve_icon(icon_name)
+        if icon_path:
             try:
-                icon_img = tk.PhotoImage(file=icon_path)
+                icon_img = tk.PhotoImage(file=icons.thumbnail(icon_path, 32) or icon_path)
+                factor = -(-max(icon_img.width(), icon_img.height()) // 32)
+                if factor > 1:
+                    icon_img = icon_img.subsample(factor)
             except Exception:
                 icon_img = None
-        if icon_img:
-            lbl_icon = ttk.Label(icon_name_frame, image=icon_img)
-            lbl_icon.image = icon_img
-            lbl_icon.pack(side=tk.LEFT, padx=(0,5))
-
-        # Afișăm display_name, nu filename
-        ttk.Label(icon_name_frame, text=display_name, font=("Arial", 12)).pack(side=tk.LEFT, anchor="w")
-
-        # Buttons
-        actions = ttk.Frame(frame)
-        actions.pack(side=tk.RIGHT, padx=10)
-        ttk.Button(actions, text="Run", width=8,
-                   command=lambda f=filename: self.run_shortcut(f)).pack(side=tk.LEFT, padx=2)
-        ttk.Button(actions, text="Edit", width=8,
-                   command=lambda f=filename: self.edit_shortcut(f)).pack(side=tk.LEFT, padx=2)
-        ttk.Button(actions, text="Delete", width=8,
-                   command=lambda f=filename: self.delete_shortcut(f)).pack(side=tk.LEFT, padx=2)
+        self.shortcut_icons[icon_name] = icon_img
+        return icon_img
 
-        
     def _get_icon_from_desktop(self, desktop_path):
         if not os.path.exists(desktop_path):
             return None
             
-        icon_name = None
-        with open(desktop_path, 'r') as f:
-            for line in f:
-                if line.startswith("Icon="):
-                    icon_name = line.split("=", 1)[1].strip()
-                    break
-        
-        if not icon_name:
-            return None
-        
-        # Verifică dacă este cale absolută
-        if os.path.isabs(icon_name):
-            return icon_name if os.path.exists(icon_name) else None
-        
-        # Caută în locațiile standard pentru iconițe
-        search_paths = [
-            os.path.join(self.HOME, ".icons"),
-            "/usr/share/pixmaps",
-            "/usr/share/icons",
-            "/usr/local/share/icons"
-        ]
-        
-        for ext in ["", ".png", ".svg", ".xpm", ".ico"]:
-            for path in search_paths:
-                icon_path = os.path.join(path, icon_name + ext)
-                if os.path.exists(icon_path):
-                    return icon_path
-                    
-        return None
+        icon_name = shortcuts.read_desktop_entry(desktop_path, ('Icon',)).icon
+        return self._resolve_icon(icon_name)
+
+    def _resolve_icon(self, icon_name):
+        return icons.resolve_icon(icon_name)
         
         
     def _extract_exe_icon(self, exe_path, output_path):
+        # Pregătim calea de output în PNG
+        png_path = output_path.replace('.ico', '.png')
+        if peicon.extract_icon(exe_path, png_path, 48):
+            return True
         try:
-            # Pregătim calea de output în PNG
-            png_path = output_path.replace('.ico', '.png')
-
             # Extragem iconița cu wrestool direct în png_path
             subprocess.run([
                 "wrestool", "-x", "-t", "14",
@@ -422,7 +603,7 @@ class ShortcutLauncher:
             # Convertim la dimensiune standard (dacă ImageMagick e disponibil)
             if shutil.which("convert"):
                 subprocess.run([
-                    "convert", png_path, "-resize", "32x32", png_path
+                    "convert", png_path, "-resize", "48x48", png_path
                 ], check=True)
 
             return os.path.exists(png_path)
@@ -431,8 +612,178 @@ class ShortcutLauncher:
             return False
             
 
+    def repair_icons(self):
+        """Extract icons for .exe shortcuts whose icon is missing"""
+        self._run_icon_batch(iconbatch.shortcut_jobs())
+
+    def extract_folder_icons(self):
+        """Extract icons for every .exe in a folder of games"""
+        folder = filedialog.askdirectory(title="Choose a folder of games")
+        if folder:
+            self._run_icon_batch(iconbatch.folder_jobs(folder))
+
+    def _run_icon_batch(self, jobs):
+        if not jobs:
+            messagebox.showinfo("Icons", "No icons to extract.")
+            return
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Extracting Icons")
+        dialog.geometry("420x120")
+        status = ttk.Label(dialog, text=f"0 / {len(jobs)}")
+        status.pack(pady=10, padx=10, anchor="w")
+        bar = ttk.Progressbar(dialog, maximum=len(jobs), length=400)
+        bar.pack(padx=10)
+
+        progress = queue.Queue()
+
+        def work():
+            ok, failed = iconbatch.run_batch(
+                jobs, lambda done, total, exe: progress.put(('progress', done, exe)))
+            progress.put(('done', ok, failed))
+
+        def poll():
+            while True:
+                try:
+                    kind, a, b = progress.get_nowait()
+                except queue.Empty:
+                    break
+                if kind == 'progress':
+                    bar['value'] = a
+                    status.configure(text=f"{a} / {len(jobs)}  {os.path.basename(b)}")
+                else:
+                    dialog.destroy()
+                    messagebox.showinfo("Icons", f"Extracted {len(a)} icon(s), {len(b)} failed.")
+                    self.refresh_shortcuts()
+                    return
+            dialog.after(100, poll)
+
+        threading.Thread(target=work, daemon=True).start()
+        poll()
+
     def run_shortcut(self, filename):
-        shortcuts.run_shortcut(filename)
+        try:
+            shortcuts.run_shortcut(filename, timings.LaunchTimer(filename))
+        except launchqueue.LaunchRejected as e:
+            messagebox.showwarning("Launch", str(e))
+
+    def show_timings(self):
+        """Launch latency percentiles per shortcut, with export"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Launch Timings")
+        dialog.geometry("640x360")
+        ttk.Label(dialog, text="Milliseconds after the click (p50 / p95)", style="Section.TLabel").pack(pady=8)
+
+        columns = ("template",) + timings.STAGES
+        tree = ttk.Treeview(dialog, columns=columns, show="tree headings")
+        tree.heading("#0", text="Shortcut")
+        tree.heading("template", text="Template")
+        for stage in timings.STAGES:
+            tree.heading(stage, text=stage.replace('_', ' '))
+            tree.column(stage, width=110, anchor="center")
+        for key, entry in timings.summary().items():
+            cells = [entry['template'] or '']
+            for stage in timings.STAGES:
+                s = entry['stages'].get(stage)
+                cells.append(f"{s['p50']:.0f} / {s['p95']:.0f}" if s else "-")
+            tree.insert("", tk.END, text=key, values=cells)
+        tree.pack(fill=tk.BOTH, expand=True, padx=10)
+
+        def export():
+            path = filedialog.asksaveasfilename(parent=dialog, defaultextension=".csv",
+                                                initialfile="launch_timings.csv",
+                                                filetypes=[("CSV", "*.csv"), ("JSON", "*.json")])
+            if path:
+                try:
+                    timings.export(path)
+                except OSError as e:
+                    messagebox.showerror("Error", f"Export failed:\n{e}", parent=dialog)
+
+        buttons = ttk.Frame(dialog)
+        buttons.pack(pady=8)
+        ttk.Button(buttons, text="Export...", command=export).pack(side=tk.LEFT, padx=4)
+        ttk.Button(buttons, text="Close", command=dialog.destroy).pack(side=tk.LEFT, padx=4)
+
+    def show_shader_caches(self):
+        """Per-shortcut shader cache sizes, with clear and evict"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Shader Caches")
+        dialog.geometry("520x360")
+        budget = config.load_settings()['shader_cache_bytes']
+        summary = ttk.Label(dialog, style="Section.TLabel")
+        summary.pack(pady=8)
+
+        tree = ttk.Treeview(dialog, columns=("size", "last"), show="tree headings")
+        tree.heading("#0", text="Shortcut")
+        tree.heading("size", text="Size")
+        tree.heading("last", text="Last launch")
+        tree.column("size", width=100, anchor="e")
+        tree.column("last", width=120, anchor="center")
+        tree.pack(fill=tk.BOTH, expand=True, padx=10)
+
+        def refresh():
+            tree.delete(*tree.get_children())
+            total = 0
+            for name, _, size, last in shadercache.caches():
+                tree.insert("", tk.END, iid=name, text=name,
+                            values=(shadercache.format_size(size), shadercache.describe(last)))
+                total += size
+            limit = shadercache.format_size(budget) if budget else "no limit"
+            summary.config(text=f"{shadercache.format_size(total)} used, budget {limit}")
+
+        def clear_selected():
+            names = tree.selection()
+            if names and messagebox.askyesno("Shader Caches", f"Delete {len(names)} cache(s)? "
+                                             "Games will rebuild them, with stutter.", parent=dialog):
+                for name in names:
+                    shadercache.clear(name)
+                refresh()
+
+        def evict():
+            shadercache.evict(budget)
+            refresh()
+
+        refresh()
+        buttons = ttk.Frame(dialog)
+        buttons.pack(pady=8)
+        ttk.Button(buttons, text="Clear Selected", command=clear_selected).pack(side=tk.LEFT, padx=4)
+        ttk.Button(buttons, text="Trim to Budget", command=evict).pack(side=tk.LEFT, padx=4)
+        ttk.Button(buttons, text="Close", command=dialog.destroy).pack(side=tk.LEFT, padx=4)
+
+    def show_usage(self):
+        """CPU and memory of running and recent launches"""
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Resource Usage")
+        dialog.geometry("560x380")
+        text = tk.Text(dialog, wrap="none", height=16)
+        text.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 0))
+
+        def refresh():
+            lines = []
+            for summary in sampler.get_sampler().summaries():
+                lines.extend(sampler.summary_lines(summary) + [""])
+            text.config(state='normal')
+            text.delete("1.0", tk.END)
+            text.insert(tk.END, "\n".join(lines) or "No launches sampled yet.")
+            text.config(state='disabled')
+
+        refresh()
+        buttons = ttk.Frame(dialog)
+        buttons.pack(pady=8)
+        ttk.Button(buttons, text="Refresh", command=refresh).pack(side=tk.LEFT, padx=4)
+        ttk.Button(buttons, text="Close", command=dialog.destroy).pack(side=tk.LEFT, padx=4)
+
+    def stop_shortcut(self, filename):
+        supervisor.get_supervisor().stop(filename)
+
+    def _on_launch_change(self, launch=None):
+        # Launch start/exit and queue changes, possibly from a worker thread
+        self.ui_calls.put(self._redraw_shortcuts)
+
+    def _redraw_shortcuts(self):
+        """Re-render the visible rows so run state and buttons are current"""
+        if self.current_view == 'shortcuts':
+            self.shortcut_list.set_items(self.shortcut_list.items)
 
     def edit_shortcut(self, filename):
         desktop_dir = (
@@ -442,24 +793,24 @@ class ShortcutLauncher:
         )
         desktop_path = os.path.join(desktop_dir, filename)
 
-        with open(desktop_path, "r", encoding="utf-8") as f:
-            lines = f.read().splitlines()
+        entry = shortcuts.read_desktop_entry(desktop_path)
 
         # Safely extract values, providing defaults if they don't exist
         config = {}
-        for line in lines:
-            if "=" in line:
-                key, value = line.split("=", 1)
-                config[key.strip()] = value.strip()
+        for key, field in shortcuts.DesktopEntry.FIELDS.items():
+            value = getattr(entry, field)
+            if value is not None:
+                config[key] = value
+        config.update(entry.extra)
 
-        display_name = config.get("Name", os.path.splitext(filename)[0])
-        raw_exec_val = config.get("Exec", "")
-        icon_val = config.get("Icon", "application-x-executable")
-        term_val = config.get("Terminal", "true").lower() == "true"
+        display_name = entry.name or os.path.splitext(filename)[0]
+        raw_exec_val = entry.exec or ""
+        icon_val = entry.icon or "application-x-executable"
+        term_val = entry.terminal if entry.terminal is not None else True
 
         edit_dialog = tk.Toplevel(self.root)
         edit_dialog.title(f"Edit {display_name}")
-        edit_dialog.geometry("600x400")
+        edit_dialog.geometry("600x600")
 
         container = ttk.Frame(edit_dialog)
         container.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -476,12 +827,8 @@ class ShortcutLauncher:
         template_combo = ttk.Combobox(container, textvariable=template_var, values=choices, state="readonly")
         template_combo.pack(fill="x", pady=2)
 
-        match = re.match(r'bash\s+"([^"]+)"', raw_exec_val)
-        if match:
-            template_var.set(os.path.basename(match.group(1)))
-        else:
-
-            template_var.set("(no template)")
+        tpl_name, _ = shortcuts.parse_exec_template(raw_exec_val)
+        template_var.set(tpl_name or "(no template)")
 
         ttk.Label(container, text="Open in Terminal:").pack(anchor="w", pady=(10, 0))
         term_var = tk.BooleanVar(value=term_val)
@@ -490,9 +837,38 @@ class ShortcutLauncher:
         ttk.Radiobutton(term_frame, text="Yes", variable=term_var, value=True).pack(side="left")
         ttk.Radiobutton(term_frame, text="No", variable=term_var, value=False).pack(side="left")
 
+        # Scheduling, applied by the launcher when the shortcut starts
+        ttk.Label(container, text="Scheduling:", style="Section.TLabel").pack(anchor="w", pady=(10, 0))
+        sched_frame = ttk.Frame(container)
+        sched_frame.pack(fill="x")
+        cpus_var = tk.StringVar(value=entry.extra.get(sched.CPUS_KEY, ""))
+        nice_var = tk.StringVar(value=entry.extra.get(sched.NICE_KEY, ""))
+        ioprio_var = tk.StringVar(value=entry.extra.get(sched.IOPRIO_KEY, ""))
+        ttk.Label(sched_frame, text="CPUs (e.g. 4-7, auto):").grid(row=0, column=0, sticky="w")
+        ttk.Entry(sched_frame, textvariable=cpus_var, width=16).grid(row=0, column=1, sticky="w", padx=5)
+
+        def detect_cpus():
+            fastest = sched.fastest_cluster()
+            if fastest:
+                cpus_var.set(sched.format_cpus(fastest))
+            else:
+                messagebox.showinfo("CPUs", "All cores are alike; no faster cluster found.", parent=edit_dialog)
+
+        ttk.Button(sched_frame, text="Fastest cores", command=detect_cpus).grid(row=0, column=2, padx=5)
+        ttk.Label(sched_frame, text="Nice (-20..19):").grid(row=1, column=0, sticky="w")
+        ttk.Entry(sched_frame, textvariable=nice_var, width=16).grid(row=1, column=1, sticky="w", padx=5)
+        ttk.Label(sched_frame, text="I/O priority (be/4, idle):").grid(row=2, column=0, sticky="w")
+        ttk.Combobox(sched_frame, textvariable=ioprio_var, width=14,
+                     values=["", "rt/4", "be/0", "be/4", "be/7", "idle"]).grid(row=2, column=1, sticky="w", padx=5)
+
         def save_changes():
             new_name = name_var.get().strip() or display_name
             tpl = template_var.get().strip()
+            try:
+                sched_values = sched.validate(cpus_var.get(), nice_var.get(), ioprio_var.get())
+            except ValueError as e:
+                messagebox.showerror("Error", f"Invalid scheduling settings:\n{e}", parent=edit_dialog)
+                return
 
             # Correctly extract the actual executable path
             quoted_parts = re.findall(r'"([^"]+)"', raw_exec_val)
@@ -517,6 +893,11 @@ class ShortcutLauncher:
             config["Exec"] = new_exec
             config["Terminal"] = new_term
             config["Icon"] = icon_val # Preserve original icon
+            for key, value in sched_values.items():
+                if value:
+                    config[key] = value
+                else:
+                    config.pop(key, None)
 
             new_content = "[Desktop Entry]\n" + "\n".join([f"{k}={v}" for k, v in config.items() if k != "Type"])
             
@@ -534,14 +915,14 @@ class ShortcutLauncher:
 
     def delete_shortcut(self, filename):
         shortcuts.delete_shortcut(filename)
-        self.list_shortcuts()
+        self.refresh_shortcuts()
 
     def add_shortcut(self, preselected_path=None):
         def ask_string_cb(title, prompt, initial_value=None):
             return simpledialog.askstring(title, prompt, initialvalue=initial_value)
 
         def ask_file_cb(title, initial_dir=None, initial_file=None, file_types=None):
-            return filedialog.askopenfilename(title=title, initialdir=initial_dir, initial_file=initial_file, filetypes=file_types)
+            return filedialog.askopenfilename(title=title, initialdir=initial_dir, initialfile=initial_file, filetypes=file_types or [])
 
         def show_warning_cb(title, message):
             messagebox.showwarning(title, message)
@@ -583,6 +964,10 @@ class ShortcutLauncher:
         def refresh_shortcuts_cb():
             self.list_shortcuts()
 
+        def icon_ready_cb(desktop_file, icon_path):
+            # Called from the icon worker thread; handled in the Tk loop
+            self.ui_calls.put(lambda: self._icon_ready(desktop_file, icon_path))
+
         shortcuts.create_shortcut_common(
             preselected_path,
             ask_string_cb,
@@ -594,12 +979,25 @@ class ShortcutLauncher:
             extract_exe_icon_cb,
             refresh_shortcuts_cb,
             self.TEMPLATES_DIR,
-            self.HOME
+            self.HOME,
+            icon_ready_cb
         )
 
+    def _icon_ready(self, desktop_file, icon_path):
+        """Background icon extraction of a new shortcut finished"""
+        if icon_path is None:
+            chosen = filedialog.askopenfilename(
+                title="No icon found in the executable. Choose one (optional)",
+                initialdir=str(iconbatch.ICONS_DIR),
+                filetypes=[("Images", "*.png *.svg *.ico *.xpm")])
+            if chosen:
+                shortcuts.set_desktop_keys(desktop_file, {'Icon': chosen})
+        self.refresh_shortcuts()
+
     
     def list_templates(self):
         self.clear_main_frame()
+        self.current_view = 'templates'
 
         header = ttk.Frame(self.main_frame)
         header.pack(fill=tk.X, pady=5)
@@ -619,12 +1017,14 @@ class ShortcutLauncher:
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
 
-        templates = os.listdir(self.TEMPLATES_DIR)
+        templates = sorted(os.listdir(self.TEMPLATES_DIR))
+        self.item_parent = scrollable_frame
+        self.item_frames = []
         if not templates:
             ttk.Label(scrollable_frame, text="No templates available.").pack(pady=10)
         else:
             for template in templates:
-                self._create_template_item(scrollable_frame, template)
+                self.item_frames.append((template, self._create_template_item(scrollable_frame, template)))
 
         back_btn = ttk.Button(self.main_frame, text="Back", command=self.go_back)
         back_btn.pack(pady=10)
@@ -645,6 +1045,7 @@ class ShortcutLauncher:
                   command=lambda: self.edit_template(name)).pack(side=tk.LEFT, padx=2)
         ttk.Button(actions, text="Delete", width=8,
                   command=lambda: self.delete_template(name)).pack(side=tk.LEFT, padx=2)
+        return frame
 
     def edit_template(self, name):
         path = os.path.join(self.TEMPLATES_DIR, name)
@@ -825,6 +1226,7 @@ class ShortcutLauncher:
                 (f"\texport DXVK_HUD={dxvk}" if dxvk!="none" else ""),
                 (f"\texport VK_ICD_FILENAMES={vk}" if vk else ""),
                 (f"\texport HODLL={emu}" if emu else ""),
+                *[f"\t{line}" for line in shadercache.template_exports()],
                 "", "# === Script Directory ===",
                 '\tcd "$(dirname "$1")"', "", "# === Main Run ===",
                 f'\t{runner} "$1"{parallel}', "", "# === Post-execution ===",
@@ -854,6 +1256,7 @@ class ShortcutLauncher:
                 f"\texport DXVK_HUD={dxvk}" if dxvk != "none" else "",
                 f"\texport VK_ICD_FILENAMES={vk}" if vk else "",
                 f"\texport HODLL={emu}" if emu else "",
+                *[f"\t{line}" for line in shadercache.template_exports()],
                 "",
                 "# === Script Directory ===",
                 '\tcd "$(dirname "$1")"',
@@ -899,6 +1302,7 @@ class ShortcutLauncher:
         
     def manage_prefixes(self):
         self.clear_main_frame()
+        self.current_view = 'prefixes'
         header = ttk.Frame(self.main_frame)
         header.pack(fill=tk.X, pady=5)
         ttk.Label(header, text="Manage Wine Prefixes", style="Header.TLabel").pack(side=tk.LEFT)
@@ -915,11 +1319,14 @@ class ShortcutLauncher:
         scrollbar.pack(side="right", fill="y")
 
         prefixes = self.load_prefixes()
+        self.live_servers = wineserver.scan()[0]
+        self.item_parent = scrollable_frame
+        self.item_frames = []
         if not prefixes:
             ttk.Label(scrollable_frame, text="No prefixes available.").pack(pady=10)
         else:
             for p in prefixes:
-                self._create_prefix_item(scrollable_frame, p)
+                self.item_frames.append((p, self._create_prefix_item(scrollable_frame, p)))
 
         ttk.Button(self.main_frame, text="Back", command=self.go_back).pack(pady=10)
 
@@ -1005,16 +1412,19 @@ class ShortcutLauncher:
         frame.pack(fill=tk.X, pady=5, padx=5)
 
         ttk.Label(frame, text=path, font=("Arial", 11)).pack(side=tk.LEFT, padx=5)
+        if wineserver.normalize_prefix(path) in self.live_servers:
+            ttk.Label(frame, text="wineserver running", foreground="gray").pack(side=tk.LEFT, padx=5)
 
         actions = ttk.Frame(frame)
         actions.pack(side=tk.RIGHT, padx=5)
         ttk.Button(actions, text="Edit", command=lambda: self.edit_prefix(path)).pack(side=tk.LEFT)
         ttk.Button(actions, text="Delete", command=lambda: self.delete_prefix(path)).pack(side=tk.LEFT, padx=3)
+        return frame
 
     def edit_prefix(self, prefix_path):
         edit_dialog = tk.Toplevel(self.root)
         edit_dialog.title("Edit Prefix")
-        edit_dialog.geometry("420x440")
+        edit_dialog.geometry("420x520")
         ttk.Label(edit_dialog, text=f"Prefix: {prefix_path}", style="Section.TLabel").pack(pady=8)
 
         # Selectable runner
@@ -1031,6 +1441,25 @@ class ShortcutLauncher:
             subprocess.run(["winetricks"], env={"WINEPREFIX": prefix_path, "WINE": runner,**os.environ}, check=True)
 
         ttk.Button(edit_dialog, text="Run Winetricks", command=run_tricks).pack(pady=8)
+
+        # Wineserver: keep it warm between launches, or stop it to free RAM
+        pool = wineserver.get_pool()
+        server_status = ttk.Label(edit_dialog)
+        server_status.pack(pady=(8, 0))
+        def show_server_status():
+            running = pool.is_running(prefix_path)
+            server_status.configure(text=f"Wineserver: {'running' if running else 'stopped'}")
+        def server_action(action):
+            if not action(prefix_path):
+                messagebox.showerror("Error", "wineserver command failed", parent=edit_dialog)
+            show_server_status()
+            if self.current_view == 'prefixes':
+                self.manage_prefixes()
+        server_btns = ttk.Frame(edit_dialog)
+        server_btns.pack(pady=4)
+        ttk.Button(server_btns, text="Prewarm", command=lambda: server_action(pool.prewarm)).pack(side=tk.LEFT, padx=2)
+        ttk.Button(server_btns, text="Stop", command=lambda: server_action(pool.stop)).pack(side=tk.LEFT, padx=2)
+        show_server_status()
         ttk.Button(edit_dialog, text="Install DXVK GPLAsync", command=lambda: self.install_dxvk_gplasync(prefix_path)).pack(pady=8)
 
         # Run custom script
@@ -1330,6 +1759,13 @@ class ShortcutLauncher:
         return updater.is_newer_version(new_version, current_version)
 
 if __name__ == "__main__":
+    if getattr(sys, 'frozen', False):
+        # PyInstaller builds: lets app.iconbatch start its worker processes
+        import multiprocessing
+        multiprocessing.freeze_support()
+    if os.getenv('BARREL_IMPORT_ONLY'):
+        # benchmarks/cold_start.py: stop once everything is imported
+        sys.exit(0)
     root = ThemedTk(theme="equilux")
     app = ShortcutLauncher(root)
     if len(sys.argv) > 1:
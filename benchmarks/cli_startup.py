@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Startup time of `barrel list` on a warm shortcut catalog.
+
+Creates a throwaway XDG tree with --shortcuts .desktop files, runs
+`barrel_cli.py list --json` once to build the catalog, then times --runs
+fresh interpreter starts. Fails (exit 1) when the median is over
+--budget milliseconds or when a GUI/network module was imported.
+
+    python benchmarks/cli_startup.py [--shortcuts 200] [--runs 20] [--budget 100]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = os.path.join(ROOT, 'barrel_cli.py')
+# Must never be imported by `barrel list`
+HEAVY = ('tkinter', 'ttkthemes', 'termuxgui', 'PIL', 'requests', 'urllib.request', 'concurrent.futures')
+
+
+def make_tree(base, count):
+    env = dict(os.environ, HOME=base,
+               XDG_DATA_HOME=os.path.join(base, 'data'),
+               XDG_CACHE_HOME=os.path.join(base, 'cache'),
+               XDG_CONFIG_HOME=os.path.join(base, 'config'))
+    apps = os.path.join(env['XDG_DATA_HOME'], 'applications', 'shortcuts')
+    templates = os.path.join(env['XDG_DATA_HOME'], 'shortcut_launcher', 'templates')
+    os.makedirs(apps)
+    os.makedirs(templates)
+    with open(os.path.join(templates, 'wine'), 'w') as f:
+        f.write('#!/bin/sh\nexport WINEPREFIX=~/.wine\ncd "$(dirname "$1")"\nwine "$1"\n')
+    for i in range(count):
+        with open(os.path.join(apps, f'game{i:04}.desktop'), 'w') as f:
+            f.write(f'[Desktop Entry]\nType=Application\nName=Game {i}\n'
+                    f'Exec=bash "{templates}/wine" "/games/game{i}/game.exe"\n'
+                    f'Icon=application-x-executable\nTerminal=false\n'
+                    f'X-Shortcut-Manager=Shortcut Launcher\n')
+    return env
+
+
+def timed(cmd, env=None):
+    """(milliseconds, CompletedProcess) of one run of cmd."""
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, check=True)
+    return (time.perf_counter() - start) * 1000, proc
+
+
+def run_list(env, python_args=()):
+    return timed([sys.executable, *python_args, CLI, 'list', '--json'], env)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time `barrel list` on a warm catalog.")
+    parser.add_argument('--shortcuts', type=int, default=200)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--budget', type=float, default=100.0, help="median limit in ms")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix='barrel-bench-') as base:
+        env = make_tree(base, args.shortcuts)
+        # Cold run: parses every .desktop file and writes the catalog
+        cold, proc = run_list(env)
+        listed = len(json.loads(proc.stdout))
+        times = sorted(run_list(env)[0] for _ in range(args.runs))
+        _, proc = run_list(env, ['-X', 'importtime'])
+        imported = {line.rsplit('|', 1)[-1].strip() for line in proc.stderr.splitlines() if '|' in line}
+        heavy = [m for m in HEAVY if m in imported]
+
+        baseline = [timed([sys.executable, '-c', 'pass'])[0] for _ in range(args.runs)]
+
+    median = statistics.median(times)
+    print(f"shortcuts listed: {listed}")
+    print(f"cold (builds catalog): {cold:.1f} ms")
+    print(f"warm: min {times[0]:.1f}  median {median:.1f}  max {times[-1]:.1f} ms  ({args.runs} runs)")
+    print(f"bare interpreter: median {statistics.median(baseline):.1f} ms")
+    if heavy:
+        print(f"FAIL: imported {', '.join(heavy)}")
+    if median > args.budget:
+        print(f"FAIL: median over the {args.budget:.0f} ms budget")
+    return 1 if heavy or median > args.budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
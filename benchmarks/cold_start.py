@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Cold-start time of the packaged builds, up to the point the UI would start.
+
+Runs each build with BARREL_IMPORT_ONLY=1, so the frontend exits right
+after its imports, and reports the first run (onefile extraction,
+bytecode not yet in the page cache) and the median of --runs warm runs:
+
+    onefile  dist/barrel_<frontend>             pyinstaller barrel_<frontend>.spec
+    onedir   dist/barrel/barrel-<frontend>      pyinstaller barrel_fast.spec
+    zipapp   python dist/barrel.pyz <frontend>  python build_zipapp.py
+    source   python barrel_<frontend>.py
+
+Builds that are missing are skipped. With --drop-caches (root only) the
+page cache is dropped before every first run; without it "first" is only
+cold for a build that has not been started since it was built.
+
+    python benchmarks/cold_start.py [--frontend native] [--runs 10] [--drop-caches]
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIST = os.path.join(ROOT, 'dist')
+
+
+def builds(frontend):
+    """(label, command) of every build of frontend found on disk."""
+    candidates = [
+        ('onefile', [os.path.join(DIST, f'barrel_{frontend}')]),
+        ('onedir', [os.path.join(DIST, 'barrel', f'barrel-{frontend}')]),
+        ('zipapp', [sys.executable, os.path.join(DIST, 'barrel.pyz'), frontend]),
+        ('source', [sys.executable, os.path.join(ROOT, f'barrel_{frontend}.py')]),
+    ]
+    for label, cmd in candidates:
+        target = cmd[1] if cmd[0] == sys.executable else cmd[0]
+        if os.path.isfile(target):
+            yield label, cmd
+        else:
+            print(f"{label}: skipped, {os.path.relpath(target, ROOT)} not found")
+
+
+def drop_caches():
+    subprocess.run(['sync'], check=False)
+    with open('/proc/sys/vm/drop_caches', 'w') as f:
+        f.write('3\n')
+
+
+def timed(cmd):
+    """Milliseconds of one run of cmd, or None when it failed."""
+    env = dict(os.environ, BARREL_IMPORT_ONLY='1')
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, env=env, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                          stderr=subprocess.PIPE, text=True)
+    elapsed = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        lines = proc.stderr.strip().splitlines()
+        print(f"  {' '.join(cmd)}: exit {proc.returncode}: {lines[-1] if lines else ''}")
+        return None
+    return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare cold start of the packaged builds.")
+    parser.add_argument('--frontend', choices=('native', 'x11'), default='native')
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--drop-caches', action='store_true', help="drop the page cache before each first run (root)")
+    args = parser.parse_args(argv)
+    if args.drop_caches and os.geteuid() != 0:
+        parser.error("--drop-caches needs root")
+
+    results = []
+    for label, cmd in builds(args.frontend):
+        if args.drop_caches:
+            drop_caches()
+        first = timed(cmd)
+        if first is None:
+            continue
+        warm = [timed(cmd) for _ in range(args.runs)]
+        if None in warm:
+            continue
+        results.append((label, first, statistics.median(warm), min(warm)))
+
+    if not results:
+        print("nothing to compare: build with the commands in this script's docstring")
+        return 1
+    baseline = dict((label, warm) for label, _, warm, _ in results).get('onefile')
+    print(f"\n{args.frontend}, {args.runs} warm runs:")
+    for label, first, warm, fastest in results:
+        versus = f"  ({warm / baseline:.2f}x onefile)" if baseline and label != 'onefile' else ''
+        print(f"{label:<8} first {first:8.1f} ms   warm median {warm:8.1f} ms   min {fastest:8.1f} ms{versus}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
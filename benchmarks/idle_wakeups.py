@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Idle CPU time and wakeups of a running frontend, from /proc.
+
+Start the frontend, leave it idle (or send it to the background), then:
+
+    python benchmarks/idle_wakeups.py [--pid PID | --name barrel_native] [--seconds 30]
+
+Reports CPU % and context switches per second summed over all threads
+of the process. Run it before and after a change to compare; the native
+frontend used to wake ten times a second for a getscrollposition() IPC
+call even when idle.
+"""
+import os
+import sys
+import time
+import argparse
+
+
+def find_pid(name):
+    """Lowest pid whose command line mentions name, other than this script."""
+    for entry in sorted(os.listdir('/proc'), key=lambda p: int(p) if p.isdigit() else 0):
+        if not entry.isdigit() or int(entry) == os.getpid():
+            continue
+        try:
+            with open(f'/proc/{entry}/cmdline', 'rb') as f:
+                argv = f.read().split(b'\0')
+        except OSError:
+            continue
+        if any(name.encode() in arg for arg in argv) and not any(b'idle_wakeups' in arg for arg in argv):
+            return int(entry)
+    return None
+
+
+def counters(pid):
+    """(cpu seconds, context switches) over the threads of pid."""
+    ticks = switches = 0
+    for tid in os.listdir(f'/proc/{pid}/task'):
+        try:
+            with open(f'/proc/{pid}/task/{tid}/stat') as f:
+                stat = f.read()
+            fields = stat[stat.rfind(')') + 2:].split()
+            ticks += int(fields[11]) + int(fields[12])
+            with open(f'/proc/{pid}/task/{tid}/status') as f:
+                for line in f:
+                    if line.startswith(('voluntary_ctxt_switches', 'nonvoluntary_ctxt_switches')):
+                        switches += int(line.split()[1])
+        except (OSError, ValueError, IndexError):
+            continue  # thread exited
+    return ticks / os.sysconf('SC_CLK_TCK'), switches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure idle CPU and wakeups of a process.")
+    parser.add_argument('--pid', type=int)
+    parser.add_argument('--name', default='barrel_native', help="find the process by command line")
+    parser.add_argument('--seconds', type=float, default=30.0)
+    args = parser.parse_args(argv)
+
+    pid = args.pid or find_pid(args.name)
+    if pid is None:
+        print(f"No process matching {args.name!r}")
+        return 2
+    threads = len(os.listdir(f'/proc/{pid}/task'))
+    cpu0, sw0 = counters(pid)
+    t0 = time.monotonic()
+    time.sleep(args.seconds)
+    cpu1, sw1 = counters(pid)
+    elapsed = time.monotonic() - t0
+    print(f"pid {pid}, {threads} threads, {elapsed:.1f} s")
+    print(f"CPU: {(cpu1 - cpu0) / elapsed * 100:.2f} %")
+    print(f"wakeups: {(sw1 - sw0) / elapsed:.1f} /s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
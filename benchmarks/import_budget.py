@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Cold import time of the GUI entry points, from `python -X importtime`.
+
+Each entry point module is imported (not run) in a fresh interpreter.
+Fails (exit 1) when one takes longer than --budget milliseconds, loads
+a module that should only load on first use (downloads, archives, batch
+jobs), or cannot be imported at all. A missing termuxgui or ttkthemes is
+replaced by the stand-ins in benchmarks/ui/stubs, which sit at the end
+of sys.path so installed packages still win; the report names them.
+
+    python benchmarks/import_budget.py [--budget 250] [--runs 5]
+"""
+import os
+import sys
+import argparse
+import statistics
+import importlib.util
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_POINTS = ('barrel_x11', 'barrel_native', 'app.cli')
+STUBS = os.path.join(ROOT, 'benchmarks', 'ui', 'stubs')
+# GUI toolkits the entry points import, replaced by STUBS when missing
+TOOLKITS = {'barrel_x11': 'ttkthemes', 'barrel_native': 'termuxgui'}
+# Loaded through app.lazy on first use only
+DEFERRED = ('requests', 'urllib.request', 'tarfile', 'zipfile', 'webbrowser',
+            'app.installers', 'app.updater', 'app.iconbatch')
+
+
+def import_times(module):
+    """Parse one cold import: ({module: self µs}, [(cumulative µs, top-level module)]).
+
+    Returns (None, error line) when the import fails.
+    """
+    code = f'import sys; sys.path.append({STUBS!r}); import {module}'
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    if proc.returncode != 0:
+        return None, proc.stderr.strip().splitlines()[-1]
+    times = {}
+    top = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or line.count('|') != 2:
+            continue
+        own, cumulative, name = line.split('|')
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        times[name.strip()] = int(own.split(':')[1])
+        # Nested imports are indented by two spaces per level
+        if not name.startswith('  '):
+            top.append((int(cumulative), name.strip()))
+    return times, top
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the cold import time of the entry points.")
+    parser.add_argument('--budget', type=float, default=250.0, help="limit per entry point in ms")
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for module in ENTRY_POINTS:
+        runs = [import_times(module) for _ in range(args.runs)]
+        if runs[0][0] is None:
+            print(f"{module}: FAIL: cannot be imported ({runs[0][1]})")
+            failed = True
+            continue
+        median = statistics.median(sum(us for us, _ in top) for _, top in runs) / 1000
+        times, top = runs[-1]
+        slowest = sorted(((us, name) for name, us in times.items()), reverse=True)[:5]
+        toolkit = TOOLKITS.get(module)
+        stub = f", with stub {toolkit}" if toolkit and importlib.util.find_spec(toolkit) is None else ''
+        print(f"{module}: {median:.1f} ms{stub}  (slowest on their own: "
+              + ', '.join(f"{name} {us / 1000:.1f}" for us, name in slowest) + ")")
+        deferred = [name for name in DEFERRED if name in times]
+        if deferred:
+            print(f"  FAIL: imported at startup: {', '.join(deferred)}")
+            failed = True
+        if median > args.budget:
+            print(f"  FAIL: over the {args.budget:.0f} ms budget")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""Headless UI benchmarks: scripted sessions against both frontends.
+
+`python -m benchmarks.ui` builds a throwaway XDG tree per item count and
+runs each frontend in a fresh interpreter:
+
+    native  ShortcutManager on fake_termuxgui, a recording termuxgui
+    tk      ShortcutLauncher on a real Tk under $DISPLAY or Xvfb, with its
+            Tcl commands counted and its modal dialogs answered by script
+
+Every scenario reports its wall time and the calls it made across the
+toolkit boundary: Termux:GUI messages (and how many waited for a reply),
+or Tcl commands for Tk.
+
+    python -m benchmarks.ui [--frontend native tk] [--items 10 100 5000] [--json FILE]
+"""
+import json
+import time
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+# Script and files every session uses
+SHORTCUT_NAME = 'BenchGame'
+PROGRAM = 'bench.sh'
+
+
+class Recorder:
+    """Counts of the calls made to the toolkit, per call name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = Counter()
+        self.replies = 0
+
+    def record(self, name, reply=False):
+        with self._lock:
+            self.calls[name] += 1
+            if reply:
+                self.replies += 1
+
+    def reset(self):
+        with self._lock:
+            self.calls = Counter()
+            self.replies = 0
+
+    def snapshot(self):
+        """{'calls', 'replies', 'methods'} since the last reset()."""
+        with self._lock:
+            return {'calls': sum(self.calls.values()), 'replies': self.replies,
+                    'methods': dict(self.calls.most_common())}
+
+
+class Report:
+    """Rows of {frontend, items, scenario, wall_ms, calls, replies, methods}."""
+
+    def __init__(self, frontend, items, recorder):
+        self.frontend = frontend
+        self.items = items
+        self.recorder = recorder
+        self.rows = []
+
+    @contextmanager
+    def scenario(self, name):
+        """Time the block and count its calls; the block may set row['wall_ms'] itself."""
+        row = {'frontend': self.frontend, 'items': self.items, 'scenario': name}
+        self.recorder.reset()
+        start = time.perf_counter()
+        yield row
+        row.setdefault('wall_ms', round((time.perf_counter() - start) * 1000, 1))
+        row.update(self.recorder.snapshot())
+        self.rows.append(row)
+
+    def save(self, path, skipped=None):
+        with open(path, 'w') as f:
+            json.dump({'rows': self.rows, 'skipped': skipped}, f)
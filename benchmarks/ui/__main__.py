@@ -0,0 +1,99 @@
+"""python -m benchmarks.ui: run the scripted sessions and print one table."""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+from benchmarks.cli_startup import make_tree, run_list
+from benchmarks.ui import PROGRAM
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+FRONTENDS = ('native', 'tk')
+
+
+def start_xvfb():
+    """(process, display) of a private Xvfb, or (None, None) when it is not installed."""
+    xvfb = shutil.which('Xvfb')
+    if xvfb is None:
+        return None, None
+    display = 100 + os.getpid() % 400
+    process = subprocess.Popen([xvfb, f':{display}', '-nolisten', 'tcp', '-screen', '0', '1280x800x24'],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 5
+    while not os.path.exists(f'/tmp/.X11-unix/X{display}') and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return process, f':{display}'
+
+
+def run_session(frontend, items, extra_env=None):
+    """(rows, reason skipped or None) of one session in a fresh tree and interpreter."""
+    with tempfile.TemporaryDirectory(prefix='barrel-ui-bench-') as base:
+        env = make_tree(base, items)
+        env.update(extra_env or {})
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [ROOT, os.getenv('PYTHONPATH')]))
+        with open(os.path.join(base, PROGRAM), 'w') as f:
+            f.write('#!/bin/sh\necho benchmark\n')
+        # Start from a warm catalog, like every start after the first
+        run_list(env)
+        output = os.path.join(base, 'report.json')
+        proc = subprocess.run([sys.executable, '-m', f'benchmarks.ui.{frontend}',
+                               '--items', str(items), '--output', output],
+                              cwd=ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                              text=True, timeout=600)
+        if proc.returncode != 0:
+            lines = proc.stderr.strip().splitlines()
+            return [], f"exit {proc.returncode}: {lines[-1] if lines else ''}"
+        with open(output) as f:
+            report = json.load(f)
+    return report['rows'], report['skipped']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.ui',
+                                     description="Scripted UI sessions: wall time and toolkit calls per scenario.")
+    parser.add_argument('--frontend', nargs='+', choices=FRONTENDS, default=list(FRONTENDS))
+    parser.add_argument('--items', nargs='+', type=int, default=[10, 100, 5000], help="shortcuts in the tree")
+    parser.add_argument('--json', metavar='FILE', help="also write every row, with per-call counts, to FILE")
+    args = parser.parse_args(argv)
+
+    xvfb = None
+    extra_env = {}
+    if 'tk' in args.frontend and not os.getenv('DISPLAY'):
+        xvfb, display = start_xvfb()
+        if display:
+            extra_env['DISPLAY'] = display
+    rows = []
+    failed = False
+    try:
+        for frontend in args.frontend:
+            for items in args.items:
+                found, skipped = run_session(frontend, items, extra_env)
+                rows += found
+                if skipped:
+                    print(f"{frontend} ({items} items): skipped, {skipped}")
+                    failed = failed or skipped.startswith('exit')
+                    break
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+
+    if rows:
+        print(f"{'frontend':<8} {'items':>6}  {'scenario':<20} {'wall ms':>9} {'calls':>7} {'replies':>8}")
+        for row in rows:
+            replies = row['replies'] if row['frontend'] == 'native' else '-'
+            print(f"{row['frontend']:<8} {row['items']:>6}  {row['scenario']:<20} {row['wall_ms']:>9.1f} "
+                  f"{row['calls']:>7} {replies:>8}")
+        print("calls: Termux:GUI messages (replies: those that wait for an answer) or Tcl commands")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(rows, f, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
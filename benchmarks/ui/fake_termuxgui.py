@@ -0,0 +1,315 @@
+"""Recording stand-in for the termuxgui package, for benchmarks only.
+
+Every call that the real library turns into a message to the Termux:GUI
+plugin is counted in RECORDER instead: creating a view and every getter
+wait for a reply (a round trip), setters are one-way. Nothing is drawn;
+views keep their text, list, visibility and scroll position so a script
+can find and click them.
+
+Events only come from the script: post() queues one for conn.events(),
+and wait_idle() returns once the app handled it and waits for the next
+one, in its main loop or in a dialog loop. finish() does not send
+destroy events.
+
+    import sys
+    from benchmarks.ui import fake_termuxgui
+    sys.modules['termuxgui'] = fake_termuxgui
+"""
+import time
+import threading
+
+from benchmarks.ui import Recorder
+
+# Page size reported by getdimensions(), in pixels
+SCREEN = (1080, 2000)
+
+RECORDER = Recorder()
+
+
+class Event:
+    click = 'click'
+    longClick = 'longClick'
+    focusChange = 'focusChange'
+    key = 'key'
+    touch = 'touch'
+    refresh = 'refresh'
+    selected = 'selected'
+    itemselected = 'itemselected'
+    text = 'text'
+    back = 'back'
+    create = 'create'
+    start = 'start'
+    resume = 'resume'
+    pause = 'pause'
+    stop = 'stop'
+    destroy = 'destroy'
+
+    def __init__(self, type, value):
+        self.type = type
+        self.value = value
+
+
+class Connection:
+    def __init__(self):
+        self.activities = []
+        self.toasts = []
+        self._inbox = []
+        self._cond = threading.Condition()
+        self._waiting = 0
+        self._closed = False
+
+    def __enter__(self):
+        RECORDER.record('Connection', reply=True)
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def events(self):
+        while True:
+            with self._cond:
+                self._waiting += 1
+                self._cond.notify_all()
+                while not self._inbox and not self._closed:
+                    self._cond.wait()
+                self._waiting -= 1
+                if self._closed:
+                    return
+                event = self._inbox.pop(0)
+            yield event
+
+    # Script side
+
+    def post(self, type, value):
+        with self._cond:
+            self._inbox.append(Event(type, value))
+            self._cond.notify_all()
+
+    def wait_idle(self, timeout=60):
+        """Wait until every posted event was handled and a loop waits for more."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._inbox or not self._waiting:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    raise TimeoutError("the app did not go back to its event loop")
+                self._cond.wait(left)
+
+    def click(self, view):
+        self.post(Event.click, {'aid': view.a.aid, 'id': view.id})
+
+    def top(self):
+        """The newest activity that is not finished."""
+        return next(a for a in reversed(self.activities) if not a.finished)
+
+    def find(self, text=None, cls=None, activity=None):
+        """First view of activity (default: top()) with this text and/or class."""
+        activity = activity or self.top()
+        for view in activity.views.values():
+            if (text is None or getattr(view, 'text', None) == text) and (cls is None or isinstance(view, cls)):
+                return view
+        raise LookupError(f"no {cls.__name__ if cls else 'view'} {text!r} in activity {activity.aid}")
+
+
+class Activity:
+    _ids = iter(range(1, 1 << 30))
+
+    def __init__(self, c, tid=None, dialog=False, **kwargs):
+        RECORDER.record('Activity', reply=True)
+        self.c = c
+        self.aid = next(Activity._ids)
+        self.t = tid
+        self.dialog = dialog
+        self.finished = False
+        self.views = {}         # id -> view, in creation order
+        c.activities.append(self)
+
+    def finish(self):
+        RECORDER.record('finish')
+        self.finished = True
+
+    def __getattr__(self, name):
+        # Other one-way activity calls (settheme, keepscreenon, ...)
+        if name.startswith(('set', 'intercept', 'keep', 'hide')):
+            return lambda *args, **kwargs: RECORDER.record(name)
+        raise AttributeError(name)
+
+
+class View:
+    VISIBLE = 0
+    INVISIBLE = 1
+    GONE = 2
+    MATCH_PARENT = -1
+    WRAP_CONTENT = -2
+
+    _ids = iter(range(1, 1 << 30))
+
+    def __init__(self, activity, parent=None):
+        RECORDER.record(type(self).__name__, reply=True)
+        self.a = activity
+        self.id = next(View._ids)
+        self.parent = parent
+        self.children = {}
+        self.visibility = View.VISIBLE
+        self.deleted = False
+        activity.views[self.id] = self
+        if parent is not None:
+            parent.children[self.id] = self
+
+    # termuxgui compares views with the ids in event values
+    def __eq__(self, other):
+        if isinstance(other, View):
+            return self.id == other.id
+        if isinstance(other, int):
+            return self.id == other
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def delete(self):
+        RECORDER.record('delete')
+        self.deleted = True
+        self.a.views.pop(self.id, None)
+        if self.parent is not None:
+            self.parent.children.pop(self.id, None)
+
+    def getdimensions(self):
+        RECORDER.record('getdimensions', reply=True)
+        return list(SCREEN)
+
+    def setvisibility(self, visibility):
+        RECORDER.record('setvisibility')
+        self.visibility = visibility
+
+    def __getattr__(self, name):
+        # One-way calls the benchmarks do not need to model
+        # (setmargin, setwidth, setheight, sendclickevent, ...)
+        if name.startswith(('set', 'send', 'focus')):
+            return lambda *args, **kwargs: RECORDER.record(name)
+        raise AttributeError(name)
+
+
+class ViewGroup(View):
+    def clearchildren(self):
+        RECORDER.record('clearchildren')
+        for child in self.children.values():
+            child.deleted = True
+            self.a.views.pop(child.id, None)
+        self.children.clear()
+
+
+class LinearLayout(ViewGroup):
+    def __init__(self, activity, parent=None, vertical=True):
+        super().__init__(activity, parent)
+        self.vertical = vertical
+
+
+class RadioGroup(ViewGroup):
+    pass
+
+
+class _ScrollView(ViewGroup):
+    def __init__(self, activity, parent=None, fillviewport=False, snapping=False, nobar=False):
+        super().__init__(activity, parent)
+        self.position = [0, 0]
+
+    def getscrollposition(self):
+        RECORDER.record('getscrollposition', reply=True)
+        return list(self.position)
+
+    def setscrollposition(self, x, y, smooth=False):
+        RECORDER.record('setscrollposition')
+        self.position = [x, y]
+
+
+class NestedScrollView(_ScrollView):
+    pass
+
+
+class HorizontalScrollView(_ScrollView):
+    pass
+
+
+class TextView(View):
+    def __init__(self, activity, text, parent=None, **kwargs):
+        super().__init__(activity, parent)
+        self.text = text
+
+    def settext(self, text):
+        RECORDER.record('settext')
+        self.text = text
+
+    def gettext(self):
+        RECORDER.record('gettext', reply=True)
+        return self.text
+
+
+class Button(TextView):
+    pass
+
+
+class EditText(TextView):
+    pass
+
+
+class Checkbox(TextView):
+    def __init__(self, activity, text, parent=None, checked=False):
+        super().__init__(activity, text, parent)
+        self.checked = checked
+
+    def setchecked(self, checked):
+        RECORDER.record('setchecked')
+        self.checked = checked
+
+
+class RadioButton(Checkbox):
+    pass
+
+
+class _ListView(View):
+    def __init__(self, activity, parent=None):
+        super().__init__(activity, parent)
+        self.list = []
+        self.selected = 0
+
+    def setlist(self, items):
+        RECORDER.record('setlist')
+        self.list = list(items)
+
+
+class Spinner(_ListView):
+    def getselected(self):
+        RECORDER.record('getselected', reply=True)
+        return self.list[self.selected] if self.list else None
+
+
+class TabLayout(_ListView):
+    def selecttab(self, index):
+        RECORDER.record('selecttab')
+        self.selected = index
+
+
+class ImageView(View):
+    def setimage(self, data):
+        RECORDER.record('setimage')
+
+
+class ProgressBar(View):
+    def setprogress(self, progress):
+        RECORDER.record('setprogress')
+
+
+class Toast:
+    def __init__(self, c, text, long=False):
+        self.c = c
+        self.text = text
+
+    def show(self):
+        RECORDER.record('Toast')
+        self.c.toasts.append(self.text)
@@ -0,0 +1,125 @@
+"""One scripted ShortcutManager session on fake_termuxgui (run by benchmarks.ui).
+
+Expects HOME and the XDG variables to point at a tree made by
+benchmarks.ui; writes the Report to --output.
+"""
+import os
+import sys
+import time
+import queue
+import argparse
+import threading
+
+from benchmarks.ui import Report, SHORTCUT_NAME, PROGRAM, fake_termuxgui as tg
+
+sys.modules['termuxgui'] = tg
+import barrel_native  # noqa: E402  (needs the fake in place)
+from app import shortcuts, watcher  # noqa: E402
+
+# Watcher debounce plus margin: changes on disk are picked up before the next scenario
+SETTLE = 0.5
+
+
+class Session(barrel_native.ShortcutManager):
+    """ShortcutManager that hands itself to the script once its event loop starts."""
+
+    handle = queue.Queue()
+
+    def _event_loop(self):
+        Session.handle.put(self)
+        super()._event_loop()
+
+
+def settle(app):
+    """Let background refreshes (watcher, idle fill) finish."""
+    time.sleep(SETTLE)
+    with app.lock:
+        pass
+    app.conn.wait_idle()
+
+
+def run(report):
+    with report.scenario('startup'):
+        threading.Thread(target=Session, daemon=True).start()
+        app = Session.handle.get(timeout=60)
+        conn = app.conn
+        conn.wait_idle()
+    main = app.activity
+
+    with report.scenario('idle fill') as row:
+        while 'all_tabs' not in app.startup.marks:
+            time.sleep(0.005)
+        marks = app.startup.marks
+        row['wall_ms'] = round(marks['all_tabs'] - marks['interactive'] - barrel_native.IDLE_LOAD_DELAY * 1000, 1)
+    settle(app)
+
+    with report.scenario('tab switches (4)'):
+        for tab in (1, 2, 3, 0):
+            conn.post(tg.Event.itemselected, {'aid': main.aid, 'id': app.tabs.id, 'selected': tab})
+            conn.wait_idle()
+
+    with report.scenario('refresh (no change)'):
+        # What the UI worker does for a launch or queue change
+        with app.lock:
+            app._refresh_content({'shortcuts'})
+            app._update_buttons()
+
+    with report.scenario('sampler tick'):
+        # What the UI worker does every sampler_interval while a game runs
+        with app.lock:
+            app._relabel_shortcuts()
+
+    # Another frontend renames one shortcut
+    name, path = app.shortcuts[len(app.shortcuts) // 2]
+    shortcuts.set_desktop_keys(path, {'Name': f'{name} (renamed)'})
+    with report.scenario('external change'):
+        # What the UI worker does for the watcher event
+        with app.lock:
+            app._apply_changes([watcher.ChangeEvent(watcher.MODIFIED, 'shortcuts', os.path.basename(path))])
+            app._update_buttons()
+    settle(app)
+
+    with report.scenario('create shortcut'):
+        conn.click(conn.find('+ Shortcut', activity=main))
+        conn.wait_idle()
+        conn.find(cls=tg.EditText).text = SHORTCUT_NAME
+        conn.click(conn.find('OK'))
+        conn.wait_idle()
+        conn.click(conn.find(PROGRAM))          # file explorer, in $HOME
+        conn.wait_idle()
+        conn.click(conn.find('OK'))             # template: none
+        conn.wait_idle()
+        conn.click(conn.find('OK'))             # "Shortcut created"
+        conn.wait_idle()
+    conn.find(SHORTCUT_NAME, tg.Button, main)
+    settle(app)
+
+    with report.scenario('delete shortcut'):
+        conn.click(conn.find(SHORTCUT_NAME, tg.Button, main))
+        conn.wait_idle()
+        conn.click(conn.find('Delete', tg.Button, main))
+        conn.wait_idle()
+
+    with report.scenario('own write echo'):
+        # The watcher event that follows the delete
+        with app.lock:
+            app._apply_changes([watcher.ChangeEvent(watcher.REMOVED, 'shortcuts', f'{SHORTCUT_NAME}.desktop')])
+    settle(app)
+
+    conn.post(tg.Event.destroy, {'aid': main.aid})
+    conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--items', type=int, required=True)
+    parser.add_argument('--output', required=True)
+    args = parser.parse_args(argv)
+    report = Report('native', args.items, tg.RECORDER)
+    run(report)
+    report.save(args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,10 @@
+"""Stand-in termuxgui for machines without it: the recording fake.
+
+Only on sys.path when the real package is missing (see
+benchmarks/import_budget.py).
+"""
+import sys
+
+from benchmarks.ui import fake_termuxgui
+
+sys.modules[__name__] = fake_termuxgui
@@ -0,0 +1,25 @@
+"""Stand-in ttkthemes for machines without it: plain Tk with ttk's own themes.
+
+Only on sys.path when the real package is missing (see
+benchmarks/import_budget.py).
+"""
+import tkinter as tk
+from tkinter import ttk
+
+# Built-in theme used for every ttkthemes theme name
+FALLBACK = 'clam'
+
+
+class ThemedStyle(ttk.Style):
+    def set_theme(self, theme_name):
+        self.theme_use(FALLBACK)
+
+
+class ThemedTk(tk.Tk):
+    def __init__(self, *args, theme=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if theme:
+            ThemedStyle(self).set_theme(theme)
+
+    def set_theme(self, theme_name):
+        ThemedStyle(self).set_theme(theme_name)
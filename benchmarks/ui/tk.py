@@ -0,0 +1,132 @@
+"""One scripted ShortcutLauncher session on Tk (run by benchmarks.ui).
+
+Needs a display ($DISPLAY, or the Xvfb started by benchmarks.ui) and
+ttkthemes. Every Tcl command the app runs is counted: the Tcl interpreter
+is wrapped as soon as Tk creates it, so the theme setup counts too. The
+modal dialogs of the create flow are answered by script. Expects HOME and
+the XDG variables to point at a tree made by benchmarks.ui; writes the
+Report to --output.
+"""
+import os
+import sys
+import time
+import argparse
+
+from benchmarks.ui import Recorder, Report, SHORTCUT_NAME, PROGRAM
+
+RECORDER = Recorder()
+SETTLE = 0.5
+
+
+class CountingTcl:
+    """Proxy of a Tcl interpreter that counts the commands run through it."""
+
+    def __init__(self, tcl):
+        self.raw = tcl
+
+    def call(self, *args):
+        # Widgets pass their whole command as one tuple
+        words = args[0] if len(args) == 1 and isinstance(args[0], tuple) else args
+        name = str(words[0]) if words else 'call'
+        if name.startswith('.') and len(words) > 1:
+            name = f'<widget> {words[1]}'
+        RECORDER.record(name)
+        return self.raw.call(*args)
+
+    def eval(self, script):
+        RECORDER.record('eval')
+        return self.raw.eval(script)
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+
+def count_tcl_calls():
+    import _tkinter
+    create = _tkinter.create
+    _tkinter.create = lambda *args: CountingTcl(create(*args))
+
+
+def update(root):
+    """Process pending events and idle tasks without counting the harness' own call."""
+    root.tk.raw.call('update')
+
+
+def script_dialogs(x11):
+    """Answer the modal dialogs the session opens."""
+    x11.simpledialog.askstring = lambda title, prompt, **kwargs: SHORTCUT_NAME
+    x11.messagebox.showinfo = lambda *args, **kwargs: 'ok'
+    x11.messagebox.showwarning = lambda *args, **kwargs: 'ok'   # no runners installed
+
+
+def close_dialog(root, tk):
+    """Close the template chooser (a Toplevel in wait_window) once it is open."""
+    dialogs = [w for w in root.winfo_children() if isinstance(w, tk.Toplevel)]
+    if dialogs:
+        dialogs[-1].destroy()
+    else:
+        root.after(10, close_dialog, root, tk)
+
+
+def run(report):
+    import tkinter as tk
+    count_tcl_calls()
+    import barrel_x11 as x11
+    from ttkthemes import ThemedTk
+    script_dialogs(x11)
+
+    with report.scenario('startup'):
+        root = ThemedTk(theme="equilux")
+        app = x11.ShortcutLauncher(root)
+        update(root)
+
+    with report.scenario('open shortcuts'):
+        app.list_shortcuts()
+        update(root)
+
+    with report.scenario('tab switches (4)'):
+        for view in (app.manage_prefixes, app.list_templates, app.go_back, app.list_shortcuts):
+            view()
+            update(root)
+
+    with report.scenario('refresh (no change)'):
+        app.refresh_shortcuts()
+        update(root)
+
+    with report.scenario('create shortcut'):
+        root.after_idle(close_dialog, root, tk)
+        app.add_shortcut(preselected_path=os.path.join(os.path.expanduser('~'), PROGRAM))
+        update(root)
+    time.sleep(SETTLE)
+    update(root)
+
+    with report.scenario('delete shortcut'):
+        app.delete_shortcut(f'{SHORTCUT_NAME}.desktop')
+        update(root)
+
+    root.destroy()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--items', type=int, required=True)
+    parser.add_argument('--output', required=True)
+    args = parser.parse_args(argv)
+    report = Report('tk', args.items, RECORDER)
+    try:
+        import tkinter
+        run(report)
+    except ImportError as e:
+        report.save(args.output, skipped=str(e))
+        return 0
+    except tkinter.TclError as e:
+        if report.rows:
+            raise
+        report.save(args.output, skipped=f"no display: {e}")
+        return 0
+    report.save(args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/data/data/com.termux/files/usr/bin/env python3
+"""Build dist/barrel.pyz: both frontends and the CLI in one zip application.
+
+The archive holds app/ and the three entry scripts once, as -OO bytecode
+with unchecked hashes and no sources, stored uncompressed, so starting it
+neither compiles, stats source files nor inflates anything. The bytecode
+only fits the Python that built it: build on the device that runs it.
+
+    python build_zipapp.py [--output dist/barrel.pyz] [--python PATH]
+
+Run it as `barrel.pyz x11`, `barrel.pyz native` or `barrel.pyz [cli] ...`,
+or through symlinks named barrel-x11, barrel-native and barrel. Tkinter,
+ttkthemes, termuxgui, Pillow and requests come from the installed Python.
+"""
+import os
+import sys
+import stat
+import argparse
+import zipfile
+import tempfile
+import py_compile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS = ('barrel_x11.py', 'barrel_native.py', 'barrel_cli.py')
+SHEBANG = '/data/data/com.termux/files/usr/bin/env python3'
+
+MAIN = '''\
+import os
+import sys
+import runpy
+
+FRONTENDS = {'x11': 'barrel_x11', 'native': 'barrel_native', 'cli': 'barrel_cli'}
+
+
+def frontend():
+    """Module to run, from the name it was started as or its first argument."""
+    name = os.path.basename(sys.argv[0])
+    for key in ('x11', 'native'):
+        if key in name:
+            return FRONTENDS[key]
+    if len(sys.argv) > 1 and sys.argv[1] in FRONTENDS:
+        return FRONTENDS[sys.argv.pop(1)]
+    return FRONTENDS['cli']
+
+
+runpy.run_module(frontend(), run_name='__main__', alter_sys=True)
+'''
+
+
+def payload():
+    """(archive name, source path) of every module to ship."""
+    for script in SCRIPTS:
+        yield script[:-3] + '.pyc', os.path.join(ROOT, script)
+    app_dir = os.path.join(ROOT, 'app')
+    for name in sorted(os.listdir(app_dir)):
+        if name.endswith('.py'):
+            yield f'app/{name[:-3]}.pyc', os.path.join(app_dir, name)
+
+
+def compiled(source, name, tmp):
+    """-OO bytecode of source, whose tracebacks show name."""
+    target = os.path.join(tmp, 'module.pyc')
+    py_compile.compile(source, cfile=target, dfile=name, doraise=True, optimize=2,
+                       invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH)
+    with open(target, 'rb') as f:
+        return f.read()
+
+
+def build(output, python=SHEBANG):
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix='barrel-zipapp-') as tmp:
+        main = os.path.join(tmp, '__main__.py')
+        with open(main, 'w') as f:
+            f.write(MAIN)
+        files = [('__main__.pyc', main)] + list(payload())
+        with open(output, 'wb') as f:
+            f.write(f'#!{python}\n'.encode())
+            with zipfile.ZipFile(f, 'w', zipfile.ZIP_STORED) as zf:
+                for name, source in files:
+                    zf.writestr(name, compiled(source, name[:-1], tmp))
+    os.chmod(output, os.stat(output).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return len(files)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the Barrel zip application.")
+    parser.add_argument('--output', default=os.path.join(ROOT, 'dist', 'barrel.pyz'))
+    parser.add_argument('--python', default=SHEBANG, help="interpreter for the #! line")
+    args = parser.parse_args(argv)
+    count = build(args.output, args.python)
+    print(f"{args.output}: {count} modules, {os.path.getsize(args.output) // 1024} KiB "
+          f"for Python {sys.version_info.major}.{sys.version_info.minor}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -13,6 +13,7 @@ echo "Created installation directory: $INSTALL_DIR"
 # 2. Copy application files
 cp barrel_x11.py "$INSTALL_DIR/"
 cp barrel_native.py "$INSTALL_DIR/"
+cp barrel_cli.py "$INSTALL_DIR/"
 cp -r app "$INSTALL_DIR/"
 cp main.sh "$INSTALL_DIR/" # Copy main.sh as well, it might be useful
 
@@ -21,6 +22,7 @@ echo "Copied application files to $INSTALL_DIR"
 # 3. Make main scripts executable
 chmod +x "$INSTALL_DIR/barrel_x11.py"
 chmod +x "$INSTALL_DIR/barrel_native.py"
+chmod +x "$INSTALL_DIR/barrel_cli.py"
 chmod +x "$INSTALL_DIR/main.sh" # Make the shell script executable too
 
 echo "Made main scripts executable."
@@ -31,8 +33,9 @@ if [ -w "$BIN_DIR" ]; then # Check if BIN_DIR is writable
     ln -sf "$INSTALL_DIR/barrel_x11.py" "$BIN_DIR/barrel-x11"
     ln -sf "$INSTALL_DIR/barrel_native.py" "$BIN_DIR/barrel-native"
     ln -sf "$INSTALL_DIR/main.sh" "$BIN_DIR/barrel-cli" # Symlink for the shell script
+    ln -sf "$INSTALL_DIR/barrel_cli.py" "$BIN_DIR/barrel" # Scriptable command line
     echo "Created symlinks in $BIN_DIR. Make sure $BIN_DIR is in your PATH."
-    echo "You can run the app using 'barrel-x11', 'barrel-native', or 'barrel-cli'."
+    echo "You can run the app using 'barrel-x11', 'barrel-native', 'barrel-cli' or 'barrel'."
 else
     echo "Warning: Cannot create symlinks in $BIN_DIR (not writable). You can run the app directly from $INSTALL_DIR."
 fi
@@ -49,6 +52,7 @@ echo "Installation complete!"
 echo "To run the X11 (GUI) version: python $INSTALL_DIR/barrel_x11.py"
 echo "To run the native (Termux GUI) version: python $INSTALL_DIR/barrel_native.py"
 echo "To run the CLI version: $INSTALL_DIR/main.sh"
+echo "To script it (list, run, create, delete, prefixes, templates; --json): python $INSTALL_DIR/barrel_cli.py --help"
 echo ""
 echo "If you created symlinks, you can also use 'barrel-x11', 'barrel-native', or 'barrel-cli' from any directory."
 echo "Ensure $HOME/bin is in your PATH for symlinks to work."
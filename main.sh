@@ -1,5 +1,6 @@
 #!/data/data/com.termux/files/usr/bin/bash
 
+APP_DIR="$(dirname "$(readlink -f "$0")")"
 SHORTCUTS="$HOME/shortcuts"
 TEMPLATES="$HOME/shortcut_templates"
 mkdir -p "$SHORTCUTS" "$TEMPLATES"
@@ -62,7 +63,7 @@ run_shortcut() {
 	if command -v desktop-file-launch >/dev/null 2>&1; then
 		gtk-launch "$DESKTOP_DIR/$SHORT"
 	else
-		bash "$DESKTOP_DIR/$SHORT"
+		PYTHONPATH="$APP_DIR${PYTHONPATH:+:$PYTHONPATH}" python3 -m app.desktop_exec "$DESKTOP_DIR/$SHORT"
 	fi
 }
 
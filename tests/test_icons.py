@@ -0,0 +1,70 @@
+"""app.icons thumbnail cache accounting; _render is replaced so Pillow is not needed."""
+import os
+
+import pytest
+
+from app import icons
+
+THUMB_BYTES = 1000
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """List of evict() budgets, with a 10-thumbnail cache in tmp_path."""
+    monkeypatch.setattr(icons, 'ICONS_CACHE_DIR', tmp_path / 'icons')
+    monkeypatch.setattr(icons, '_cache_bytes', None)
+    monkeypatch.setattr(icons, '_cache_budget', 10 * THUMB_BYTES)
+
+    def render(src, dst, size):
+        dst.write_bytes(b'\0' * THUMB_BYTES)
+        return True
+
+    calls = []
+    evict = icons.evict
+
+    def counting_evict(budget=None):
+        calls.append(budget)
+        evict(budget)
+
+    monkeypatch.setattr(icons, '_render', render)
+    monkeypatch.setattr(icons, 'evict', counting_evict)
+    return calls
+
+
+def sources(tmp_path, count):
+    paths = []
+    for n in range(count):
+        path = tmp_path / f'{n}.png'
+        path.write_bytes(str(n).encode())
+        paths.append(str(path))
+    return paths
+
+
+def test_cache_is_scanned_once_per_overflow(tmp_path, cache):
+    for src in sources(tmp_path, 30):
+        assert icons.thumbnail(src)
+    # One scan to learn the size, then one each time a render goes over budget
+    assert cache == [10000] + [7500] * 5
+    assert len(os.listdir(icons.ICONS_CACHE_DIR)) <= 10
+
+
+def test_hits_do_not_evict(tmp_path, cache):
+    src, = sources(tmp_path, 1)
+    first = icons.thumbnail(src)
+    assert icons.thumbnail(src) == first
+    assert cache == [10000]
+
+
+def test_failed_save_leaves_no_temporary_file(tmp_path, monkeypatch):
+    pil = pytest.importorskip('PIL.Image')
+    src = tmp_path / 'icon.png'
+    pil.new('RGBA', (64, 64)).save(src)
+
+    def save(self, fp, *args, **kwargs):
+        open(fp, 'wb').close()
+        raise OSError('disk full')
+
+    monkeypatch.setattr(pil.Image, 'save', save)
+    dst = tmp_path / 'thumb.png'
+    assert not icons._render(str(src), dst, 32)
+    assert os.listdir(tmp_path) == ['icon.png']
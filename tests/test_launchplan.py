@@ -0,0 +1,63 @@
+"""app.launchplan template compilation and the supervisor's post-run actions."""
+import time
+
+import pytest
+
+from app import launchplan
+from app.supervisor import Supervisor
+
+GAME = '/games/My Game/game.exe'
+# No PATH: resolve() keeps the runner name as written
+ENV = {'HOME': '/home/u'}
+
+
+def resolve(text, args=(GAME,)):
+    return launchplan.compile_template(text, list(args)).resolve(ENV)
+
+
+def test_runner_after_exports_and_cd():
+    plan = launchplan.compile_template(
+        'export WINEPREFIX=~/.wine\ncd "$(dirname "$1")"\nwine "$1"\nwineserver -k\n', [GAME])
+    argv, env, cwd = plan.resolve(ENV)
+    assert argv == ['wine', GAME]
+    assert env['WINEPREFIX'] == '/home/u/.wine'
+    assert plan.cwd == 'dirname_arg'
+    assert plan.post_actions == ['wineserver -k']
+    assert not plan.background
+
+
+def test_background_runner():
+    plan = launchplan.compile_template('box64 wine "$1" &\nnotify-send done\n', [GAME])
+    assert plan.background
+    assert plan.post_actions == ['notify-send done']
+
+
+def test_runner_with_all_arguments():
+    argv, _, _ = resolve('box64 "$@"', [GAME, '-windowed'])
+    assert argv == ['box64', GAME, '-windowed']
+
+
+@pytest.mark.parametrize('text', [
+    'echo starting\nwine "$1"',
+    'export A=1\nsleep 1\nwine "$1"',
+    'wine game.exe',
+])
+def test_command_before_runner_needs_a_shell(text):
+    with pytest.raises(launchplan.Unsupported):
+        launchplan.compile_template(text, [GAME])
+
+
+@pytest.mark.parametrize('text', ['wine $@', 'wine "$*"', 'wine "$1" | tee log'])
+def test_unsupported_syntax(text):
+    with pytest.raises(launchplan.Unsupported):
+        launchplan.compile_template(text, [GAME])
+
+
+def test_post_actions_get_the_arguments(tmp_path):
+    out = tmp_path / 'out'
+    sup = Supervisor(history_file=tmp_path / 'history.json')
+    sup.launch('game.desktop', ['true'], post_actions=[f'echo "$1" > "{out}"'], post_args=[GAME])
+    deadline = time.monotonic() + 5
+    while sup.is_running('game.desktop') and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert out.read_text() == GAME + '\n'
@@ -0,0 +1,225 @@
+"""app.peicon against small PE32/PE32+ images generated here."""
+import struct
+import zlib
+
+import pytest
+
+from app import peicon
+
+SECTION_RVA = 0x1000
+SECTION_RAW = 0x200
+RT_VERSION = 16
+
+
+def resource_section(resources):
+    """.rsrc contents for {type: {id: data}}, with one language per resource."""
+    types = sorted(resources)
+    leaves = [(t, rid) for t in types for rid in sorted(resources[t])]
+    root_size = 16 + 8 * len(types)
+    type_at, pos = {}, root_size
+    for t in types:
+        type_at[t] = pos
+        pos += 16 + 8 * len(resources[t])
+    lang_at = {}
+    for leaf in leaves:
+        lang_at[leaf] = pos
+        pos += 16 + 8
+    entry_at = {}
+    for leaf in leaves:
+        entry_at[leaf] = pos
+        pos += 16
+    data_at = {}
+    for t, rid in leaves:
+        data_at[t, rid] = pos
+        pos += (len(resources[t][rid]) + 3) & ~3
+
+    out = bytearray(pos)
+
+    def directory(at, entries):
+        struct.pack_into('<IIHHHH', out, at, 0, 0, 0, 0, 0, len(entries))
+        for i, (rid, target, is_dir) in enumerate(entries):
+            struct.pack_into('<II', out, at + 16 + i * 8, rid, target | (0x80000000 if is_dir else 0))
+
+    directory(0, [(t, type_at[t], True) for t in types])
+    for t in types:
+        directory(type_at[t], [(rid, lang_at[t, rid], True) for rid in sorted(resources[t])])
+    for leaf in leaves:
+        directory(lang_at[leaf], [(0x409, entry_at[leaf], False)])
+        data = resources[leaf[0]][leaf[1]]
+        struct.pack_into('<IIII', out, entry_at[leaf], SECTION_RVA + data_at[leaf], len(data), 0, 0)
+        out[data_at[leaf]:data_at[leaf] + len(data)] = data
+    return bytes(out)
+
+
+def pe_image(resources=None, plus=False):
+    """A minimal PE32 (or PE32+) file whose only section holds the resources."""
+    rsrc = resource_section(resources) if resources else b''
+    magic, dirs_at = (0x20b, 108) if plus else (0x10b, 92)
+    opt_size = dirs_at + 4 + 16 * 8
+    pe = 0x40
+    out = bytearray(SECTION_RAW + len(rsrc))
+    out[:2] = b'MZ'
+    struct.pack_into('<I', out, 0x3C, pe)
+    out[pe:pe + 4] = b'PE\0\0'
+    struct.pack_into('<HHIIIHH', out, pe + 4, 0x8664 if plus else 0x14c, 1, 0, 0, 0, opt_size, 0x102)
+    opt = pe + 24
+    struct.pack_into('<H', out, opt, magic)
+    struct.pack_into('<I', out, opt + dirs_at, 16)
+    if rsrc:
+        struct.pack_into('<II', out, opt + dirs_at + 4 + 2 * 8, SECTION_RVA, len(rsrc))
+    sec = opt + opt_size
+    out[sec:sec + 8] = b'.rsrc\0\0\0'
+    struct.pack_into('<IIII', out, sec + 8, len(rsrc), SECTION_RVA, len(rsrc), SECTION_RAW)
+    out[SECTION_RAW:] = rsrc
+    return bytes(out)
+
+
+def dib(width, height, bpp, pixels, palette=(), mask_rows=()):
+    """BITMAPINFOHEADER icon image; pixels[y][x] is BGRA (32 bpp) or a palette index (8 bpp).
+
+    Rows are top-down here; mask_rows are made transparent through the AND mask.
+    """
+    header = struct.pack('<IiiHHIIiiII', 40, width, height * 2, 1, bpp, 0, 0, 0, 0, len(palette), 0)
+    colors = b''.join(bytes((b, g, r, 0)) for r, g, b in palette)
+    stride = ((width * bpp + 31) // 32) * 4
+    body = b''
+    for row in reversed(pixels):
+        raw = b''.join(bytes(p) for p in row) if bpp == 32 else bytes(row)
+        body += raw.ljust(stride, b'\0')
+    mask_stride = ((width + 31) // 32) * 4
+    mask = b''
+    for y in reversed(range(height)):
+        mask += (b'\xff' * ((width + 7) // 8) if y in mask_rows else b'').ljust(mask_stride, b'\0')
+    return header + colors + body + mask
+
+
+def icon_group(entries):
+    """RT_GROUP_ICON for [(size, bpp, RT_ICON id)]."""
+    out = struct.pack('<HHH', 0, 1, len(entries))
+    for size, bpp, rid in entries:
+        out += struct.pack('<BBBBHHIH', size % 256, size % 256, 0, 0, 1, bpp, 0, rid)
+    return out
+
+
+def solid(size, bgra):
+    return [[bgra] * size for _ in range(size)]
+
+
+def png_pixels(path):
+    """(width, height, [RGBA tuples]) of a PNG written by extract_icon."""
+    try:
+        from PIL import Image
+    except ImportError:
+        Image = None
+    if Image is not None:
+        with Image.open(path) as img:
+            img = img.convert('RGBA')
+            return img.width, img.height, list(img.getdata())
+    # Without Pillow the file comes from peicon._encode_png: one IDAT, filter 0
+    data = open(path, 'rb').read()
+    assert data[:8] == peicon.PNG_SIGNATURE
+    width, height = struct.unpack_from('>II', data, 16)
+    idat = data.index(b'IDAT')
+    length = struct.unpack_from('>I', data, idat - 4)[0]
+    raw = zlib.decompress(data[idat + 4:idat + 4 + length])
+    stride = width * 4 + 1
+    pixels = []
+    for y in range(height):
+        row = raw[y * stride + 1:(y + 1) * stride]
+        pixels += [tuple(row[x * 4:x * 4 + 4]) for x in range(width)]
+    return width, height, pixels
+
+
+def write_exe(tmp_path, resources, plus=False, name='game.exe'):
+    path = tmp_path / name
+    path.write_bytes(pe_image(resources, plus))
+    return str(path)
+
+
+@pytest.mark.parametrize('plus', [False, True], ids=['pe32', 'pe32+'])
+def test_32bpp_icon(tmp_path, plus):
+    exe = write_exe(tmp_path, {
+        peicon.RT_GROUP_ICON: {1: icon_group([(16, 32, 1)])},
+        peicon.RT_ICON: {1: dib(16, 16, 32, solid(16, (0, 0, 255, 255)))},
+    }, plus)
+    out = str(tmp_path / 'icon.png')
+    assert peicon.extract_icon(exe, out, 16)
+    width, height, pixels = png_pixels(out)
+    assert (width, height) == (16, 16)
+    assert set(pixels) == {(255, 0, 0, 255)}
+
+
+@pytest.mark.parametrize('plus', [False, True], ids=['pe32', 'pe32+'])
+def test_8bpp_palette_icon_with_and_mask(tmp_path, plus):
+    # Left half blue, right half green; the top row is masked out
+    rows = [[0] * 8 + [1] * 8 for _ in range(16)]
+    image = dib(16, 16, 8, rows, palette=[(0, 0, 255), (0, 255, 0)], mask_rows={0})
+    exe = write_exe(tmp_path, {
+        peicon.RT_GROUP_ICON: {1: icon_group([(16, 8, 1)])},
+        peicon.RT_ICON: {1: image},
+    }, plus)
+    out = str(tmp_path / 'icon.png')
+    assert peicon.extract_icon(exe, out, 16)
+    width, height, pixels = png_pixels(out)
+    assert (width, height) == (16, 16)
+    assert all(p[3] == 0 for p in pixels[:16])
+    assert pixels[16] == (0, 0, 255, 255)
+    assert pixels[31] == (0, 255, 0, 255)
+
+
+def test_png_icon_entry(tmp_path):
+    png = peicon._encode_png(32, 32, bytes((10, 20, 30, 255)) * 32 * 32)
+    exe = write_exe(tmp_path, {
+        peicon.RT_GROUP_ICON: {1: icon_group([(32, 32, 1)])},
+        peicon.RT_ICON: {1: png},
+    })
+    out = str(tmp_path / 'icon.png')
+    assert peicon.extract_icon(exe, out, 32)
+    width, height, pixels = png_pixels(out)
+    assert (width, height) == (32, 32)
+    assert set(pixels) == {(10, 20, 30, 255)}
+
+
+def test_picks_entry_closest_to_size(tmp_path):
+    exe = write_exe(tmp_path, {
+        peicon.RT_GROUP_ICON: {1: icon_group([(16, 32, 1), (48, 32, 2)])},
+        peicon.RT_ICON: {
+            1: dib(16, 16, 32, solid(16, (0, 0, 255, 255))),
+            2: dib(48, 48, 32, solid(48, (255, 0, 0, 255))),
+        },
+    })
+    out = str(tmp_path / 'icon.png')
+    assert peicon.extract_icon(exe, out, 48)
+    width, height, pixels = png_pixels(out)
+    assert (width, height) == (48, 48)
+    assert set(pixels) == {(0, 0, 255, 255)}
+
+
+def test_scales_down_to_requested_size(tmp_path):
+    exe = write_exe(tmp_path, {
+        peicon.RT_GROUP_ICON: {1: icon_group([(32, 32, 1)])},
+        peicon.RT_ICON: {1: dib(32, 32, 32, solid(32, (0, 255, 0, 255)))},
+    })
+    out = str(tmp_path / 'icon.png')
+    assert peicon.extract_icon(exe, out, 16)
+    width, height, pixels = png_pixels(out)
+    assert (width, height) == (16, 16)
+    assert set(pixels) == {(0, 255, 0, 255)}
+
+
+def test_resources_without_icon(tmp_path):
+    exe = write_exe(tmp_path, {RT_VERSION: {1: b'\0' * 64}})
+    out = tmp_path / 'icon.png'
+    assert not peicon.extract_icon(exe, str(out))
+    assert not out.exists()
+
+
+def test_no_resource_directory(tmp_path):
+    exe = write_exe(tmp_path, None)
+    assert not peicon.extract_icon(exe, str(tmp_path / 'icon.png'))
+
+
+def test_not_an_executable(tmp_path):
+    path = tmp_path / 'notes.exe'
+    path.write_bytes(b'just some text, not a PE image' * 4)
+    assert not peicon.extract_icon(str(path), str(tmp_path / 'icon.png'))
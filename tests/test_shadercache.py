@@ -0,0 +1,53 @@
+"""app.shadercache preparation at launch time and its background eviction."""
+import threading
+
+import pytest
+
+from app import launchqueue, shadercache, shortcuts, supervisor
+
+
+@pytest.fixture
+def shaders(tmp_path, monkeypatch):
+    monkeypatch.setattr(shadercache, 'SHADERS_DIR', tmp_path / 'shaders')
+    monkeypatch.setattr(supervisor, '_supervisor', supervisor.Supervisor(tmp_path / 'history.json'))
+    return tmp_path / 'shaders'
+
+
+def test_one_background_eviction_at_a_time(shaders, monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def slow_evict(budget=None, keep=()):
+        calls.append(keep)
+        release.wait(5)
+        return []
+
+    monkeypatch.setattr(shadercache, 'evict', slow_evict)
+    shadercache.prepare('a.desktop')
+    shadercache.prepare('b.desktop')
+    release.set()
+    with shadercache._evicting:
+        pass
+    assert calls == [('a',)]
+    shadercache.prepare('c.desktop')
+    with shadercache._evicting:
+        pass
+    assert calls == [('a',), ('c',)]
+
+
+def test_queued_launch_prepares_its_cache_when_it_starts(shaders, tmp_path, monkeypatch):
+    desktop = tmp_path / 'game.desktop'
+    desktop.write_text('[Desktop Entry]\nType=Application\nName=Game\nExec=true\n')
+    queued = []
+
+    class Queue:
+        def submit(self, key, name, prefix, start, wine=True):
+            queued.append(start)
+
+    monkeypatch.setattr(launchqueue, 'get_queue', Queue)
+    monkeypatch.setattr(shadercache, 'evict', lambda budget=None, keep=(): [])
+    assert shortcuts.launch_desktop_file(str(desktop)) is None
+    assert not (shaders / 'game').exists()
+    launch = queued[0](True)
+    launch.process.wait()
+    assert (shaders / 'game' / shadercache.STAMP).exists()
@@ -0,0 +1,49 @@
+"""app.supervisor launch history shared between processes."""
+import os
+import sys
+import subprocess
+
+from app.supervisor import Supervisor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RECORD = '''
+import sys
+from app.supervisor import Supervisor, Launch
+
+class Done:
+    pid = 0
+
+sup = Supervisor(history_file=sys.argv[1])
+for _ in range(int(sys.argv[3])):
+    launch = Launch(sys.argv[2], sys.argv[2], Done())
+    launch.ended = launch.started
+    launch.returncode = 0
+    sup._record(launch)
+'''
+
+
+def run(sup, key):
+    sup.launch(key, ['true']).process.wait()
+    while sup.is_running(key):
+        pass
+
+
+def test_supervisors_keep_each_others_runs(tmp_path):
+    path = tmp_path / 'history.json'
+    gui, cli = Supervisor(history_file=path), Supervisor(history_file=path)
+    run(gui, 'a.desktop')
+    run(cli, 'b.desktop')
+    run(gui, 'a.desktop')
+    assert gui.history('b.desktop')['launches'] == 1
+    assert Supervisor(history_file=path).history('a.desktop')['launches'] == 2
+
+
+def test_concurrent_processes(tmp_path):
+    path = tmp_path / 'history.json'
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    procs = [subprocess.Popen([sys.executable, '-c', RECORD, str(path), f'{n}.desktop', '20'], env=env)
+             for n in range(4)]
+    assert all(p.wait() == 0 for p in procs)
+    history = Supervisor(history_file=path).history()
+    assert {key: entry['launches'] for key, entry in history.items()} == {f'{n}.desktop': 20 for n in range(4)}
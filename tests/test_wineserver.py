@@ -0,0 +1,144 @@
+"""app.wineserver prewarm and idle shutdown, against a fake wineserver on PATH."""
+import os
+import time
+import subprocess
+
+import pytest
+
+from app import supervisor, wineserver
+
+FAKE_WINESERVER = '''#!/bin/bash
+echo "$1 $WINEPREFIX" >> "$FAKE_WINESERVER_LOG"
+case "$1" in
+    -p) bash -c 'exec -a wineserver sleep 300' </dev/null >/dev/null 2>&1 &
+        echo $! > "$WINEPREFIX/wineserver.pid" ;;
+    -k) kill "$(cat "$WINEPREFIX/wineserver.pid")" ;;
+esac
+'''
+TIMEOUT = 10
+
+
+@pytest.fixture
+def fake(tmp_path, monkeypatch):
+    """Namespace with prefix(), spawn(), calls() and a pool using the fake wineserver."""
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    script = bin_dir / 'wineserver'
+    script.write_text(FAKE_WINESERVER)
+    script.chmod(0o755)
+    log = tmp_path / 'wineserver.log'
+    monkeypatch.setenv('PATH', f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv('FAKE_WINESERVER_LOG', str(log))
+    monkeypatch.setattr(supervisor, '_supervisor', supervisor.Supervisor(tmp_path / 'history.json'))
+    processes = []
+
+    class Fake:
+        pool = wineserver.WineserverPool(wineserver='wineserver', idle_timeout=10, interval=1)
+
+        @staticmethod
+        def prefix(name):
+            path = tmp_path / name
+            path.mkdir()
+            return os.path.realpath(path)
+
+        @staticmethod
+        def spawn(name, prefix):
+            """A process called name in prefix, as the user would start it."""
+            process = subprocess.Popen(['bash', '-c', f'exec -a {name} sleep 300'],
+                                       env=dict(os.environ, WINEPREFIX=prefix))
+            processes.append(process)
+            if name == 'wineserver':
+                # So that the fake `wineserver -k` finds it, as the real one would
+                with open(os.path.join(prefix, 'wineserver.pid'), 'w') as f:
+                    f.write(str(process.pid))
+            wait_for(lambda: (wineserver._proc_info(process.pid) or [[None]])[0][:1] == [name])
+            return process
+
+        @staticmethod
+        def calls():
+            return log.read_text().splitlines() if log.exists() else []
+
+    yield Fake
+    for process in processes:
+        process.kill()
+        process.wait()
+    for pidfile in tmp_path.glob('*/wineserver.pid'):
+        try:
+            os.kill(int(pidfile.read_text()), 9)
+        except (ProcessLookupError, ValueError):
+            pass
+
+
+def wait_for(condition):
+    deadline = time.monotonic() + TIMEOUT
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+
+
+def test_prewarm_then_idle_shutdown(fake):
+    prefix = fake.prefix('pfx')
+    assert fake.pool.prewarm(prefix)
+    wait_for(lambda: fake.pool.is_running(prefix))
+    assert fake.pool.check_idle(now=0) == []
+    assert fake.pool.check_idle(now=5) == []
+    assert fake.pool.check_idle(now=10) == [prefix]
+    assert fake.calls() == [f'-p {prefix}', f'-k {prefix}']
+    wait_for(lambda: not fake.pool.is_running(prefix))
+
+
+def test_prewarm_reuses_a_running_server(fake):
+    prefix = fake.prefix('pfx')
+    fake.spawn('wineserver', prefix)
+    assert fake.pool.prewarm(prefix)
+    assert fake.calls() == []
+
+
+def test_busy_prefix_stays_up(fake):
+    prefix = fake.prefix('pfx')
+    assert fake.pool.prewarm(prefix)
+    wait_for(lambda: fake.pool.is_running(prefix))
+    game = fake.spawn('game.exe', prefix)
+    assert fake.pool.check_idle(now=0) == []
+    assert fake.pool.check_idle(now=100) == []
+    game.kill()
+    game.wait()
+    assert fake.pool.check_idle(now=200) == []
+    assert fake.pool.check_idle(now=210) == [prefix]
+
+
+def test_user_started_server_is_left_alone(fake):
+    prefix = fake.prefix('pfx')
+    server = fake.spawn('wineserver', prefix)
+    assert fake.pool.check_idle(now=0) == []
+    assert fake.pool.check_idle(now=100) == []
+    assert fake.calls() == []
+    assert server.poll() is None
+
+
+def test_supervised_launch_makes_its_prefix_managed(fake):
+    prefix = fake.prefix('pfx')
+    fake.spawn('wineserver', prefix)
+    sup = supervisor.get_supervisor()
+    sup.add_listener(fake.pool.track)
+    launch = sup.launch('game.desktop', ['bash', '-c', 'exec -a game.exe sleep 300'],
+                        env=dict(os.environ, WINEPREFIX=prefix))
+    assert prefix in fake.pool.managed
+    assert fake.pool.check_idle(now=0) == []
+    sup.stop('game.desktop')
+    wait_for(lambda: not sup.is_running('game.desktop'))
+    assert fake.pool.check_idle(now=100) == []
+    assert fake.pool.check_idle(now=110) == [prefix]
+    assert launch.returncode is not None
+
+
+def test_prefix_exported_by_a_supervised_script(fake):
+    # Like a template run through bash: WINEPREFIX is only set after the launch
+    prefix = fake.prefix('pfx')
+    fake.spawn('wineserver', prefix)
+    sup = supervisor.get_supervisor()
+    sup.launch('game.desktop', ['bash', '-c', f'export WINEPREFIX={prefix}; exec -a game.exe sleep 300'])
+    wait_for(lambda: prefix in wineserver._scan()[1])
+    assert fake.pool.check_idle(now=0) == []
+    assert prefix in fake.pool.managed
+    sup.stop('game.desktop')